@@ -37,11 +37,15 @@ class Context(object):
         2) Auto discovering & get by name
         3) Validation by CONFIG_SCHEMA
         4) Order of context creation
+        5) Reuse of context by several benchmarks with the same context
+           config (contexts that are not reusable are set up for each
+           benchmark separately)
 
     """
     __ctx_name__ = "base"
     __ctx_order__ = 0
     __ctx_hidden__ = True
+    __ctx_reusable__ = True
 
     CONFIG_SCHEMA = {}
 
@@ -77,13 +81,17 @@ class Context(object):
     def get_order(cls):
         return cls.__ctx_order__
 
+    @classmethod
+    def is_reusable(cls):
+        return cls.__ctx_reusable__
+
     @staticmethod
     def get_by_name(name):
         """Return Context class by name."""
-        for context in utils.itersubclasses(Context):
-            if name == context.__ctx_name__:
-                return context
-        raise exceptions.NoSuchContext(name=name)
+        context = utils.get_plugin(Context, name, key="__ctx_name__")
+        if context is None:
+            raise exceptions.NoSuchContext(name=name)
+        return context
 
     @abc.abstractmethod
     def setup(self):
@@ -128,7 +136,10 @@ class ContextManager(object):
         self._visited = []
         for ctx in self._get_sorted_context_lst():
             self._visited.append(ctx)
-            ctx.setup()
+            with utils.Timer() as timer:
+                ctx.setup()
+            LOG.info("Context %(name)s setup took %(duration).3f sec."
+                     % {"name": ctx.get_name(), "duration": timer.duration()})
 
         return self.context_obj
 
@@ -138,7 +149,11 @@ class ContextManager(object):
         ctxlst = self._visited or self._get_sorted_context_lst()
         for ctx in ctxlst[::-1]:
             try:
-                ctx.cleanup()
+                with utils.Timer() as timer:
+                    ctx.cleanup()
+                LOG.info("Context %(name)s cleanup took %(duration).3f sec."
+                         % {"name": ctx.get_name(),
+                            "duration": timer.duration()})
             except Exception as e:
                 LOG.error("Context %s failed during cleanup." % ctx.get_name())
                 LOG.exception(e)
@@ -34,6 +34,7 @@ class AdminCleanup(base.Context):
     __ctx_name__ = "admin_cleanup"
     __ctx_order__ = 200
     __ctx_hidden__ = True
+    __ctx_reusable__ = False
 
     CONFIG_SCHEMA = {
         "type": "array",
@@ -48,14 +49,18 @@ class AdminCleanup(base.Context):
     def __init__(self, context):
         super(AdminCleanup, self).__init__(context)
         self.endpoint = None
+        self.keep = set()
+        self.keep_quotas = False
 
     def _cleanup_resources(self):
         client = osclients.Clients(self.endpoint)
 
         cleanup_methods = {
-            "keystone": (utils.delete_keystone_resources, client.keystone()),
+            "keystone": (utils.delete_keystone_resources, client.keystone(),
+                         self.keep),
             "quotas": (utils.delete_admin_quotas, client,
-                       self.context.get("tenants", [])),
+                       [] if self.keep_quotas
+                       else self.context.get("tenants", [])),
         }
 
         for service_name in self.config:
@@ -72,6 +77,10 @@ class AdminCleanup(base.Context):
     @rutils.log_task_wrapper(LOG.info, _("Enter context: `admin cleanup`"))
     def setup(self):
         self.endpoint = self.context["admin"]["endpoint"]
+        # NOTE: Users, tenants and quotas of contexts that are already set
+        #       up (e.g. shared by several benchmarks) are not cleaned up
+        self.keep = utils.get_context_resources(self.context)
+        self.keep_quotas = "quotas" in self.context
 
     @rutils.log_task_wrapper(LOG.info, _("Exit context: `admin cleanup`"))
     def cleanup(self):
@@ -34,6 +34,7 @@ class UserCleanup(base.Context):
     __ctx_name__ = "cleanup"
     __ctx_order__ = 201
     __ctx_hidden__ = True
+    __ctx_reusable__ = False
 
     CONFIG_SCHEMA = {
         "type": "array",
@@ -50,6 +51,7 @@ class UserCleanup(base.Context):
     def __init__(self, context):
         super(UserCleanup, self).__init__(context)
         self.users_endpoints = []
+        self.keep = set()
 
     def _cleanup_resources(self):
         for user in self.users_endpoints:
@@ -75,8 +77,11 @@ class UserCleanup(base.Context):
                 cleanup_method = cleanup_methods[service_name]
                 method = cleanup_method[0]
                 client = cleanup_method[1]()
+                kwargs = {}
+                if service_name in ("nova", "glance", "cinder", "sahara"):
+                    kwargs["keep"] = self.keep
                 try:
-                    method(client, *cleanup_method[2:])
+                    method(client, *cleanup_method[2:], **kwargs)
                 except Exception as e:
                     LOG.debug("Not all user resources were cleaned.",
                               exc_info=sys.exc_info())
@@ -87,6 +92,9 @@ class UserCleanup(base.Context):
     def setup(self):
         self.users_endpoints = [u["endpoint"]
                                 for u in self.context.get("users", [])]
+        # NOTE: Resources of contexts that are already set up (e.g. shared
+        #       by several benchmarks) are not cleaned up
+        self.keep = utils.get_context_resources(self.context)
 
     @rutils.log_task_wrapper(LOG.info, _("Exit context: `cleanup`"))
     def cleanup(self):
@@ -17,6 +17,7 @@ import logging
 
 from neutronclient.common import exceptions as neutron_exceptions
 
+from rally.benchmark.context import keypair
 from rally.benchmark.scenarios.keystone import utils as kutils
 from rally.benchmark import utils as bench_utils
 from rally.benchmark.wrappers import keystone as keystone_wrapper
@@ -24,15 +25,45 @@ from rally.benchmark.wrappers import keystone as keystone_wrapper
 LOG = logging.getLogger(__name__)
 
 
-def delete_cinder_resources(cinder):
+def get_context_resources(context):
+    """Return ids and names of resources created by contexts.
+
+    Cleanup contexts take them on setup and don't delete them, so the
+    resources of contexts set up earlier and shared by several benchmarks
+    (users, tenants, keypairs, security groups, images, volumes, sahara
+    clusters and EDP objects) survive cleanup between the benchmarks.
+
+    :param context: benchmark context
+    :returns: set of resource ids and names
+    """
+    keep = set()
+    for user in context.get("users", []):
+        keep.add(user.get("id"))
+        if "keypair" in user:
+            keep.add(keypair.Keypair.KEYPAIR_NAME)
+    keep.update(tenant.get("id") for tenant in context.get("tenants", []))
+    keep.add(context.get("allow_ssh"))
+    for images in context.get("images", []):
+        keep.update(images["image_id"])
+    keep.update(volume["volume_id"] for volume in context.get("volumes", []))
+    for name in ("sahara_images", "sahara_clusters", "sahara_inputs"):
+        keep.update(context.get(name, {}).values())
+    for name in ("sahara_mains", "sahara_libs"):
+        for ids in context.get(name, {}).values():
+            keep.update(ids)
+    keep.discard(None)
+    return keep
+
+
+def delete_cinder_resources(cinder, keep=()):
     delete_volume_transfers(cinder)
-    delete_volumes(cinder)
+    delete_volumes(cinder, keep=keep)
     delete_volume_snapshots(cinder)
     delete_volume_backups(cinder)
 
 
-def delete_glance_resources(glance, project_uuid):
-    delete_images(glance, project_uuid)
+def delete_glance_resources(glance, project_uuid, keep=()):
+    delete_images(glance, project_uuid, keep=keep)
 
 
 def delete_heat_resources(heat):
@@ -44,24 +75,25 @@ def delete_admin_quotas(client, tenants):
         delete_quotas(client, tenant["id"])
 
 
-def delete_keystone_resources(keystone):
+def delete_keystone_resources(keystone, keep=()):
     keystone = keystone_wrapper.wrap(keystone)
     for resource in ["user", "project", "service", "role"]:
-        _delete_single_keystone_resource_type(keystone, resource)
+        _delete_single_keystone_resource_type(keystone, resource, keep)
 
 
-def _delete_single_keystone_resource_type(keystone, resource_name):
+def _delete_single_keystone_resource_type(keystone, resource_name, keep=()):
     for resource in getattr(keystone, "list_%ss" % resource_name)():
-        if kutils.is_temporary(resource):
+        if kutils.is_temporary(resource) and resource.id not in keep:
             getattr(keystone, "delete_%s" % resource_name)(resource.id)
 
 
-def delete_images(glance, project_uuid):
+def delete_images(glance, project_uuid, keep=()):
     for image in glance.images.list(owner=project_uuid):
-        image.delete()
+        if image.id not in keep:
+            image.delete()
     _wait_for_list_statuses(glance.images, statuses=["DELETED"],
                             list_query={'owner': project_uuid},
-                            timeout=600, check_interval=3)
+                            timeout=600, check_interval=3, keep=keep)
 
 
 def delete_quotas(admin_clients, project_uuid):
@@ -76,10 +108,14 @@ def delete_stacks(heat):
                             timeout=600, check_interval=3)
 
 
-def delete_volumes(cinder):
+def delete_volumes(cinder, keep=()):
+    kept = 0
     for vol in cinder.volumes.list():
-        vol.delete()
-    _wait_for_empty_list(cinder.volumes, timeout=120)
+        if vol.id in keep:
+            kept += 1
+        else:
+            vol.delete()
+    _wait_for_list_size(cinder.volumes, sizes=[kept], timeout=120)
 
 
 def delete_volume_transfers(cinder):
@@ -100,15 +136,16 @@ def delete_volume_backups(cinder):
     _wait_for_empty_list(cinder.backups, timeout=240)
 
 
-def delete_nova_resources(nova):
+def delete_nova_resources(nova, keep=()):
     delete_servers(nova)
-    delete_keypairs(nova)
-    delete_secgroups(nova)
+    delete_keypairs(nova, keep=keep)
+    delete_secgroups(nova, keep=keep)
 
 
-def delete_secgroups(nova):
+def delete_secgroups(nova, keep=()):
     for secgroup in nova.security_groups.list():
-        if secgroup.name != "default":  # inc0: we shouldn't mess with default
+        # inc0: we shouldn't mess with default
+        if secgroup.name != "default" and secgroup.name not in keep:
             secgroup.delete()
 
 
@@ -118,10 +155,14 @@ def delete_servers(nova):
     _wait_for_empty_list(nova.servers, timeout=600, check_interval=3)
 
 
-def delete_keypairs(nova):
-    for keypair in nova.keypairs.list():
-        keypair.delete()
-    _wait_for_empty_list(nova.keypairs)
+def delete_keypairs(nova, keep=()):
+    kept = 0
+    for kp in nova.keypairs.list():
+        if kp.name in keep:
+            kept += 1
+        else:
+            kp.delete()
+    _wait_for_list_size(nova.keypairs, sizes=[kept])
 
 
 def delete_neutron_resources(neutron, project_uuid):
@@ -170,16 +211,23 @@ def delete_alarms(ceilometer, project_uuid):
         ceilometer.alarms.delete(alarm.alarm_id)
 
 
-def delete_sahara_resources(sahara):
+def delete_sahara_resources(sahara, keep=()):
+    if keep:
+        # NOTE: Internal job binaries of kept job binaries are kept too
+        keep = set(keep)
+        keep.update(jb.url[len("internal-db://"):]
+                    for jb in sahara.job_binaries.list()
+                    if jb.id in keep and jb.url.startswith("internal-db://"))
+
     # Delete EDP related objects
     delete_job_executions(sahara)
     delete_jobs(sahara)
-    delete_job_binary_internals(sahara)
-    delete_job_binaries(sahara)
-    delete_data_sources(sahara)
+    delete_job_binary_internals(sahara, keep=keep)
+    delete_job_binaries(sahara, keep=keep)
+    delete_data_sources(sahara, keep=keep)
 
     # Delete cluster related objects
-    delete_clusters(sahara)
+    delete_clusters(sahara, keep=keep)
     delete_cluster_templates(sahara)
     delete_node_group_templates(sahara)
 
@@ -196,26 +244,33 @@ def delete_jobs(sahara):
         sahara.jobs.delete(job.id)
 
 
-def delete_job_binary_internals(sahara):
+def delete_job_binary_internals(sahara, keep=()):
     for jbi in sahara.job_binary_internals.list():
-        sahara.job_binary_internals.delete(jbi.id)
+        if jbi.id not in keep:
+            sahara.job_binary_internals.delete(jbi.id)
 
 
-def delete_job_binaries(sahara):
+def delete_job_binaries(sahara, keep=()):
     for jb in sahara.job_binaries.list():
-        sahara.job_binaries.delete(jb.id)
+        if jb.id not in keep:
+            sahara.job_binaries.delete(jb.id)
 
 
-def delete_data_sources(sahara):
+def delete_data_sources(sahara, keep=()):
     for ds in sahara.data_sources.list():
-        sahara.data_sources.delete(ds.id)
+        if ds.id not in keep:
+            sahara.data_sources.delete(ds.id)
 
 
-def delete_clusters(sahara):
+def delete_clusters(sahara, keep=()):
+    kept = 0
     for cluster in sahara.clusters.list():
-        sahara.clusters.delete(cluster.id)
+        if cluster.id in keep:
+            kept += 1
+        else:
+            sahara.clusters.delete(cluster.id)
 
-    _wait_for_empty_list(sahara.clusters)
+    _wait_for_list_size(sahara.clusters, sizes=[kept])
 
 
 def delete_cluster_templates(sahara):
@@ -251,11 +306,13 @@ def _wait_for_list_size(mgr, sizes=[0], timeout=10, check_interval=1):
 
 
 def _wait_for_list_statuses(mgr, statuses, list_query=None,
-                            timeout=10, check_interval=1):
+                            timeout=10, check_interval=1, keep=()):
     list_query = list_query or {}
 
     def _list_statuses(mgr):
         for resource in mgr.list(**list_query):
+            if resource.id in keep:
+                continue
             status = bench_utils.get_status(resource)
             if status not in statuses:
                 return False
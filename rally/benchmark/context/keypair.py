@@ -14,9 +14,11 @@
 #    under the License.
 
 import novaclient.exceptions
+from oslo.config import cfg
 import six
 
 from rally.benchmark.context import base
+from rally.benchmark import utils as bench_utils
 from rally.openstack.common.gettextutils import _
 from rally.openstack.common import log as logging
 from rally import osclients
@@ -25,6 +27,9 @@ from rally import utils
 
 LOG = logging.getLogger(__name__)
 
+cfg.CONF.import_opt("concurrent", "rally.benchmark.context.users",
+                    group="users_context")
+
 
 class Keypair(base.Context):
     __ctx_name__ = "keypair"
@@ -53,23 +58,30 @@ class Keypair(base.Context):
         return {"private": keypair.private_key,
                 "public": keypair.public_key}
 
+    def _setup_user(self, user):
+        user["keypair"] = self._generate_keypair(user["endpoint"])
+
+    def _cleanup_user(self, user):
+        endpoint = user['endpoint']
+        try:
+            nova = self._get_nova_client(endpoint)
+            self._keypair_safe_remove(nova)
+        except Exception as e:
+            LOG.warning("Unable to delete keypair: %(kpname)s for user "
+                        "%(tenant)s/%(user)s: %(message)s"
+                        % {'kpname': self.KEYPAIR_NAME,
+                           'tenant': endpoint.tenant_name,
+                           'user': endpoint.username,
+                           'message': six.text_type(e)})
+
     @utils.log_task_wrapper(LOG.info, _("Enter context: `keypair`"))
     def setup(self):
-        for user in self.context["users"]:
-            keypair = self._generate_keypair(user["endpoint"])
-            user["keypair"] = keypair
+        list(bench_utils.run_concurrent(cfg.CONF.users_context.concurrent,
+                                        self, "_setup_user",
+                                        self.context["users"]))
 
     @utils.log_task_wrapper(LOG.info, _("Exit context: `keypair`"))
     def cleanup(self):
-        for user in self.context["users"]:
-            endpoint = user['endpoint']
-            try:
-                nova = self._get_nova_client(endpoint)
-                self._keypair_safe_remove(nova)
-            except Exception as e:
-                LOG.warning("Unable to delete keypair: %(kpname)s for user "
-                            "%(tenant)s/%(user)s: %(message)s"
-                            % {'kpname': self.KEYPAIR_NAME,
-                               'tenant': endpoint.tenant_name,
-                               'user': endpoint.username,
-                               'message': six.text_type(e)})
+        list(bench_utils.run_concurrent(cfg.CONF.users_context.concurrent,
+                                        self, "_cleanup_user",
+                                        self.context["users"]))
@@ -13,11 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo.config import cfg
+
 from rally.benchmark.context import base
 from rally.benchmark.context.quotas import cinder_quotas
 from rally.benchmark.context.quotas import designate_quotas
 from rally.benchmark.context.quotas import neutron_quotas
 from rally.benchmark.context.quotas import nova_quotas
+from rally.benchmark import utils as bench_utils
 from rally.openstack.common.gettextutils import _
 from rally.openstack.common import log as logging
 from rally import osclients
@@ -26,6 +29,9 @@ from rally import utils
 
 LOG = logging.getLogger(__name__)
 
+cfg.CONF.import_opt("concurrent", "rally.benchmark.context.users",
+                    group="users_context")
+
 
 class Quotas(base.Context):
     """Context class for updating benchmarks' tenants quotas."""
@@ -60,24 +66,34 @@ class Quotas(base.Context):
     def _service_has_quotas(self, service):
         return len(self.config.get(service, {})) > 0
 
+    def _update_quotas(self, tenant):
+        for service in self.manager:
+            if self._service_has_quotas(service):
+                self.manager[service].update(tenant["id"],
+                                             **self.config[service])
+
+    def _delete_quotas(self, tenant):
+        for service in self.manager:
+            if self._service_has_quotas(service):
+                try:
+                    self.manager[service].delete(tenant["id"])
+                except Exception as e:
+                    LOG.warning("Failed to remove quotas for tenant "
+                                "%(tenant_id)s in service %(service)s "
+                                "\n reason: %(exc)s"
+                                % {"tenant_id": tenant["id"],
+                                   "service": service, "exc": e})
+
     @utils.log_task_wrapper(LOG.info, _("Enter context: `quotas`"))
     def setup(self):
-        for tenant in self.context["tenants"]:
-            for service in self.manager:
-                if self._service_has_quotas(service):
-                    self.manager[service].update(tenant["id"],
-                                                 **self.config[service])
+        # NOTE: All threads share the same admin clients
+        list(bench_utils.run_concurrent(cfg.CONF.users_context.concurrent,
+                                        self, "_update_quotas",
+                                        self.context["tenants"]))
+        self.context["quotas"] = self.config
 
     @utils.log_task_wrapper(LOG.info, _("Exit context: `quotas`"))
     def cleanup(self):
-        for service in self.manager:
-            if self._service_has_quotas(service):
-                for tenant in self.context["tenants"]:
-                    try:
-                        self.manager[service].delete(tenant["id"])
-                    except Exception as e:
-                        LOG.warning("Failed to remove quotas for tenant "
-                                    "%(tenant_id)s in service %(service)s "
-                                    "\n reason: %(exc)s"
-                                    % {"tenant_id": tenant["id"],
-                                       "service": service, "exc": e})
+        list(bench_utils.run_concurrent(cfg.CONF.users_context.concurrent,
+                                        self, "_delete_quotas",
+                                        self.context["tenants"]))
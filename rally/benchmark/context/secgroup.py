@@ -13,7 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo.config import cfg
+
 from rally.benchmark.context import base
+from rally.benchmark import utils as bench_utils
 from rally.openstack.common.gettextutils import _
 from rally.openstack.common import log as logging
 from rally import osclients
@@ -24,6 +27,9 @@ LOG = logging.getLogger(__name__)
 
 SSH_GROUP_NAME = "rally_ssh_open"
 
+cfg.CONF.import_opt("concurrent", "rally.benchmark.context.users",
+                    group="users_context")
+
 
 def _prepare_open_secgroup(endpoint):
     """Generate secgroup allowing all tcp/udp/icmp access.
@@ -90,20 +96,31 @@ class AllowSSH(base.Context):
     @utils.log_task_wrapper(LOG.info, _("Enter context: `allow_ssh`"))
     def setup(self):
         used_tenants = []
+        endpoints = []
         for user in self.context['users']:
             endpoint = user['endpoint']
             tenant = endpoint.tenant_name
             if tenant not in used_tenants:
-                secgroup = _prepare_open_secgroup(endpoint)
-                self.secgroup.append(secgroup)
+                endpoints.append(endpoint)
                 used_tenants.append(tenant)
 
+        self.secgroup.extend(
+            bench_utils.run_concurrent(cfg.CONF.users_context.concurrent,
+                                       self, "_prepare_secgroup", endpoints))
+
+    def _prepare_secgroup(self, endpoint):
+        return _prepare_open_secgroup(endpoint)
+
+    def _cleanup_secgroup(self, secgroup):
+        try:
+            secgroup.delete()
+        except Exception as ex:
+            LOG.warning("Unable to delete secgroup: %(group_id)s. "
+                        "Exception: %(ex)s" %
+                        {"group_id": secgroup.id, "ex": ex})
+
     @utils.log_task_wrapper(LOG.info, _("Exit context: `allow_ssh`"))
     def cleanup(self):
-        for secgroup in self.secgroup:
-            try:
-                secgroup.delete()
-            except Exception as ex:
-                LOG.warning("Unable to delete secgroup: %(group_id)s. "
-                            "Exception: %(ex)s" %
-                            {"group_id": secgroup.id, "ex": ex})
+        list(bench_utils.run_concurrent(cfg.CONF.users_context.concurrent,
+                                        self, "_cleanup_secgroup",
+                                        self.secgroup))
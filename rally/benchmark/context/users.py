@@ -13,12 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import uuid
+
 from oslo.config import cfg
 
 from rally.benchmark.context import base
 from rally.benchmark import utils
 from rally.benchmark.wrappers import keystone
 from rally import consts
+from rally import objects
 from rally.objects import endpoint
 from rally.openstack.common.gettextutils import _
 from rally.openstack.common import log as logging
@@ -39,6 +42,11 @@ context_opts = [
     cfg.StrOpt("user_domain",
                default="default",
                help="ID of domain in which users will be created."),
+    cfg.BoolOpt("prewarm_tokens",
+                default=False,
+                help="Authenticate all generated users in keystone during "
+                     "the context setup, so benchmark iterations reuse "
+                     "their tokens."),
 ]
 
 CONF = cfg.CONF
@@ -76,6 +84,12 @@ class UserGenerator(base.Context):
             "user_domain": {
                 "type": "string",
             },
+            "tenant_pool": {
+                "type": "boolean",
+            },
+            "prewarm_tokens": {
+                "type": "boolean",
+            },
         },
         "additionalProperties": False
     }
@@ -92,9 +106,14 @@ class UserGenerator(base.Context):
                                cfg.CONF.users_context.project_domain)
         self.config.setdefault("user_domain",
                                cfg.CONF.users_context.user_domain)
+        self.config.setdefault("tenant_pool", False)
+        self.config.setdefault("prewarm_tokens",
+                               cfg.CONF.users_context.prewarm_tokens)
         self.context["users"] = []
         self.context["tenants"] = []
         self.endpoint = self.context["admin"]["endpoint"]
+        self.admin_clients = None
+        self.leased = []
         # NOTE(boris-42): I think this is the best place for adding logic when
         #                 we are using pre created users or temporary. So we
         #                 should rename this class s/UserGenerator/UserContext/
@@ -106,14 +125,15 @@ class UserGenerator(base.Context):
         """Create tenant with users and their endpoints.
 
         This is suitable for using with pool of threads.
-        :param args: tuple arguments, for Pool.imap()
+        :param args: tuple arguments, for Pool.imap(), the first one is
+                     osclients.Clients of admin shared by all threads
         :returns: tuple (dict tenant, list users)
         """
 
-        admin_endpoint, users_num, project_dom, user_dom, task_id, i = args
+        admin_clients, users_num, project_dom, user_dom, task_id, i = args
         users = []
 
-        client = keystone.wrap(osclients.Clients(admin_endpoint).keystone())
+        client = keystone.wrap(admin_clients.keystone())
         tenant = client.create_project(
             cls.PATTERN_TENANT % {"task_id": task_id, "iter": i}, project_dom)
 
@@ -138,12 +158,11 @@ class UserGenerator(base.Context):
         return ({"id": tenant.id, "name": tenant.name}, users)
 
     @staticmethod
-    def _remove_associated_networks(admin_endpoint, tenants):
+    def _remove_associated_networks(clients, tenants):
         """Delete associated Nova networks from tenants."""
         # NOTE(rmk): Ugly hack to deal with the fact that Nova Network
         # networks can only be disassociated in an admin context. Discussed
         # with boris-42 before taking this approach [LP-Bug #1350517].
-        clients = osclients.Clients(admin_endpoint)
         if consts.Service.NOVA not in clients.services().values():
             return
 
@@ -169,10 +188,8 @@ class UserGenerator(base.Context):
 
         :param args: tuple arguments, for Pool.imap()
         """
-        admin_endpoint, tenants = args
-        cls._remove_associated_networks(admin_endpoint, tenants)
-
-        client = keystone.wrap(osclients.Clients(admin_endpoint).keystone())
+        admin_clients, tenants = args
+        client = keystone.wrap(admin_clients.keystone())
 
         for tenant in tenants:
             try:
@@ -188,8 +205,8 @@ class UserGenerator(base.Context):
 
         :param args: tuple arguments, for Pool.imap()
         """
-        admin_endpoint, users = args
-        client = keystone.wrap(osclients.Clients(admin_endpoint).keystone())
+        admin_clients, users = args
+        client = keystone.wrap(admin_clients.keystone())
 
         for user in users:
             try:
@@ -199,32 +216,186 @@ class UserGenerator(base.Context):
                             "Exception: %(ex)s" %
                             {"user_id": user["id"], "ex": ex})
 
-    @rutils.log_task_wrapper(LOG.info, _("Enter context: `users`"))
-    def setup(self):
-        """Create tenants and users, using pool of threads."""
+    @classmethod
+    def _prewarm_token(cls, user):
+        """Authenticate user and attach token & catalog to its endpoint.
 
-        users_num = self.config["users_per_tenant"]
+        This is suitable for using with pool of threads.
+        :param user: dict user from the context
+        """
+        user_endpoint = user["endpoint"]
+        try:
+            keystone_client = osclients.Clients(user_endpoint).keystone()
+            user_endpoint.auth_ref = keystone_client.auth_ref
+        except Exception as ex:
+            LOG.warning("Failed to pre-authenticate user: %(user_id)s. "
+                        "Exception: %(ex)s" %
+                        {"user_id": user["id"], "ex": ex})
+
+    def _get_admin_clients(self):
+        """Return admin clients shared by all threads of the context.
+
+        The keystone client is created (and authenticated) here, so the
+        threads don't race to create their own ones.
+        """
+        if self.admin_clients is None:
+            self.admin_clients = osclients.Clients(self.endpoint)
+            self.admin_clients.keystone()
+        return self.admin_clients
+
+    def _create_tenants(self, tenants_num, task_id):
+        """Create tenants with users, using pool of threads.
 
-        args = [(self.endpoint, users_num, self.config["project_domain"],
-                 self.config["user_domain"], self.task["uuid"], i)
-                for i in range(self.config["tenants"])]
+        :returns: list of tuples (dict tenant, list users)
+        """
+        users_num = self.config["users_per_tenant"]
+        admin_clients = self._get_admin_clients()
+        args = [(admin_clients, users_num, self.config["project_domain"],
+                 self.config["user_domain"], task_id, i)
+                for i in range(tenants_num)]
 
         LOG.debug("Creating %d users using %s threads" % (
-            users_num * self.config["tenants"], self.config["concurrent"]))
+            users_num * tenants_num, self.config["concurrent"]))
+
+        return list(utils.run_concurrent(self.config["concurrent"],
+                                         UserGenerator,
+                                         "_create_tenant_users",
+                                         args))
+
+    def _reset_passwords(self, users):
+        """Set new random passwords of users."""
+        client = keystone.wrap(self._get_admin_clients().keystone())
+        for user in users:
+            password = str(uuid.uuid4())
+            client.update_user_password(user["id"], password)
+            user["endpoint"].password = password
+
+    def _lease_tenants(self, task_id):
+        """Lease tenants from the tenant pool of the deployment.
+
+        Tenants leased by tasks that are over are returned to the pool
+        first. Then free pooled tenants with enough users are leased,
+        missing tenants are created and added to the pool.
 
-        for tenant, users in utils.run_concurrent(
-                self.config["concurrent"],
-                UserGenerator,
-                "_create_tenant_users",
-                args):
+        Passwords of pooled users are not stored in the pool, they are
+        reset to random ones for each lease.
+
+        :returns: list of tuples (dict tenant, list users)
+        """
+        deployment = objects.Deployment.get(self.task["deployment_uuid"])
+        reclaimed = deployment.reclaim_pooled_tenants()
+        if reclaimed:
+            LOG.info("Returned %d tenants of finished tasks to the tenant "
+                     "pool." % reclaimed)
+        tenants_num = self.config["tenants"]
+        users_num = self.config["users_per_tenant"]
+        domains = {"project_domain": self.config["project_domain"],
+                   "user_domain": self.config["user_domain"]}
+
+        tenants = []
+        for pooled in deployment.get_pooled_tenants(free=True):
+            if len(tenants) == tenants_num:
+                break
+            info = pooled["info"]
+            if (len(info["users"]) < users_num or
+                    info["domains"] != domains):
+                continue
+            if deployment.lease_pooled_tenant(pooled["id"],
+                                              self.task["uuid"]):
+                self.leased.append(pooled["id"])
+                users = [dict(user, endpoint=endpoint.Endpoint(
+                              **dict(user["endpoint"], password=None)))
+                         for user in info["users"][:users_num]]
+                tenants.append((info["tenant"], users))
+
+        LOG.info("Leased %d tenants from the tenant pool." % len(tenants))
+        missing = tenants_num - len(tenants)
+        if missing:
+            LOG.info("Adding %d tenants to the tenant pool." % missing)
+            for tenant, users in self._create_tenants(missing,
+                                                      "pool_" + task_id):
+                info = {"tenant": tenant, "domains": domains,
+                        "users": [dict(user, endpoint=dict(
+                                      user["endpoint"].to_dict(
+                                          include_permission=True),
+                                      password=None))
+                                  for user in users]}
+                pooled = deployment.add_pooled_tenant(
+                    info, task_uuid=self.task["uuid"])
+                self.leased.append(pooled["id"])
+                tenants.append((tenant, users))
+
+        self._reset_passwords([user for tenant, users in tenants
+                               for user in users])
+        return tenants
+
+    @classmethod
+    def delete_tenant_pool(cls, deployment):
+        """Delete all tenants and users of the tenant pool of a deployment.
+
+        :param deployment: objects.Deployment instance
+        """
+        pooled_tenants = deployment.get_pooled_tenants()
+        if not pooled_tenants:
+            return
+        admin_clients = osclients.Clients(
+            endpoint.Endpoint(**deployment["admin"]))
+        tenants = [pooled["info"]["tenant"] for pooled in pooled_tenants]
+        cls._delete_users(
+            (admin_clients,
+             [user for pooled in pooled_tenants
+              for user in pooled["info"]["users"]]))
+        cls._remove_associated_networks(admin_clients, tenants)
+        cls._delete_tenants((admin_clients, tenants))
+        for pooled in pooled_tenants:
+            deployment.delete_pooled_tenant(pooled["id"])
+
+    @rutils.log_task_wrapper(LOG.info, _("Enter context: `users`"))
+    def setup(self):
+        """Create or lease tenants and users, using pool of threads."""
+
+        task_id = self.task["uuid"]
+        # NOTE: benchmarks that run in parallel get their own tenants
+        if "benchmark_index" in self.context:
+            task_id = "%s_%d" % (task_id, self.context["benchmark_index"])
+
+        if self.config["tenant_pool"]:
+            tenants = self._lease_tenants(task_id)
+        else:
+            tenants = self._create_tenants(self.config["tenants"], task_id)
+
+        for tenant, users in tenants:
             self.context["tenants"].append(tenant)
             self.context["users"] += users
 
+        if self.config["prewarm_tokens"]:
+            LOG.debug("Pre-authenticating %d users using %s threads" % (
+                len(self.context["users"]), self.config["concurrent"]))
+            list(utils.run_concurrent(self.config["concurrent"],
+                                      UserGenerator, "_prewarm_token",
+                                      self.context["users"]))
+
     @rutils.log_task_wrapper(LOG.info, _("Exit context: `users`"))
     def cleanup(self):
-        """Delete tenants and users, using pool of threads."""
+        """Delete tenants and users, using pool of threads.
+
+        Tenants leased from the tenant pool are not deleted but returned
+        to the pool. Cached keystone tokens of the users are removed.
+        """
+
+        token_cache = osclients.get_token_cache()
+        if token_cache is not None:
+            for user in self.context["users"]:
+                token_cache.delete(user["endpoint"])
+
+        if self.config["tenant_pool"]:
+            for pooled_id in self.leased:
+                objects.Deployment.release_pooled_tenant(pooled_id)
+            self.leased = []
+            return
 
         concurrent = self.config["concurrent"]
+        admin_clients = self._get_admin_clients()
 
         # Delete users
         users_chunks = utils.chunks(self.context["users"], concurrent)
@@ -232,12 +403,14 @@ class UserGenerator(base.Context):
             concurrent,
             UserGenerator,
             "_delete_users",
-            [(self.endpoint, users) for users in users_chunks])
+            [(admin_clients, users) for users in users_chunks])
 
         # Delete tenants
+        self._remove_associated_networks(admin_clients,
+                                         self.context["tenants"])
         tenants_chunks = utils.chunks(self.context["tenants"], concurrent)
         utils.run_concurrent(
             concurrent,
             UserGenerator,
             "_delete_tenants",
-            [(self.endpoint, tenants) for tenants in tenants_chunks])
+            [(admin_clients, tenants) for tenants in tenants_chunks])
@@ -13,12 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import json
+import sys
 import threading
-import time
 import traceback
 
 import jsonschema
+from oslo.config import cfg
 import six
 
 from rally.benchmark.context import base as base_ctx
@@ -37,6 +39,25 @@ from rally import utils as rutils
 
 LOG = logging.getLogger(__name__)
 
+engine_opts = [
+    cfg.IntOpt("results_flush_size", default=1000,
+               help="Number of iteration results saved to the database "
+                    "at once while the benchmark is running."),
+    cfg.IntOpt("max_parallel_benchmarks", default=1,
+               help="Max number of benchmarks (entries of the task config) "
+                    "that are run at the same time, each with its own "
+                    "context. By default benchmarks are run one by one."),
+    cfg.BoolOpt("reuse_contexts", default=False,
+                help="Set up contexts once for consecutive benchmarks of "
+                     "the task with the same context config. Benchmarks "
+                     "are run in the task order, resources created by each "
+                     "of them are still cleaned up after it, except the "
+                     "resources of the shared contexts. It is ignored if "
+                     "max_parallel_benchmarks is greater than 1.")
+]
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(engine_opts, group=benchmark_group)
 
 CONFIG_SCHEMA = {
     "type": "object",
@@ -97,6 +118,8 @@ class BenchmarkEngine(object):
         """
         self.config = config
         self.task = task
+        self.duration = None
+        self._durations = {}
 
     @rutils.log_task_wrapper(LOG.info,
                              _("Task validation of scenarios names."))
@@ -178,8 +201,9 @@ class BenchmarkEngine(object):
         return base_runner.ScenarioRunner.get_runner(self.task,
                                                      runner)
 
-    def _prepare_context(self, context, name, endpoint):
-        scenario_context = base_scenario.Scenario.meta(name, "context")
+    def _prepare_context(self, context, name, endpoint, args=None):
+        scenario_context = base_scenario.Scenario.get_default_context(name,
+                                                                      args)
         scenario_context.setdefault("users", {})
         scenario_context.update(context)
         context_obj = {
@@ -191,37 +215,157 @@ class BenchmarkEngine(object):
 
         return context_obj
 
+    @staticmethod
+    def _split_context_config(config):
+        """Split context config into reusable and per benchmark parts.
+
+        :param config: context config of the benchmark
+        :returns: tuple (config of reusable contexts, config of contexts
+                  that should be set up for the benchmark itself)
+        """
+        reusable, own = {}, {}
+        for name, ctx_config in config.iteritems():
+            if base_ctx.Context.get_by_name(name).is_reusable():
+                reusable[name] = ctx_config
+            else:
+                own[name] = ctx_config
+        return reusable, own
+
+    def _run_benchmark(self, name, pos, kw, index=None, shared_context=None):
+        """Run a single benchmark (entry of the task config).
+
+        :param index: number of the benchmark in the task, it is set only
+                      for benchmarks that are run in parallel and used to
+                      isolate their contexts from each other
+        :param shared_context: context object of reusable contexts that
+                               are already set up, only contexts that are
+                               not reusable are set up for the benchmark
+        """
+        key = {'name': name, 'pos': pos, 'kw': kw}
+        LOG.info("Running benchmark with key: \n%s"
+                 % json.dumps(key, indent=2))
+        runner = self._get_runner(kw)
+        is_done = threading.Event()
+        consumer = threading.Thread(
+            target=self.consume_results,
+            args=(key, self.task, runner.result_queue, is_done,
+                  runner.stats))
+        consumer.start()
+
+        context_obj = self._prepare_context(kw.get("context", {}),
+                                            name, self.admin_endpoint,
+                                            kw.get("args"))
+        if shared_context is not None:
+            # NOTE: Cleanup contexts are set up after the shared contexts,
+            #       so they keep resources of the shared contexts and delete
+            #       only resources created by the benchmark
+            own = self._split_context_config(context_obj["config"])[1]
+            context_obj = dict(shared_context, scenario_name=name,
+                               config=own)
+        if index is not None:
+            context_obj["benchmark_index"] = index
+        try:
+            with base_ctx.ContextManager(context_obj):
+                duration = runner.run(name, context_obj, kw.get("args", {}))
+                self._durations[(name, pos)] = self.duration = duration
+        finally:
+            is_done.set()
+            consumer.join()
+
+    def _run_parallel(self, benchmarks, max_parallel):
+        """Run benchmarks in up to max_parallel threads.
+
+        All benchmarks are run even if some of them fail, then the first
+        failure is re-raised.
+        """
+        pending = collections.deque(enumerate(benchmarks))
+        errors = []
+
+        def worker():
+            while True:
+                try:
+                    index, (name, pos, kw) = pending.popleft()
+                except IndexError:
+                    return
+                try:
+                    self._run_benchmark(name, pos, kw, index=index)
+                except Exception:
+                    LOG.exception("Benchmark %s (position %d) has failed."
+                                  % (name, pos))
+                    errors.append(sys.exc_info())
+
+        threads = [threading.Thread(target=worker)
+                   for i in range(min(max_parallel, len(benchmarks)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            six.reraise(*errors[0])
+
+    def _run_with_shared_contexts(self, benchmarks):
+        """Run benchmarks one by one, reusing contexts between them.
+
+        Consecutive benchmarks with the same config of reusable contexts
+        are grouped, so benchmarks are run (and their results are stored)
+        in the task order. Reusable contexts are set up once for each
+        group, and benchmarks of the group are run one after another inside
+        them. Contexts that are not reusable (e.g. cleanup) are set up for
+        each benchmark of the group.
+        """
+        groups = []
+        last_key = None
+        for name, pos, kw in benchmarks:
+            config = self._prepare_context(kw.get("context", {}), name,
+                                           self.admin_endpoint,
+                                           kw.get("args"))["config"]
+            reusable = self._split_context_config(config)[0]
+            key = json.dumps(reusable, sort_keys=True)
+            if key != last_key:
+                groups.append((reusable, []))
+                last_key = key
+            groups[-1][1].append((name, pos, kw))
+
+        for reusable, group in groups:
+            if len(group) == 1:
+                self._run_benchmark(*group[0])
+                continue
+            LOG.info("Reusing contexts %s for %d benchmarks."
+                     % (", ".join(sorted(reusable)), len(group)))
+            shared_context = {
+                "task": self.task,
+                "admin": {"endpoint": self.admin_endpoint},
+                "config": reusable
+            }
+            with base_ctx.ContextManager(shared_context):
+                for name, pos, kw in group:
+                    self._run_benchmark(name, pos, kw,
+                                        shared_context=shared_context)
+
     @rutils.log_task_wrapper(LOG.info, _("Benchmarking."))
     def run(self):
         """Run the benchmark according to the test configuration.
 
         Test configuration is specified on engine initialization.
+        Benchmarks are run one by one, or up to
+        CONF.benchmark.max_parallel_benchmarks of them at the same time.
+        If CONF.benchmark.reuse_contexts is set, consecutive benchmarks
+        with the same context config share contexts.
 
         :returns: List of dicts, each dict containing the results of all the
                   corresponding benchmark test launches
         """
         self.task.update_status(consts.TaskStatus.RUNNING)
-        for name in self.config:
-            for n, kw in enumerate(self.config[name]):
-                key = {'name': name, 'pos': n, 'kw': kw}
-                LOG.info("Running benchmark with key: \n%s"
-                         % json.dumps(key, indent=2))
-                runner = self._get_runner(kw)
-                is_done = threading.Event()
-                consumer = threading.Thread(
-                    target=self.consume_results,
-                    args=(key, self.task, runner.result_queue, is_done))
-                consumer.start()
-
-                context_obj = self._prepare_context(kw.get("context", {}),
-                                                    name, self.admin_endpoint)
-                try:
-                    with base_ctx.ContextManager(context_obj):
-                        self.duration = runner.run(name, context_obj,
-                                                   kw.get("args", {}))
-                finally:
-                    is_done.set()
-                    consumer.join()
+        benchmarks = [(name, n, kw) for name in self.config
+                      for n, kw in enumerate(self.config[name])]
+        max_parallel = CONF.benchmark.max_parallel_benchmarks
+        if max_parallel > 1:
+            self._run_parallel(benchmarks, max_parallel)
+        elif CONF.benchmark.reuse_contexts:
+            self._run_with_shared_contexts(benchmarks)
+        else:
+            for name, pos, kw in benchmarks:
+                self._run_benchmark(name, pos, kw)
         self.task.update_status(consts.TaskStatus.FINISHED)
 
     @rutils.log_task_wrapper(LOG.info, _("Check cloud."))
@@ -240,29 +384,59 @@ class BenchmarkEngine(object):
         clients.verified_keystone()
         return self
 
-    def consume_results(self, key, task, result_queue, is_done):
+    def consume_results(self, key, task, result_queue, is_done,
+                        runner_stats=None):
         """Consume scenario runner results from queue and send them to db.
 
         Has to be run from different thread simultaneously with the runner.run
         method.
 
+        Results are saved to db in batches of CONF.benchmark.results_flush_size
+        while the benchmark is running, so they are not accumulated in
+        memory. SLA criteria are checked incrementally as results come.
+        The last record of the benchmark contains the rest of raw results
+        together with duration, runner stats and SLA results.
+
+        Errors of SLA checks and of saving results are logged and results
+        are drained further, otherwise the runner would block forever on
+        the full result queue.
+
         :param key: Scenario identifier
         :param task: Running task
-        :param result_queue: Deque with runner results
+        :param result_queue: ResultQueue with runner results
         :param is_done: Event which is set from the runner thread after the
                         runner finishes it's work.
+        :param runner_stats: Dict with runner specific statistics, it is
+                             filled by the runner and read after is_done is set
         """
+        flush_size = CONF.benchmark.results_flush_size
+        sla_checker = base_sla.SLAChecker(key["kw"])
         results = []
         while True:
-            if result_queue:
-                result = result_queue.popleft()
-                results.append(result)
-            elif is_done.isSet():
+            finished = is_done.isSet()
+            batch = result_queue.get_batch(flush_size - len(results),
+                                           timeout=0.1)
+            try:
+                sla_checker.add(batch)
+            except Exception:
+                LOG.exception("Failed to check SLA of %d results of "
+                              "benchmark %s (position %d)."
+                              % (len(batch), key["name"], key["pos"]))
+            results.extend(batch)
+            if len(results) >= flush_size:
+                try:
+                    task.append_results(key, {"raw": results})
+                except Exception:
+                    LOG.exception("Failed to save %d results of benchmark "
+                                  "%s (position %d)."
+                                  % (len(results), key["name"], key["pos"]))
+                results = []
+            elif finished and not result_queue:
                 break
-            else:
-                time.sleep(0.1)
 
-        sla = base_sla.SLA.check_all(key['kw'], results)
+        duration = self._durations.get((key["name"], key["pos"]),
+                                       self.duration)
         task.append_results(key, {"raw": results,
-                                  "scenario_duration": self.duration,
-                                  "sla": sla})
+                                  "scenario_duration": duration,
+                                  "runner_stats": runner_stats or {},
+                                  "sla": sla_checker.results()})
@@ -39,12 +39,7 @@ def _prepare_data(data, reduce_rows=1000):
         for k, v in d1.iteritems():
             v[-1] = (v[-1] + d2[k]) / 2.0
 
-    atomic_actions = []
-    for row in data["result"]:
-        # find first non-error result to get atomic actions names
-        if not row["error"] and "atomic_actions" in row:
-            atomic_actions = row["atomic_actions"].keys()
-            break
+    atomic_actions = utils.get_atomic_actions_names(data["result"])
     zero_atomic_actions = dict([(a, 0) for a in atomic_actions])
 
     total_durations = {"duration": [], "idle_duration": []}
@@ -75,8 +70,8 @@ def _prepare_data(data, reduce_rows=1000):
                 "idle_duration": row["idle_duration"],
             }
             new_row_atomic = {}
-            for k, v in row["atomic_actions"].iteritems():
-                new_row_atomic[k] = v if v else 0
+            for k in atomic_actions:
+                new_row_atomic[k] = row["atomic_actions"].get(k) or 0
         if store < 1:
             _append(total_durations, new_row_total)
             _append(atomic_durations, new_row_atomic)
@@ -147,16 +142,12 @@ def _process_atomic(result, data):
     #                   "values": [[order, $atomic_actions.duration
     #                              if not $error else 0], ...}]
     #
-    #                 Order of actions in "atomic_action" is similiar for
-    #                 all iteration. So we should take first non "error"
-    #                 iteration. And get in atomitc_iter list:
+    #                 Iterations may have different atomic actions, so
+    #                 we should take them from all non "error" iterations.
+    #                 And get in atomitc_iter list:
     #                 [{"key": "action", "values":[]}]
-    stacked_area = []
-    for row in result["result"]:
-        if not row["error"] and "atomic_actions" in row:
-            stacked_area = [{"key": a, "values": []}
-                            for a in row["atomic_actions"]]
-            break
+    stacked_area = [{"key": a, "values": []}
+                    for a in utils.get_atomic_actions_names(result["result"])]
 
     # NOTE(boris-42): pie is similiar to stacked_area, only difference is in
     #                 structure of values. In case of $error we shouldn't put
@@ -175,9 +166,11 @@ def _process_atomic(result, data):
                 continue
 
             # in case of non error put real durations to pie and stacked area
-            for j, action in enumerate(res["atomic_actions"].keys()):
+            for j, area in enumerate(stacked_area):
+                if area["key"] not in res["atomic_actions"]:
+                    continue
                 # in case any single atomic action failed, put 0
-                action_duration = res["atomic_actions"][action] or 0.0
+                action_duration = res["atomic_actions"][area["key"]] or 0.0
                 pie[j]["values"].append(action_duration)
                 histogram_data[j]["values"].append(action_duration)
 
@@ -217,6 +210,48 @@ def _process_atomic(result, data):
     }
 
 
+def _process_timeline(result):
+    raw = result.get("result", [])
+    throughput = utils.get_throughput_timeline(raw)
+    concurrency = utils.get_concurrency_timeline(raw)
+    schedule = utils.get_rps_data(raw)
+    return {
+        "rps": [
+            {"key": "started", "values": [[s, n] for s, n, f in throughput]},
+            {"key": "failed", "values": [[s, f] for s, n, f in throughput]}
+        ] if throughput else [],
+        "concurrency": [
+            {"key": "in flight", "values": [list(c) for c in concurrency]}
+        ] if concurrency else [],
+        "schedule": [
+            {"key": "requested", "values": [[s, r] for s, r, a in schedule]},
+            {"key": "achieved", "values": [[s, a] for s, r, a in schedule]}
+        ] if schedule else []
+    }
+
+
+def _process_steps(result):
+    runner_stats = result.get("runner_stats", {})
+    loads = utils.get_step_loads(result["key"]["kw"].get("runner", {}),
+                                 runner_stats)
+    rows = []
+    for row in utils.get_steps_data(result.get("result", [])):
+        durations = [round(d, 3) if d is not None else None
+                     for d in row[3:]]
+        rows.append([row[0], loads.get(row[0]), row[1],
+                     "%.1f%%" % row[2]] + durations)
+    steps = {
+        "cols": [{"title": title, "class": "center"}
+                 for title in ("step", "load", "count", "failures",
+                               "avg (sec)", "90 percentile", "95 percentile",
+                               "max (sec)")],
+        "rows": rows
+    }
+    if "capacity" in runner_stats:
+        steps["capacity"] = runner_stats["capacity"]
+    return steps
+
+
 def _get_atomic_action_durations(result):
     raw = result.get('result', [])
     actions_data = utils.get_atomic_actions_data(raw)
@@ -269,6 +304,8 @@ def _process_results(results):
             "config": json.dumps(config, indent=2),
             "duration": _process_main_duration(result, data),
             "atomic": _process_atomic(result, data),
+            "timeline": _process_timeline(result),
+            "steps": _process_steps(result),
             "table_rows": table_rows,
             "table_cols": table_cols
         })
@@ -119,6 +119,20 @@
             .axisLabel("Iterations (frequency)")
             .tickFormat(d3.format('d'));
           this._render(selector, datum, chart)
+        },
+        timeline: function(selector, datum, label){
+          var chart = nv.models.lineChart()
+            .x(function(d) { return d[0] })
+            .y(function(d) { return d[1] })
+            .margin({left: 75})
+            .useInteractiveGuideline(true);
+          chart.xAxis
+            .axisLabel("Time since start (seconds)")
+            .tickFormat(d3.format('d'));
+          chart.yAxis
+            .axisLabel(label)
+            .tickFormat(d3.format('d'));
+          this._render(selector, datum, chart)
         }
       };
 
@@ -134,6 +148,20 @@
           Charts.histogram("#total-histogram",
                            [$scope.scenario.duration.histogram[idx]])
         }
+
+        if ($scope.scenario.timeline.rps.length) {
+          Charts.timeline("#timeline-rps", $scope.scenario.timeline.rps,
+                          "Iterations per second");
+          Charts.timeline("#timeline-concurrency",
+                          $scope.scenario.timeline.concurrency,
+                          "Iterations in flight")
+        }
+
+        if ($scope.scenario.timeline.schedule.length) {
+          Charts.timeline("#timeline-schedule",
+                          $scope.scenario.timeline.schedule,
+                          "Iterations started per second")
+        }
       }
 
       $scope.renderAtomic = function() {
@@ -331,6 +359,25 @@
             </tbody>
           </table>
 
+          <div ng-show="scenario.steps.rows.length">
+            <h2>Table for load steps</h2>
+            <p ng-show="scenario.steps.capacity !== undefined">
+              Capacity found by SLA search: {{scenario.steps.capacity === null ? "none" : scenario.steps.capacity}}
+            </p>
+            <table class="table table-striped">
+              <thead>
+                <tr>
+                  <th ng-repeat="col in scenario.steps.cols track by $index">{{col.title}}</th>
+                <tr>
+              </thead>
+              <tbody>
+                <tr ng-repeat="row in scenario.steps.rows track by $index">
+                  <td ng-repeat="i in row track by $index">{{i}}</td>
+                <tr>
+              </tbody>
+            </table>
+          </div>
+
           {{renderTotal()}}
           <h2>Charts for the Total Duration</h2>
           <div class="chart-container">
@@ -347,6 +394,23 @@
                     ng-model="totalHistogramModel"
                     ng-options="i.label for i in histogramOptions"></select>
           </div>
+
+          <div class="col-md-12" ng-show="scenario.timeline.rps.length">
+            <h2>Load over Time</h2>
+            <div class="chart-container">
+              <svg id="timeline-rps"></svg>
+            </div>
+            <div class="chart-container">
+              <svg id="timeline-concurrency"></svg>
+            </div>
+          </div>
+
+          <div class="col-md-12" ng-show="scenario.timeline.schedule.length">
+            <h2>Requested vs Achieved Iterations per Second</h2>
+            <div class="chart-container">
+              <svg id="timeline-schedule"></svg>
+            </div>
+          </div>
         </script>
 
         <script type="text/ng-template" id="details.html">
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import math
 
 from rally import exceptions
@@ -52,6 +53,26 @@ def percentile(values, percent):
     return (d0 + d1)
 
 
+def get_atomic_actions_names(raw_data):
+    """Retrieve names of atomic actions of successful iterations.
+
+    Iterations may have different atomic actions (e.g. iterations of a
+    mixed workload), so names are collected from all of them.
+
+    :parameter raw_data: list of raw records (scenario runner output)
+
+    :returns: list of names in order of their first appearance
+    """
+    names = []
+    for row in raw_data:
+        if row["error"]:
+            continue
+        for name in row.get("atomic_actions", {}):
+            if name not in names:
+                names.append(name)
+    return names
+
+
 def get_atomic_actions_data(raw_data):
     """Retrieve detailed (by atomic actions & total runtime) benchmark data.
 
@@ -60,16 +81,181 @@ def get_atomic_actions_data(raw_data):
     :returns: dictionary containing atomic action + total duration lists
               for all atomic action keys
     """
-    atomic_actions = []
-    for row in raw_data:
-        # find first non-error result to get atomic actions names
-        if not row["error"] and "atomic_actions" in row:
-            atomic_actions = row["atomic_actions"].keys()
     actions_data = {}
-    for atomic_action in atomic_actions:
+    for atomic_action in get_atomic_actions_names(raw_data):
         actions_data[atomic_action] = [
             r["atomic_actions"][atomic_action]
             for r in raw_data
-            if r["atomic_actions"].get(atomic_action) is not None]
+            if r.get("atomic_actions", {}).get(atomic_action) is not None]
     actions_data["total"] = [r["duration"] for r in raw_data if not r["error"]]
+    if any("intended_start" in r for r in raw_data):
+        actions_data["total (from intended start)"] = [
+            get_latency_from_intended_start(r)
+            for r in raw_data if not r["error"] and "intended_start" in r]
     return actions_data
+
+
+def get_latency_from_intended_start(row):
+    """Get latency of iteration measured from its intended start time.
+
+    Unlike the duration of iteration, this latency includes the time
+    iteration waited to be actually started, so it is not affected by
+    coordinated omission when the runner can't keep up with its schedule.
+
+    :parameter row: raw record with intended_start and actual_start keys
+
+    :returns: float value
+    """
+    return (row["actual_start"] - row["intended_start"] +
+            row["duration"] + row["idle_duration"])
+
+
+def get_http_calls_data(raw_data):
+    """Retrieve latency & count stats of HTTP calls of all iterations.
+
+    :parameter raw_data: list of raw records (scenario runner output)
+
+    :returns: list of tuples (call, count, calls per iteration, min, avg,
+              max, errors) sorted by call, where call is "<method> <url>",
+              calls per iteration are counted only for iterations with
+              recorded HTTP calls and errors is a number of failed calls
+    """
+    rows = [r["http_calls"] for r in raw_data if "http_calls" in r]
+    calls = {}
+    for row in rows:
+        for name, stats in row.iteritems():
+            if name not in calls:
+                calls[name] = dict(stats)
+                continue
+            call = calls[name]
+            for key in ("count", "duration", "errors"):
+                call[key] += stats[key]
+            call["min"] = min(call["min"], stats["min"])
+            call["max"] = max(call["max"], stats["max"])
+    return [(name, stats["count"], float(stats["count"]) / len(rows),
+             stats["min"], stats["duration"] / stats["count"], stats["max"],
+             stats["errors"])
+            for name, stats in sorted(calls.items())]
+
+
+def get_rps_data(raw_data):
+    """Retrieve requested and achieved iterations per second.
+
+    :parameter raw_data: list of raw records (scenario runner output)
+
+    :returns: list of tuples (second, requested, achieved), where second is
+              a number of the second since the start of the schedule,
+              requested is a number of iterations scheduled to be started
+              in this second and achieved is a number of iterations
+              actually started in it
+    """
+    rows = [r for r in raw_data if "intended_start" in r]
+    if not rows:
+        return []
+    start = min(r["intended_start"] for r in rows)
+    requested = collections.Counter(int(r["intended_start"] - start)
+                                    for r in rows)
+    achieved = collections.Counter(int(max(r["actual_start"] - start, 0))
+                                   for r in rows)
+    seconds = max(max(requested), max(achieved)) + 1
+    return [(s, requested[s], achieved[s]) for s in range(seconds)]
+
+
+def get_throughput_timeline(raw_data):
+    """Retrieve number of iterations started per second of the benchmark.
+
+    :parameter raw_data: list of raw records (scenario runner output)
+
+    :returns: list of tuples (second, started, failed), where second is
+              a number of the second since the start of the first
+              iteration, started is a number of iterations started in
+              this second and failed is a number of them that failed
+    """
+    rows = [r for r in raw_data if "timestamp" in r]
+    if not rows:
+        return []
+    start = min(r["timestamp"] for r in rows)
+    started = collections.Counter(int(r["timestamp"] - start) for r in rows)
+    failed = collections.Counter(int(r["timestamp"] - start)
+                                 for r in rows if r["error"])
+    return [(s, started[s], failed[s]) for s in range(max(started) + 1)]
+
+
+def get_concurrency_timeline(raw_data):
+    """Retrieve max number of iterations in flight per second.
+
+    :parameter raw_data: list of raw records (scenario runner output)
+
+    :returns: list of tuples (second, concurrency), where second is
+              a number of the second since the start of the first
+              iteration and concurrency is a max number of iterations
+              running simultaneously during this second
+    """
+    rows = [r for r in raw_data if "timestamp" in r]
+    if not rows:
+        return []
+    start = min(r["timestamp"] for r in rows)
+    events = []
+    for r in rows:
+        began = r["timestamp"] - start
+        events.append((began, 1))
+        events.append((began + r["duration"] + r["idle_duration"], -1))
+    # NOTE: on equal time iteration end (-1) goes before start (+1)
+    events.sort()
+
+    timeline = [0] * (int(events[-1][0]) + 1)
+    current = 0
+    last_second = 0
+    for moment, delta in events:
+        second = int(moment)
+        for s in range(last_second + 1, second + 1):
+            timeline[s] = current
+        current += delta
+        timeline[second] = max(timeline[second], current)
+        last_second = second
+    return list(enumerate(timeline))
+
+
+def get_steps_data(raw_data):
+    """Retrieve latency and error rate of each step of stepped load.
+
+    :parameter raw_data: list of raw records (scenario runner output)
+
+    :returns: list of tuples (step, count, failures, avg, 90 percentile,
+              95 percentile, max), where count is a number of iterations
+              of the step, failures is a percent of failed of them and the
+              rest are statistics of durations of successful iterations
+              (None if there are no such iterations)
+    """
+    steps = collections.defaultdict(list)
+    for r in raw_data:
+        if "step" in r:
+            steps[r["step"]].append(r)
+
+    steps_data = []
+    for step, rows in sorted(steps.items()):
+        durations = [r["duration"] for r in rows if not r["error"]]
+        failures = (len(rows) - len(durations)) * 100.0 / len(rows)
+        if durations:
+            stats = (mean(durations), percentile(durations, 0.90),
+                     percentile(durations, 0.95), max(durations))
+        else:
+            stats = (None, None, None, None)
+        steps_data.append((step, len(rows), failures) + stats)
+    return steps_data
+
+
+def get_step_loads(runner_config, runner_stats):
+    """Retrieve loads of the steps of stepped (or capacity search) load.
+
+    :parameter runner_config: runner section of the benchmark config
+    :parameter runner_stats: stats saved by the runner
+
+    :returns: dict {step: load}; the loads recorded by the runner are
+              preferred over the steps from the config, since capacity
+              search chooses its loads at run time
+    """
+    loads = dict(enumerate(runner_config.get("steps", [])))
+    for step in runner_stats.get("steps", []):
+        loads[step["step"]] = step["load"]
+    return loads
@@ -15,7 +15,9 @@
 
 import abc
 import collections
+import os
 import random
+import threading
 
 import jsonschema
 from oslo.config import cfg
@@ -32,10 +34,140 @@ from rally import utils as rutils
 
 LOG = logging.getLogger(__name__)
 
+runner_opts = [
+    cfg.IntOpt("result_queue_size", default=10000,
+               help="Max number of iteration results buffered between "
+                    "the scenario runner and the results consumer, the "
+                    "runner is blocked when the buffer is full."),
+    cfg.BoolOpt("strict_results_validation", default=False,
+                help="Validate each iteration result against the full "
+                     "JSON schema instead of the fast structural check "
+                     "(useful for debugging of new runners).")
+]
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(runner_opts, group=benchmark_group)
+
+# Clients are cached per process (i.e. per runner worker) for the whole
+# worker lifetime, so iterations don't re-authenticate in keystone each time.
+_CLIENTS_CACHE = {}
+_CLIENTS_CACHE_LOCK = threading.Lock()
+
+# Benchmark installed in the runner worker process by _worker_init()
+_WORKER_BENCHMARK = {}
+
+
+def _get_clients(endpoint):
+    """Return cached osclients.Clients object for the given endpoint.
+
+    Cached clients are invalidated if their keystone token expires soon.
+
+    :param endpoint: objects.Endpoint instance
+    :returns: tuple (osclients.Clients, True if clients were taken from
+              the cache and are already authenticated)
+    """
+    key = tuple(sorted(endpoint.to_dict().items()))
+    with _CLIENTS_CACHE_LOCK:
+        clients = _CLIENTS_CACHE.get(key)
+        if clients is None:
+            clients = _CLIENTS_CACHE[key] = osclients.Clients(endpoint)
+            return clients, False
+
+        keystone = clients.cache.get("keystone")
+        if keystone is None:
+            return clients, False
+        if keystone.auth_ref.will_expire_soon():
+            LOG.debug("Token of user %s expires soon, reauthenticating." %
+                      endpoint.username)
+            clients.clear()
+            return clients, False
+        return clients, True
+
+
+def _get_clients_cache_stats(*clients_info):
+    """Count clients cache hits & time spent on keystone authentication.
+
+    Clients that are not cached by the worker may still take the keystone
+    token from the token cache shared by processes, these are counted as
+    token cache hits instead of authentications.
+
+    :param clients_info: tuples (osclients.Clients, is_cached) as returned
+                         by _get_clients()
+    :returns: dict with stats of clients cache usage by a single iteration
+    """
+    stats = {"hits": 0, "misses": 0, "authentications": 0,
+             "auth_duration": 0.0, "token_cache_hits": 0,
+             "token_cache_misses": 0}
+    for clients, is_cached in clients_info:
+        if is_cached:
+            stats["hits"] += 1
+            continue
+        stats["misses"] += 1
+        if "keystone" not in clients.cache:
+            continue
+        if clients.token_cache_hit:
+            stats["token_cache_hits"] += 1
+            continue
+        if clients.token_cache_hit is not None:
+            stats["token_cache_misses"] += 1
+        stats["authentications"] += 1
+        stats["auth_duration"] += clients.auth_duration
+    return stats
+
+
+def _get_http_pool_stats():
+    """Return totals of the HTTP connection pool of the worker process.
+
+    Totals grow during the whole process lifetime, so the latest ones of
+    each process are enough to sum up stats of the whole run.
+    """
+    stats = {"pid": os.getpid(), "connections": 0, "requests": 0}
+    for host_stats in osclients.get_http_pool().stats().values():
+        stats["connections"] += host_stats["connections"]
+        stats["requests"] += host_stats["requests"]
+    return stats
 
-def format_result_on_timeout(exc, timeout):
+
+def _get_http_calls_stats(calls):
+    """Aggregate HTTP calls of a single iteration by method & URL template.
+
+    :param calls: list of calls recorded by osclients.record_http_calls()
+    :returns: dict {"<method> <url>": {"count", "duration", "min", "max",
+              "errors"}}, where duration is the total one of all calls and
+              errors is the number of calls without response or with
+              status >= 400
+    """
+    stats = {}
+    for call in calls:
+        name = "%s %s" % (call["method"], call["url"])
+        duration = call["duration"]
+        if name not in stats:
+            stats[name] = {"count": 0, "duration": 0.0, "min": duration,
+                           "max": duration, "errors": 0}
+        item = stats[name]
+        item["count"] += 1
+        item["duration"] += duration
+        item["min"] = min(item["min"], duration)
+        item["max"] = max(item["max"], duration)
+        if call["status"] is None or call["status"] >= 400:
+            item["errors"] += 1
+    return stats
+
+
+def _clear_clients_cache():
+    """Drop clients cached by the current process.
+
+    Worker processes are forked from the runner, so they call it on start
+    to drop clients inherited from the parent process (their connections
+    must not be shared between processes).
+    """
+    with _CLIENTS_CACHE_LOCK:
+        _CLIENTS_CACHE.clear()
+
+
+def format_result_on_error(exc, duration):
     return {
-        "duration": timeout,
+        "duration": duration,
         "idle_duration": 0,
         "scenario_output": {"errors": "", "data": {}},
         "atomic_actions": {},
@@ -43,16 +175,59 @@ def format_result_on_timeout(exc, timeout):
     }
 
 
-def _get_scenario_context(context):
+def format_result_on_timeout(exc, timeout):
+    return format_result_on_error(exc, timeout)
+
+
+def _get_scenario_context(context, user_index=None):
     scenario_ctx = {}
     for key, value in context.iteritems():
         if key != "users":
             scenario_ctx[key] = value
-        else:
+        elif user_index is None:
             scenario_ctx["user"] = random.choice(value)
+        else:
+            scenario_ctx["user"] = value[user_index]
     return scenario_ctx
 
 
+def _get_user_index(context):
+    """Choose a random user, that will be used by a single iteration.
+
+    :param context: Benchmark context
+    :returns: index of the user in context["users"] or None if there are
+              no users in the context
+    """
+    if not context.get("users"):
+        return None
+    return random.randrange(len(context["users"]))
+
+
+def _worker_init(cls, method_name, context, kwargs):
+    """Install the benchmark into the runner worker process.
+
+    It is used as an initializer of runner worker processes, so the
+    scenario, its arguments and the whole benchmark context (with all
+    users and tenants) are passed to each worker once (on fork) instead
+    of being pickled together with every single iteration.
+    """
+    _clear_clients_cache()
+    _WORKER_BENCHMARK.update({"cls": cls, "method_name": method_name,
+                              "context": context, "kwargs": kwargs})
+
+
+def _run_scenario_once_in_worker(args):
+    """Run the benchmark installed by _worker_init() once.
+
+    :param args: tuple (iteration, user_index)
+    """
+    iteration, user_index = args
+    context = _get_scenario_context(_WORKER_BENCHMARK["context"], user_index)
+    return _run_scenario_once((iteration, _WORKER_BENCHMARK["cls"],
+                               _WORKER_BENCHMARK["method_name"], context,
+                               _WORKER_BENCHMARK["kwargs"]))
+
+
 def _run_scenario_once(args):
     iteration, cls, method_name, context, kwargs = args
 
@@ -60,17 +235,23 @@ def _run_scenario_once(args):
              {"task": context["task"]["uuid"], "iteration": iteration})
 
     context["iteration"] = iteration
+    admin_clients, admin_cached = _get_clients(context["admin"]["endpoint"])
+    user_clients, user_cached = _get_clients(context["user"]["endpoint"])
     scenario = cls(
             context=context,
-            admin_clients=osclients.Clients(context["admin"]["endpoint"]),
-            clients=osclients.Clients(context["user"]["endpoint"]))
+            admin_clients=admin_clients,
+            clients=user_clients)
 
     error = []
     scenario_output = {"errors": "", "data": {}}
+    http_calls = []
+    timestamp = rutils.timestamp()
     try:
-        with rutils.Timer() as timer:
-            scenario_output = getattr(scenario,
-                                      method_name)(**kwargs) or scenario_output
+        with osclients.record_http_calls(
+                CONF.trace_http_calls) as http_calls:
+            with rutils.Timer() as timer:
+                scenario_output = getattr(
+                    scenario, method_name)(**kwargs) or scenario_output
     except Exception as e:
         error = utils.format_exc(e)
         if cfg.CONF.debug:
@@ -81,11 +262,144 @@ def _run_scenario_once(args):
                  {"task": context["task"]["uuid"], "iteration": iteration,
                   "status": status})
 
-        return {"duration": timer.duration() - scenario.idle_duration(),
-                "idle_duration": scenario.idle_duration(),
-                "error": error,
-                "scenario_output": scenario_output,
-                "atomic_actions": scenario.atomic_actions()}
+        result = {"duration": timer.duration() - scenario.idle_duration(),
+                  "timestamp": timestamp,
+                  "idle_duration": scenario.idle_duration(),
+                  "error": error,
+                  "scenario_output": scenario_output,
+                  "atomic_actions": scenario.atomic_actions(),
+                  "clients_cache": _get_clients_cache_stats(
+                      (admin_clients, admin_cached),
+                      (user_clients, user_cached)),
+                  "http_pool": _get_http_pool_stats()}
+        if CONF.trace_http_calls:
+            result["http_calls"] = _get_http_calls_stats(http_calls)
+        return result
+
+
+class ResultQueue(object):
+    """Bounded blocking queue of iteration results.
+
+    The runner appends results one by one and blocks while the queue is
+    full, the consumer takes them in batches and is woken up as soon as
+    new results are appended.
+    """
+
+    def __init__(self, maxsize=0):
+        """Queue constructor.
+
+        :param maxsize: max number of results in queue, 0 means no limit
+        """
+        self.maxsize = maxsize
+        self._results = collections.deque()
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return len(self._results)
+
+    def __iter__(self):
+        return iter(self._results)
+
+    def __getitem__(self, index):
+        return self._results[index]
+
+    def append(self, result):
+        with self._cond:
+            while self.maxsize and len(self._results) >= self.maxsize:
+                self._cond.wait()
+            self._results.append(result)
+            self._cond.notify_all()
+
+    def get_batch(self, size, timeout=None):
+        """Take up to size results from the queue.
+
+        :param size: max number of results to take
+        :param timeout: time to wait for results if queue is empty
+        :returns: list of results, empty if there are no results
+        """
+        with self._cond:
+            if not self._results and timeout:
+                self._cond.wait(timeout)
+            batch = [self._results.popleft()
+                     for i in range(min(size, len(self._results)))]
+            if batch:
+                self._cond.notify_all()
+            return batch
+
+
+_JSON_TYPES = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (basestring,),
+    "number": (int, long, float),
+    "integer": (int, long),
+    "boolean": (bool,),
+    "null": (type(None),)
+}
+
+_SUPPORTED_SCHEMA_KEYWORDS = set(["$schema", "type", "properties",
+                                  "patternProperties",
+                                  "additionalProperties", "items"])
+
+
+def _compile_schema_check(schema):
+    """Compile JSON schema into a fast check function.
+
+    The check is much cheaper than jsonschema validation, that is important
+    for runners that send thousands of results per second. Only the subset
+    of JSON schema used by result schemas is supported: type, properties,
+    patternProperties (with ".*" pattern only), additionalProperties (False
+    only) and items.
+
+    :param schema: JSON schema
+    :returns: function that takes a value and raises
+              jsonschema.ValidationError if it doesn't match the schema
+    :raises ValueError: if the schema uses unsupported keywords
+    """
+    unsupported = set(schema) - _SUPPORTED_SCHEMA_KEYWORDS
+    patterns = schema.get("patternProperties", {})
+    additional = schema.get("additionalProperties", True)
+    if unsupported or set(patterns) - set([".*"]) or additional not in (
+            True, False):
+        raise ValueError("Schema %r is not supported by the fast check."
+                         % schema)
+
+    types = schema.get("type", [])
+    if isinstance(types, basestring):
+        types = [types]
+    python_types = tuple(set(python_type for name in types
+                             for python_type in _JSON_TYPES[name]))
+    # NOTE: bool is a subclass of int, but it is not a JSON number
+    reject_bool = bool(types) and "boolean" not in types
+    type_names = ", ".join("'%s'" % t for t in types)
+    properties = dict((name, _compile_schema_check(subschema))
+                      for name, subschema
+                      in schema.get("properties", {}).iteritems())
+    pattern_check = (_compile_schema_check(patterns[".*"])
+                     if patterns else None)
+    items_check = (_compile_schema_check(schema["items"])
+                   if "items" in schema else None)
+
+    def check(value):
+        if python_types and (not isinstance(value, python_types)
+                             or reject_bool and isinstance(value, bool)):
+            raise jsonschema.ValidationError(
+                "%r is not of type %s" % (value, type_names))
+        if isinstance(value, dict):
+            for name, item in value.iteritems():
+                if name in properties:
+                    properties[name](item)
+                elif pattern_check is None and not additional:
+                    raise jsonschema.ValidationError(
+                        "Additional properties are not allowed "
+                        "(%r was unexpected)" % name)
+                if pattern_check is not None:
+                    pattern_check(item)
+        elif isinstance(value, list) and items_check is not None:
+            for item in value:
+                items_check(item)
+
+    return check
 
 
 class ScenarioRunnerResult(dict):
@@ -122,19 +436,57 @@ class ScenarioRunnerResult(dict):
                     ".*": {"type": ["number", "null"]}
                 }
             },
+            "http_calls": {
+                "type": "object",
+                "patternProperties": {
+                    ".*": {
+                        "type": "object",
+                        "patternProperties": {
+                            ".*": {"type": "number"}
+                        }
+                    }
+                }
+            },
             "error": {
                 "type": "array",
                 "items": {
                     "type": "string"
                 }
+            },
+            "iteration": {
+                "type": "integer"
+            },
+            "timestamp": {
+                "type": "number"
+            },
+            "intended_start": {
+                "type": "number"
+            },
+            "actual_start": {
+                "type": "number"
+            },
+            "step": {
+                "type": "integer"
+            },
+            "after_deadline": {
+                "type": "boolean"
             }
         },
         "additionalProperties": False
     }
 
+    RESULT_VALIDATOR = jsonschema.Draft4Validator(RESULT_SCHEMA)
+
     def __init__(self, result_list):
         super(ScenarioRunnerResult, self).__init__(result_list)
-        jsonschema.validate(result_list, self.RESULT_SCHEMA)
+        if CONF.benchmark.strict_results_validation:
+            self.RESULT_VALIDATOR.validate(result_list)
+        else:
+            self._check(result_list)
+
+    # NOTE: The fast check is generated from RESULT_SCHEMA, so new keys of
+    #       results are added to the schema only.
+    _check = staticmethod(_compile_schema_check(RESULT_SCHEMA))
 
 
 class ScenarioRunner(object):
@@ -153,21 +505,31 @@ class ScenarioRunner(object):
         """Runner constructor.
 
         It sets task and config to local variables. Also initialize
-        result_queue, where results will be put by _send_result method.
+        result_queue, where results will be put by _send_result method,
+        and stats, where runner specific statistics can be saved (they are
+        stored together with the results).
 
         :param task: Instance of objects.Task
         :param config: Dict with runner section from benchmark configuration
         """
         self.task = task
         self.config = config
-        self.result_queue = collections.deque()
+        self.result_queue = ResultQueue(CONF.benchmark.result_queue_size)
+        self.stats = {}
+        self.clients_cache_stats = {"hits": 0, "misses": 0,
+                                    "authentications": 0,
+                                    "auth_duration": 0.0,
+                                    "token_cache_hits": 0,
+                                    "token_cache_misses": 0}
+        self.http_pool_stats = {}
 
     @staticmethod
     def _get_cls(runner_type):
-        for runner in rutils.itersubclasses(ScenarioRunner):
-            if runner_type == runner.__execution_type__:
-                return runner
-        raise exceptions.NoSuchRunner(type=runner_type)
+        runner = rutils.get_plugin(ScenarioRunner, runner_type,
+                                   key="__execution_type__")
+        if runner is None:
+            raise exceptions.NoSuchRunner(type=runner_type)
+        return runner
 
     @staticmethod
     def get_runner(task, config):
@@ -185,6 +547,11 @@ class ScenarioRunner(object):
         runner = ScenarioRunner._get_cls(config.get("type",
                                                     consts.RunnerType.SERIAL))
         jsonschema.validate(config, runner.CONFIG_SCHEMA)
+        runner._validate_config(config)
+
+    @classmethod
+    def _validate_config(cls, config):
+        """Validates parts of runner's config that CONFIG_SCHEMA can't."""
 
     @abc.abstractmethod
     def _run_scenario(self, cls, method_name, context, args):
@@ -207,10 +574,63 @@ class ScenarioRunner(object):
         # NOTE(boris-42): processing @types decorators
         args = types.preprocess(cls, method_name, context, args)
 
-        with rutils.Timer() as timer:
-            self._run_scenario(cls, method_name, context, args)
+        try:
+            with rutils.Timer() as timer:
+                self._run_scenario(cls, method_name, context, args)
+        finally:
+            # NOTE: Only clients of iterations run by this process (e.g. by
+            #       the serial runner) are dropped here, worker processes
+            #       drop their caches on start
+            _clear_clients_cache()
+        # NOTE: Saved with the benchmark results as runner stats
+        self.stats["clients_cache"] = dict(
+            self.clients_cache_stats,
+            auth_time_saved=self.get_auth_time_saved())
+        self.stats["http_pool"] = self.get_http_pool_totals()
+        LOG.info("Task %(task)s | Clients cache: %(hits)d hits, "
+                 "%(misses)d misses, %(authentications)d authentications "
+                 "took %(auth_duration).3fs, saved ~%(auth_time_saved).3fs | "
+                 "Token cache: %(token_cache_hits)d hits, "
+                 "%(token_cache_misses)d misses"
+                 % dict(self.stats["clients_cache"], task=self.task["uuid"]))
+        LOG.info("Task %(task)s | HTTP pool: %(requests)d requests over "
+                 "%(connections)d connections in %(processes)d processes"
+                 % dict(self.stats["http_pool"], task=self.task["uuid"]))
         return timer.duration()
 
+    def get_http_pool_totals(self):
+        """Sum up HTTP connection pool stats of all worker processes."""
+        totals = {"connections": 0, "requests": 0,
+                  "processes": len(self.http_pool_stats)}
+        for stats in self.http_pool_stats.values():
+            totals["connections"] += stats["connections"]
+            totals["requests"] += stats["requests"]
+        return totals
+
+    def get_auth_time_saved(self):
+        """Estimate time saved on keystone authentication by clients cache.
+
+        Each cache hit is supposed to save as much time as an average
+        authentication took.
+
+        :returns: estimated time in seconds
+        """
+        stats = self.clients_cache_stats
+        if not stats["authentications"]:
+            return 0.0
+        return (stats["hits"] * stats["auth_duration"] /
+                stats["authentications"])
+
+    def _update_clients_cache_stats(self, stats):
+        for key, value in stats.iteritems():
+            self.clients_cache_stats[key] += value
+
+    def _update_http_pool_stats(self, stats, prefix=""):
+        key = "%s%s" % (prefix, stats["pid"])
+        current = self.http_pool_stats.get(key)
+        if current is None or current["requests"] <= stats["requests"]:
+            self.http_pool_stats[key] = stats
+
     def _send_result(self, result):
         """Send partial result to consumer.
 
@@ -218,4 +638,8 @@ class ScenarioRunner(object):
                        ScenarioRunnerResult schema, otherwise
                        ValidationError is raised.
         """
+        if "clients_cache" in result:
+            self._update_clients_cache_stats(result.pop("clients_cache"))
+        if "http_pool" in result:
+            self._update_http_pool_stats(result.pop("http_pool"))
         self.result_queue.append(ScenarioRunnerResult(result))
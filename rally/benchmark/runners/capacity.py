@@ -0,0 +1,215 @@
+# Copyright 2014: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import math
+
+from rally.benchmark.runners import stepped
+from rally.benchmark.sla import base as sla_base
+from rally import consts
+from rally.openstack.common import log as logging
+from rally import utils as rutils
+
+
+LOG = logging.getLogger(__name__)
+
+
+class CapacityScenarioRunner(stepped.SteppedScenarioRunner):
+    """Searches for the highest load at which the SLA still holds.
+
+    The load is either concurrency or runs per second (see the load
+    parameter). The runner probes the min and max load first and then
+    bisects the range between the highest passed and the lowest failed
+    probe, until it is narrower than precision or the max_iterations
+    budget is exhausted. Each probe is executed like a step of the
+    stepped runner (for times_per_step iterations or duration_per_step
+    seconds) and is checked against the SLA criteria from the sla
+    parameter of the runner (the same criteria as in the sla section of
+    the task).
+
+    The found capacity (None if even the min load violates the SLA) and
+    the stats of all probes are saved in runner stats, results are tagged
+    with the index of their probe.
+    """
+
+    __execution_type__ = consts.RunnerType.CAPACITY
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": rutils.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "load": {
+                "enum": [stepped.LOAD_CONCURRENCY, stepped.LOAD_RPS]
+            },
+            "min": {
+                "type": "number",
+                "exclusiveMinimum": True,
+                "minimum": 0
+            },
+            "max": {
+                "type": "number",
+                "exclusiveMinimum": True,
+                "minimum": 0
+            },
+            "precision": {
+                "type": "number",
+                "exclusiveMinimum": True,
+                "minimum": 0
+            },
+            "times_per_step": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "duration_per_step": {
+                "type": "number",
+                "exclusiveMinimum": True,
+                "minimum": 0
+            },
+            "max_iterations": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "sla": {
+                "type": "object",
+                "minProperties": 1
+            },
+            "timeout": {
+                "type": "number",
+                "minimum": 1
+            }
+        },
+        "required": ["type", "max", "sla"],
+        "anyOf": [
+            {
+                "properties": {"load": {"enum": [stepped.LOAD_RPS]}},
+                "required": ["load"]
+            },
+            {
+                "properties": {"min": {"type": "integer"},
+                               "max": {"type": "integer"}}
+            }
+        ],
+        "not": {"required": ["times_per_step", "duration_per_step"]},
+        "additionalProperties": False
+    }
+
+    def __init__(self, task, config):
+        super(CapacityScenarioRunner, self).__init__(task, config)
+        self._step_results = []
+        # NOTE: total duration and number of iterations of all probes
+        self._iterations_duration = 0.0
+        self._iterations_num = 0
+
+    def _send_result(self, result):
+        self._step_results.append(result)
+        super(CapacityScenarioRunner, self)._send_result(result)
+
+    def _is_concurrency(self):
+        return (self.config.get("load", stepped.LOAD_CONCURRENCY) ==
+                stepped.LOAD_CONCURRENCY)
+
+    def _expected_iterations(self, load):
+        """Estimate the number of iterations the probe of load takes."""
+        duration = self.config.get("duration_per_step")
+        if not duration:
+            return self.config.get("times_per_step", 1)
+        if self._is_concurrency():
+            # NOTE: Each of load concurrent iterations slots runs iterations
+            #       one after another for the duration, so the count depends
+            #       on the mean duration of iterations of previous probes.
+            #       Before the first probe at least load iterations are run.
+            if not self._iterations_duration:
+                return int(math.ceil(load))
+            mean = self._iterations_duration / self._iterations_num
+            return int(math.ceil(load * max(duration / mean, 1)))
+        return int(math.ceil(load * duration))
+
+    def _probe(self, step, load, cls, method_name, context, args):
+        self._step_results = []
+        step_stats = self._run_step(step, load, cls, method_name, context,
+                                    args)
+        if self._step_results:
+            sla = sla_base.SLA.check_all({"sla": self.config["sla"]},
+                                         self._step_results)
+            self._iterations_duration += sum(r["duration"]
+                                             for r in self._step_results)
+            self._iterations_num += len(self._step_results)
+        else:
+            sla = []
+        step_stats.update({
+            "iterations": len(self._step_results),
+            "sla": sla,
+            "success": bool(sla) and all(c["success"] for c in sla)
+        })
+        self._step_results = []
+        return step_stats
+
+    def _next_load(self, capacity, failed):
+        if capacity is None or failed is None:
+            return None
+        precision = self.config.get("precision", 1)
+        if failed - capacity <= precision:
+            return None
+        load = (capacity + failed) / 2.0
+        if self._is_concurrency():
+            load = int(load)
+        return load if load > capacity else None
+
+    @classmethod
+    def _validate_config(cls, config):
+        sla_base.SLA.validate(config["sla"])
+
+    def _run_scenario(self, cls, method_name, context, args):
+        max_iterations = self.config.get("max_iterations")
+
+        capacity = failed = None
+        loads = [self.config.get("min", 1), self.config["max"]]
+        if loads[0] >= loads[1]:
+            loads = loads[1:]
+        iterations = 0
+        step = 0
+        while True:
+            load = loads.pop(0) if loads else self._next_load(capacity,
+                                                              failed)
+            if load is None:
+                break
+            if max_iterations and (
+                    iterations >= max_iterations or
+                    iterations + self._expected_iterations(load) >
+                    max_iterations):
+                LOG.warning("Task %(task)s | Capacity search is stopped: "
+                            "budget of %(max)d iterations is exhausted." %
+                            {"task": context["task"]["uuid"],
+                             "max": max_iterations})
+                break
+
+            step_stats = self._probe(step, load, cls, method_name, context,
+                                     args)
+            iterations += step_stats["iterations"]
+            step += 1
+            if step_stats["success"]:
+                capacity = load
+            else:
+                failed = load
+                if capacity is None:
+                    break
+
+        self.stats["capacity"] = capacity
+        LOG.info("Task %(task)s | Capacity: %(load)s %(capacity)s" %
+                 {"task": context["task"]["uuid"],
+                  "load": self.config.get("load", stepped.LOAD_CONCURRENCY),
+                  "capacity": capacity})
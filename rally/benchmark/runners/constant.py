@@ -14,12 +14,14 @@
 #    under the License.
 
 
+import itertools
 import multiprocessing
-import time
+import select
 
 from rally.benchmark.runners import base
 from rally.benchmark import utils
 from rally import consts
+from rally import exceptions
 from rally.openstack.common import log as logging
 from rally import utils as rutils
 
@@ -27,6 +29,150 @@ from rally import utils as rutils
 LOG = logging.getLogger(__name__)
 
 
+def _worker_process(conn, cls, method_name, context, args):
+    """Run iterations received through the pipe one by one."""
+    base._worker_init(cls, method_name, context, args)
+    while True:
+        scenario_args = conn.recv()
+        if scenario_args is None:
+            break
+        conn.send(base._run_scenario_once_in_worker(scenario_args))
+    conn.close()
+
+
+class _IterationPool(object):
+    """Pool of worker processes that enforces the per-iteration timeout.
+
+    Each worker runs a single iteration at a time, so the pool knows which
+    iteration is running in which worker and when it was started. An
+    iteration that exceeds the timeout is recorded as failed one (with its
+    own start time) and its worker is killed and replaced with a new one,
+    so the concurrency slot is freed right away instead of being held by
+    the stuck iteration. A worker that dies is replaced as well and its
+    iteration is recorded as failed with the exit code of the worker.
+
+    Every result carries the index of its iteration.
+    """
+
+    def __init__(self, concurrency, timeout, cls, method_name, context,
+                 args):
+        self.timeout = timeout
+        self._worker_args = (cls, method_name, context, args)
+        self._processes = {}
+        # NOTE: busy workers are mapped to (iteration, timestamp, start)
+        self._busy = {}
+        self._idle = [self._start_worker() for i in range(concurrency)]
+
+    @property
+    def idle(self):
+        return len(self._idle)
+
+    @property
+    def busy(self):
+        return len(self._busy)
+
+    def _start_worker(self):
+        conn, worker_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_worker_process, args=(worker_conn,) + self._worker_args)
+        process.daemon = True
+        process.start()
+        worker_conn.close()
+        self._processes[conn] = process
+        return conn
+
+    def _stop_worker(self, conn, kill=False):
+        process = self._processes.pop(conn)
+        if kill:
+            process.terminate()
+        else:
+            try:
+                conn.send(None)
+            except (IOError, EOFError):
+                process.terminate()
+        process.join()
+        conn.close()
+
+    def _replace_worker(self, conn):
+        self._stop_worker(conn, kill=True)
+        self._idle.append(self._start_worker())
+
+    def submit(self, scenario_args):
+        """Start iteration in one of the idle workers.
+
+        :param scenario_args: tuple (iteration, user_index)
+        """
+        conn = self._idle.pop()
+        conn.send(scenario_args)
+        self._busy[conn] = (scenario_args[0], rutils.timestamp(),
+                            rutils.monotonic())
+
+    def _cancel(self, conn, duration):
+        iteration, timestamp, start = self._busy.pop(conn)
+        LOG.warning("Iteration %(iteration)s is cancelled after "
+                    "%(duration).2f sec (timeout is %(timeout)s sec)." %
+                    {"iteration": iteration, "duration": duration,
+                     "timeout": self.timeout})
+        self._replace_worker(conn)
+        return dict(base.format_result_on_timeout(
+                        exceptions.TimeoutException(), duration),
+                    iteration=iteration, timestamp=timestamp)
+
+    def _worker_died(self, conn, iteration, timestamp, duration):
+        process = self._processes[conn]
+        process.join()
+        exc = exceptions.IterationWorkerDied(iteration=iteration,
+                                             exitcode=process.exitcode)
+        LOG.error(exc)
+        self._replace_worker(conn)
+        return dict(base.format_result_on_error(exc, duration),
+                    iteration=iteration, timestamp=timestamp)
+
+    def get_results(self, cancel_at=None):
+        """Wait until some of the running iterations end or time out.
+
+        :param cancel_at: monotonic time, iterations that are still running
+                          at this moment are cancelled even if they haven't
+                          exceeded the timeout yet
+        :returns: list of results of ended iterations
+        """
+        if not self._busy:
+            return []
+        first_deadline = (min(start for i, ts, start in self._busy.values())
+                          + self.timeout)
+        if cancel_at is not None:
+            first_deadline = min(first_deadline, cancel_at)
+        ready = select.select(
+            list(self._busy), [], [],
+            max(first_deadline - rutils.monotonic(), 0))[0]
+
+        results = []
+        for conn in ready:
+            iteration, timestamp, start = self._busy.pop(conn)
+            try:
+                results.append(dict(conn.recv(), iteration=iteration))
+                self._idle.append(conn)
+            except EOFError:
+                results.append(self._worker_died(conn, iteration, timestamp,
+                                                 rutils.monotonic() - start))
+
+        now = rutils.monotonic()
+        for conn, (iteration, timestamp, start) in self._busy.items():
+            if now - start >= self.timeout:
+                results.append(self._cancel(conn, self.timeout))
+            elif cancel_at is not None and now >= cancel_at:
+                results.append(self._cancel(conn, now - start))
+        return results
+
+    def close(self):
+        for conn in self._idle:
+            self._stop_worker(conn)
+        for conn in self._busy:
+            self._stop_worker(conn, kill=True)
+        self._idle = []
+        self._busy = {}
+
+
 class ConstantScenarioRunner(base.ScenarioRunner):
     """Creates constant load executing a scenario a specified number of times.
 
@@ -67,9 +213,9 @@ class ConstantScenarioRunner(base.ScenarioRunner):
     }
 
     @staticmethod
-    def _iter_scenario_args(cls, method, ctx, args, times):
+    def _iter_scenario_args(ctx, times):
         for i in xrange(times):
-            yield (i, cls, method, base._get_scenario_context(ctx), args)
+            yield (i, base._get_user_index(ctx))
 
     def _run_scenario(self, cls, method, context, args):
 
@@ -78,20 +224,19 @@ class ConstantScenarioRunner(base.ScenarioRunner):
         # NOTE(msdubov): If not specified, perform single scenario run.
         times = self.config.get("times", 1)
 
-        pool = multiprocessing.Pool(concurrency)
-        iter_result = pool.imap(base._run_scenario_once,
-                                self._iter_scenario_args(cls, method, context,
-                                                         args, times))
-        for i in range(times):
-            try:
-                result = iter_result.next(timeout)
-            except multiprocessing.TimeoutError as e:
-                result = base.format_result_on_timeout(e, timeout)
-
-            self._send_result(result)
-
-        pool.close()
-        pool.join()
+        pool = _IterationPool(min(concurrency, times), timeout,
+                              cls, method, context, args)
+        run_args = self._iter_scenario_args(context, times)
+        try:
+            for scenario_args in itertools.islice(run_args, pool.idle):
+                pool.submit(scenario_args)
+            while pool.busy:
+                for result in pool.get_results():
+                    self._send_result(result)
+                for scenario_args in itertools.islice(run_args, pool.idle):
+                    pool.submit(scenario_args)
+        finally:
+            pool.close()
 
 
 class ConstantForDurationScenarioRunner(base.ScenarioRunner):
@@ -105,6 +250,12 @@ class ConstantForDurationScenarioRunner(base.ScenarioRunner):
     number of concurrent scenarios which execute during a single
     iteration in order to simulate the activities of multiple users
     placing load on the cloud under test.
+
+    No new iterations are started after the duration, the running ones
+    are drained: they are waited for up to the grace_timeout (by default
+    up to their own timeout) and then cancelled. Iterations that end
+    after the duration are flagged with after_deadline, and only the
+    iterations that ended within the duration are counted in throughput.
     """
 
     __execution_type__ = consts.RunnerType.CONSTANT_FOR_DURATION
@@ -124,6 +275,10 @@ class ConstantForDurationScenarioRunner(base.ScenarioRunner):
                 "type": "number",
                 "minimum": 0.0
             },
+            "grace_timeout": {
+                "type": "number",
+                "minimum": 0.0
+            },
             "timeout": {
                 "type": "number",
                 "minimum": 1
@@ -134,9 +289,9 @@ class ConstantForDurationScenarioRunner(base.ScenarioRunner):
     }
 
     @staticmethod
-    def _iter_scenario_args(cls, method, ctx, args):
+    def _iter_scenario_args(ctx):
         def _scenario_args(i):
-            return (i, cls, method, base._get_scenario_context(ctx), args)
+            return (i, base._get_user_index(ctx))
         return _scenario_args
 
     def _run_scenario(self, cls, method, context, args):
@@ -144,24 +299,43 @@ class ConstantForDurationScenarioRunner(base.ScenarioRunner):
         timeout = self.config.get("timeout", 600)
         concurrency = self.config.get("concurrency", 1)
         duration = self.config.get("duration")
+        grace_timeout = self.config.get("grace_timeout")
 
-        pool = multiprocessing.Pool(concurrency)
-
+        pool = _IterationPool(concurrency, timeout, cls, method, context,
+                              args)
         run_args = utils.infinite_run_args_generator(
-                    self._iter_scenario_args(cls, method, context, args))
-        iter_result = pool.imap(base._run_scenario_once, run_args)
-
-        start = time.time()
-        while True:
-            try:
-                result = iter_result.next(timeout)
-            except multiprocessing.TimeoutError as e:
-                result = base.format_result_on_timeout(e, timeout)
-
-            self._send_result(result)
-
-            if time.time() - start > duration:
-                break
-
-        pool.terminate()
-        pool.join()
+                    self._iter_scenario_args(context))
+
+        start = rutils.monotonic()
+        window_end = rutils.timestamp() + duration
+        cancel_at = None
+        if grace_timeout is not None:
+            cancel_at = start + duration + grace_timeout
+        in_window = after_deadline = 0
+        try:
+            for scenario_args in itertools.islice(run_args, pool.idle):
+                pool.submit(scenario_args)
+            # NOTE: new iterations are started only within the duration,
+            # iterations that are running at its end are drained, so their
+            # results are not lost and their resources are not leaked.
+            while pool.busy:
+                for result in pool.get_results(cancel_at):
+                    if (result["timestamp"] + result["duration"] +
+                            result["idle_duration"] > window_end):
+                        result["after_deadline"] = True
+                        after_deadline += 1
+                    else:
+                        in_window += 1
+                    self._send_result(result)
+                if rutils.monotonic() - start <= duration:
+                    for scenario_args in itertools.islice(run_args,
+                                                          pool.idle):
+                        pool.submit(scenario_args)
+        finally:
+            pool.close()
+
+        self.stats.update({
+            "iterations_in_window": in_window,
+            "iterations_after_deadline": after_deadline,
+            "throughput": in_window / float(duration) if duration else None
+        })
@@ -0,0 +1,154 @@
+# Copyright 2014: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import multiprocessing
+import Queue
+
+import eventlet
+
+from rally.benchmark.runners import base
+from rally import consts
+from rally import exceptions
+from rally.openstack.common import log as logging
+from rally import utils as rutils
+
+
+LOG = logging.getLogger(__name__)
+SEND_RESULT_DELAY = 1
+
+
+def _run_scenario_once_with_timeout(queue, timeout, args):
+    # TimeoutException is raised inside of the iteration green thread, so
+    # the iteration is actually cancelled and reported as failed one.
+    try:
+        with eventlet.Timeout(timeout, exceptions.TimeoutException):
+            result = base._run_scenario_once(args)
+    except exceptions.TimeoutException as e:
+        result = base.format_result_on_timeout(e, timeout)
+    queue.put(result)
+
+
+def _worker_process(queue, iterations, concurrency, timeout,
+                    context, cls, method_name, args):
+    """Run scenario iterations in green threads.
+
+    All blocking I/O (sockets, time.sleep) and thread locks of the worker
+    process are patched to be cooperative, so the whole concurrency of the
+    worker is served by a single OS thread. Locks have to be patched too:
+    a green thread waiting for a lock held by another green thread (e.g.
+    the lock of the keystone token cache) would block the OS thread and
+    the other green thread would never release it.
+
+    :param queue: queue object to append results
+    :param iterations: sequence of iteration numbers to be run
+    :param concurrency: maximum number of simultaneously running iterations
+    :param timeout: timeout of a single iteration
+    :param context: benchmark context
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param args: scenario args
+    """
+    eventlet.monkey_patch(socket=True, select=True, time=True, thread=True)
+    base._clear_clients_cache()
+
+    pool = eventlet.GreenPool(concurrency)
+    for i in iterations:
+        scenario_args = (i, cls, method_name,
+                         base._get_scenario_context(context), args)
+        pool.spawn_n(_run_scenario_once_with_timeout, queue, timeout,
+                     scenario_args)
+    pool.waitall()
+
+
+class ConstantAsyncScenarioRunner(base.ScenarioRunner):
+    """Creates constant load multiplexing iterations on green threads.
+
+    This runner works like ConstantScenarioRunner, but instead of running
+    each concurrent iteration in a separate OS process it runs them in
+    green threads (cooperative I/O) spread over a few worker processes.
+    This allows to keep thousands of iterations in flight simultaneously.
+
+    The processes parameter of the scenario config controls the number of
+    worker processes (by default the number of CPUs), concurrency is split
+    between them evenly.
+    """
+
+    __execution_type__ = consts.RunnerType.CONSTANT_ASYNC
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": rutils.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "times": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "timeout": {
+                "type": "number",
+                "minimum": 1
+            },
+            "processes": {
+                "type": "integer",
+                "minimum": 1
+            }
+        },
+        "required": ["type"],
+        "additionalProperties": False
+    }
+
+    def _run_scenario(self, cls, method_name, context, args):
+        timeout = self.config.get("timeout", 600)
+        concurrency = self.config.get("concurrency", 1)
+        times = self.config.get("times", 1)
+        processes = min(self.config.get("processes",
+                                        multiprocessing.cpu_count()),
+                        concurrency, times)
+
+        queue = multiprocessing.Queue()
+        process_pool = []
+
+        concurrency_per_worker, rest = divmod(concurrency, processes)
+        for i in range(processes):
+            worker_args = (queue, xrange(i, times, processes),
+                           concurrency_per_worker + int(i < rest),
+                           timeout, context, cls, method_name, args)
+            process = multiprocessing.Process(target=_worker_process,
+                                              args=worker_args)
+            process.start()
+            process_pool.append(process)
+
+        results_num = 0
+        while results_num < times:
+            try:
+                result = queue.get(timeout=SEND_RESULT_DELAY)
+            except Queue.Empty:
+                if not any(p.is_alive() for p in process_pool):
+                    LOG.error("Workers have finished with only %d of %d "
+                              "results." % (results_num, times))
+                    break
+                continue
+            self._send_result(result)
+            results_num += 1
+
+        for process in process_pool:
+            process.join()
+        queue.close()
@@ -0,0 +1,372 @@
+# Copyright 2014: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from multiprocessing import connection
+import select
+import socket
+import threading
+
+from oslo.config import cfg
+
+from rally.benchmark.runners import base
+from rally.benchmark import utils
+from rally import consts
+from rally import db
+from rally import exceptions
+from rally.openstack.common import log as logging
+from rally.openstack.common import timeutils
+from rally import utils as rutils
+
+
+LOG = logging.getLogger(__name__)
+
+distributed_opts = [
+    cfg.StrOpt("worker_authkey", secret=True,
+               help="Secret key used to authenticate connections between "
+                    "the distributed runner and rally agents. It must be "
+                    "set to the same random value on all hosts, agents and "
+                    "the runner refuse to start without it. The key only "
+                    "authenticates peers, the traffic is not encrypted, so "
+                    "agents listening on a public interface must be reached "
+                    "through a TLS or SSH tunnel."),
+    cfg.IntOpt("worker_heartbeat_interval", default=10,
+               help="Interval between heartbeats of a rally agent "
+                    "(seconds)."),
+    cfg.IntOpt("worker_heartbeat_timeout", default=60,
+               help="Rally agent is considered dead if it has not sent a "
+                    "heartbeat for this number of seconds."),
+    cfg.IntOpt("worker_results_batch_size", default=100,
+               help="Max number of iteration results sent by a rally "
+                    "agent to the distributed runner at once.")
+]
+CONF = cfg.CONF
+benchmark_group = cfg.OptGroup(name="benchmark", title="benchmark options")
+CONF.register_opts(distributed_opts, group=benchmark_group)
+
+# NOTE: agents listen on the loopback interface unless the host is given
+#       explicitly, since anyone who passes the authentication can run any
+#       code on the agent's host
+DEFAULT_AGENT_HOST = "127.0.0.1"
+INSECURE_AUTHKEYS = ["rally"]
+
+# NOTE: keys of runner configs that define the load, which is split
+# between the workers
+SPLIT_KEYS = {
+    consts.RunnerType.CONSTANT: ["times", "concurrency"],
+    consts.RunnerType.CONSTANT_FOR_DURATION: ["concurrency"],
+    consts.RunnerType.RPS: ["times", "rps"]
+}
+
+
+def get_alive_workers():
+    """Return workers that have sent a heartbeat recently."""
+    timeout = CONF.benchmark.worker_heartbeat_timeout
+    return [worker for worker in db.worker_list()
+            if not timeutils.is_older_than(worker["updated_at"], timeout)]
+
+
+def get_authkey():
+    """Return the key that authenticates agents and the runner.
+
+    :raises InsecureWorkerAuthkey: if the key is not set or left at the
+                                   well-known default
+    """
+    authkey = CONF.benchmark.worker_authkey
+    if not authkey or authkey in INSECURE_AUTHKEYS:
+        raise exceptions.InsecureWorkerAuthkey()
+    return authkey
+
+
+def connect(hostname):
+    """Connect to the rally agent registered under the given hostname."""
+    host, port = hostname.rsplit(":", 1)
+    return connection.Client((host, int(port)), authkey=get_authkey())
+
+
+def _split(value, count):
+    """Split integer value into count nearly equal integer parts."""
+    return [value // count + (1 if i < value % count else 0)
+            for i in range(count)]
+
+
+class Agent(object):
+    """Rally agent that runs parts of distributed benchmarks on its host.
+
+    The agent listens for the distributed runner on the given address. It
+    is registered in the workers table under "<hostname>:<port>" and
+    keeps the record alive with heartbeats. Each job received from the
+    runner is executed by a usual scenario runner on the agent's host and
+    its results are streamed back in batches, with heartbeats between
+    them while the job is running.
+
+    Jobs are unpickled, so the agent runs any code sent by a peer that
+    knows the authkey: it listens on the loopback interface by default
+    and connections between hosts must go through a TLS or SSH tunnel.
+    """
+
+    def __init__(self, host=DEFAULT_AGENT_HOST, port=0, hostname=None):
+        self.listener = connection.Listener((host, port),
+                                            authkey=get_authkey())
+        if not hostname:
+            hostname = socket.getfqdn() if host == "0.0.0.0" else host
+        self.hostname = "%s:%d" % (hostname, self.listener.address[1])
+        self._stop = threading.Event()
+
+    def _heartbeat(self):
+        while not self._stop.wait(CONF.benchmark.worker_heartbeat_interval):
+            try:
+                db.update_worker(self.hostname)
+            except exceptions.WorkerNotFound:
+                db.register_worker({"hostname": self.hostname})
+
+    def _run_job(self, conn):
+        config, cls, method_name, context, args = conn.recv()
+        LOG.info("Task %(task)s | Running %(cls)s.%(method)s with "
+                 "%(runner)s runner" %
+                 {"task": context["task"]["uuid"], "cls": cls.__name__,
+                  "method": method_name, "runner": config["type"]})
+
+        runner = base.ScenarioRunner.get_runner(None, config)
+        error = []
+
+        def run():
+            try:
+                runner._run_scenario(cls, method_name, context, args)
+            except Exception as e:
+                LOG.exception(e)
+                error.extend(utils.format_exc(e))
+            finally:
+                base._clear_clients_cache()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        batch_size = CONF.benchmark.worker_results_batch_size
+        heartbeat_interval = CONF.benchmark.worker_heartbeat_interval
+        last_sent = rutils.monotonic()
+        while thread.is_alive() or len(runner.result_queue):
+            batch = runner.result_queue.get_batch(batch_size, timeout=0.1)
+            if batch:
+                conn.send(("results", [dict(r) for r in batch]))
+                last_sent = rutils.monotonic()
+            elif rutils.monotonic() - last_sent >= heartbeat_interval:
+                # NOTE: the runner considers the agent lost if it has not
+                #       heard from it for worker_heartbeat_timeout seconds
+                conn.send(("heartbeat", None))
+                last_sent = rutils.monotonic()
+        thread.join()
+
+        if error:
+            conn.send(("error", error))
+        else:
+            conn.send(("done", {"runner_stats": runner.stats,
+                                "clients_cache": runner.clients_cache_stats,
+                                "http_pool": runner.http_pool_stats.values()}))
+
+    def serve(self):
+        """Register the agent and run jobs until it is stopped."""
+        db.register_worker({"hostname": self.hostname})
+        heartbeat = threading.Thread(target=self._heartbeat)
+        heartbeat.daemon = True
+        heartbeat.start()
+        LOG.info("Agent %s is started." % self.hostname)
+        try:
+            while not self._stop.is_set():
+                try:
+                    conn = self.listener.accept()
+                except (IOError, EOFError,
+                        connection.AuthenticationError) as e:
+                    LOG.warning("Connection is rejected: %s" % e)
+                    continue
+                try:
+                    if not self._stop.is_set():
+                        self._run_job(conn)
+                except (IOError, EOFError) as e:
+                    LOG.warning("Connection is lost: %s" % e)
+                finally:
+                    conn.close()
+        finally:
+            self._stop.set()
+            self.listener.close()
+            try:
+                db.unregister_worker(self.hostname)
+            except exceptions.WorkerNotFound:
+                pass
+            LOG.info("Agent %s is stopped." % self.hostname)
+
+    def stop(self):
+        self._stop.set()
+        # NOTE: wake up serve() that waits for a new connection
+        try:
+            connection.Client(self.listener.address,
+                              authkey=get_authkey()).close()
+        except (IOError, EOFError):
+            pass
+
+
+class DistributedScenarioRunner(base.ScenarioRunner):
+    """Splits the load between rally agents running on several hosts.
+
+    Agents are started by "rally-manage worker start" on the load hosts,
+    they register in the rally database and send heartbeats. The runner
+    takes the alive agents (up to the workers parameter), splits the load
+    of the runner config between them (times and concurrency of the
+    constant runner, concurrency of the constant_for_duration runner,
+    times and rps of the rps runner) and merges their results.
+
+    The benchmark context is sent to the agents, so it should contain only
+    picklable objects.
+
+    An agent that has failed, has closed the connection or has not been
+    heard from for worker_heartbeat_timeout seconds is recorded in the
+    runner stats, and the iterations it has not reported are recorded as
+    failed ones.
+    """
+
+    __execution_type__ = consts.RunnerType.DISTRIBUTED
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": rutils.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "runner": {
+                "type": "object",
+                "properties": {
+                    "type": {
+                        "enum": sorted(SPLIT_KEYS)
+                    }
+                },
+                "required": ["type"]
+            },
+            "workers": {
+                "type": "integer",
+                "minimum": 1
+            }
+        },
+        "required": ["type", "runner"],
+        "additionalProperties": False
+    }
+
+    @classmethod
+    def _validate_config(cls, config):
+        base.ScenarioRunner.validate(config["runner"])
+
+    def _split_config(self, count):
+        """Split the load of the runner config between count workers.
+
+        :returns: list of runner configs, there are less than count of
+                  them if the load is too small to be split
+        """
+        config = self.config["runner"]
+        defaults = {"times": 1, "concurrency": 1, "rps": 1}
+        keys = SPLIT_KEYS[config["type"]]
+        int_keys = [key for key in keys if key != "rps"]
+        count = min([count] + [config.get(key, defaults[key])
+                               for key in int_keys])
+
+        configs = [dict(config) for i in range(count)]
+        for key in keys:
+            value = config.get(key, defaults[key])
+            if key == "rps":
+                parts = [value / float(count)] * count
+            else:
+                parts = _split(value, count)
+            for worker_config, part in zip(configs, parts):
+                worker_config[key] = part
+        return configs
+
+    def _run_scenario(self, cls, method_name, context, args):
+        workers = get_alive_workers()[:self.config.get("workers")]
+        if not workers:
+            raise exceptions.NoAliveWorkers()
+        configs = self._split_config(len(workers))
+
+        # NOTE: task object is not picklable, agents use only its uuid
+        context = dict(context, task={"uuid": context["task"]["uuid"]})
+        # NOTE: connections are mapped to [hostname, config, number of
+        #       received results, monotonic time of the last message]
+        connections = {}
+        self.stats["workers"] = {}
+        heartbeat_timeout = CONF.benchmark.worker_heartbeat_timeout
+        try:
+            for worker, config in zip(workers, configs):
+                conn = connect(worker["hostname"])
+                connections[conn] = [worker["hostname"], config, 0,
+                                     rutils.monotonic()]
+                conn.send((config, cls, method_name, context, args))
+                LOG.info("Task %(task)s | Worker %(worker)s: %(config)s" %
+                         {"task": context["task"]["uuid"],
+                          "worker": worker["hostname"], "config": config})
+
+            while connections:
+                ready = select.select(
+                    list(connections), [], [],
+                    CONF.benchmark.worker_heartbeat_interval)[0]
+                for conn in ready:
+                    state = connections[conn]
+                    hostname = state[0]
+                    state[3] = rutils.monotonic()
+                    try:
+                        kind, data = conn.recv()
+                    except (IOError, EOFError) as e:
+                        self._worker_lost(conn, connections,
+                                          "%s: %s" % (type(e).__name__, e))
+                        continue
+
+                    if kind == "heartbeat":
+                        continue
+                    if kind == "results":
+                        for result in data:
+                            self._send_result(result)
+                        state[2] += len(data)
+                        continue
+                    if kind == "error":
+                        LOG.error("Worker %(worker)s has failed: %(error)s" %
+                                  {"worker": hostname, "error": data[:2]})
+                        self.stats["workers"][hostname] = {"error": data}
+                    else:
+                        self._update_clients_cache_stats(
+                            data["clients_cache"])
+                        for stats in data["http_pool"]:
+                            self._update_http_pool_stats(
+                                stats, prefix="%s:" % hostname)
+                        self.stats["workers"][hostname] = {
+                            "runner_stats": data["runner_stats"]}
+                    del connections[conn]
+                    conn.close()
+
+                now = rutils.monotonic()
+                for conn, state in connections.items():
+                    if now - state[3] > heartbeat_timeout:
+                        self._worker_lost(
+                            conn, connections,
+                            "no messages for %d seconds" % heartbeat_timeout)
+        finally:
+            for conn in connections:
+                conn.close()
+
+    def _worker_lost(self, conn, connections, reason):
+        """Forget the lost worker and fail the iterations it owes."""
+        hostname, config, received, last_seen = connections.pop(conn)
+        conn.close()
+        exc = exceptions.WorkerLost(worker=hostname, reason=reason)
+        LOG.error(exc)
+        error = utils.format_exc(exc)
+        self.stats["workers"][hostname] = {"error": error}
+        for i in xrange(config.get("times", 0) - received):
+            self._send_result(dict(base.format_result_on_error(exc, 0),
+                                   timestamp=rutils.timestamp()))
@@ -13,13 +13,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import itertools
+import math
 import multiprocessing
-import random
 import threading
 import time
 
 from rally.benchmark.runners import base
 from rally import consts
+from rally import exceptions
 from rally.openstack.common import log as logging
 from rally import utils as rutils
 
@@ -27,69 +29,200 @@ from rally import utils as rutils
 LOG = logging.getLogger(__name__)
 SEND_RESULT_DELAY = 1
 
+OVERLOAD_QUEUE = "queue"
+OVERLOAD_SKIP = "skip"
+OVERLOAD_ABORT = "abort"
 
-def _worker_thread(queue, args):
-        queue.put(base._run_scenario_once(args))
+# NOTE: In-flight iterations are sampled at the same ticks of the schedule
+#       by all workers, so the runner can sum up their samples.
+IN_FLIGHT_SAMPLES_PER_SECOND = 10
 
 
-def _worker_process(rps, times, queue, scenario_context, timeout,
-                    worker_id, workers, cls, method_name, args):
-    """Start scenario within threads.
+class _InFlightCounter(object):
+    """Counter of iterations in flight, optionally limited."""
 
-    Spawn N threads per second. Each thread runs scenario once, and appends
-    result to queue.
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.count = 0
+        self._cond = threading.Condition()
 
-    :param rps: runs per second
-    :param times: number of threads to be run
+    def acquire(self, blocking=True):
+        with self._cond:
+            while self.limit and self.count >= self.limit:
+                if not blocking:
+                    return False
+                self._cond.wait()
+            self.count += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self.count -= 1
+            self._cond.notify()
+
+
+def _sample_in_flight(counter, start_time, stopped, samples):
+    """Sample the number of in-flight iterations on fixed ticks.
+
+    Tick k is at start_time + k / IN_FLIGHT_SAMPLES_PER_SECOND, ticks that
+    are missed (e.g. while the process is busy) are skipped.
+
+    :param counter: _InFlightCounter of the worker
+    :param start_time: time of the start of the schedule
+    :param stopped: event that stops sampling
+    :param samples: dict to store samples {tick: count} in
+    """
+    rate = IN_FLIGHT_SAMPLES_PER_SECOND
+    while True:
+        now = time.time()
+        tick = max(int(math.floor((now - start_time) * rate)) + 1, 0)
+        if stopped.wait(start_time + float(tick) / rate - now):
+            break
+        samples[tick] = counter.count
+
+
+def _worker_thread(queue, args, intended_start, in_flight=None,
+                   reported=None):
+    """Run scenario once and append its result to queue.
+
+    :param reported: lock acquired by the one who reports the iteration
+                     first, so the result of an iteration, that has been
+                     already reported as timed out, is dropped
+    """
+    try:
+        actual_start = time.time()
+        result = base._run_scenario_once(args)
+        result["intended_start"] = intended_start
+        result["actual_start"] = actual_start
+        if reported is None or reported.acquire(False):
+            queue.put(result)
+    finally:
+        if in_flight:
+            in_flight.release()
+
+
+def _report_timeouts(pool, queue, timeout):
+    """Report iterations that run longer than timeout as failed ones.
+
+    Threads can't be cancelled, so a timed out iteration keeps running in
+    background, but its own result is dropped.
+
+    :param pool: list of tuples (thread, reported, intended_start,
+                 actual_start) of started iterations
     :param queue: queue object to append results
-    :param scenario_context: scenario context object
-    :param timeout: timeout operation
-    :param worker_id: id of worker process
-    :param workers: number of total workers
+    :param timeout: timeout of a single iteration
+    :returns: items of the pool that are still running within timeout
+    """
+    running = []
+    now = time.time()
+    for item in pool:
+        thread, reported, intended_start, actual_start = item
+        if not thread.isAlive():
+            continue
+        if now - actual_start < timeout:
+            running.append(item)
+        elif reported.acquire(False):
+            LOG.warning("Iteration intended to start at %(start).3f is "
+                        "timed out after %(timeout)s sec." %
+                        {"start": intended_start, "timeout": timeout})
+            result = base.format_result_on_timeout(
+                exceptions.TimeoutException(), timeout)
+            result.update({"timestamp": actual_start,
+                           "intended_start": intended_start,
+                           "actual_start": actual_start})
+            queue.put(result)
+    return running
+
+
+def _worker_process(rps, iterations, queue, context, timeout, start_time,
+                    max_concurrency, overload_policy, stats_queue, aborted,
+                    cls, method_name, args):
+    """Start scenario within threads according to the schedule.
+
+    Iteration number i is intended to be started exactly at
+    start_time + i / rps, regardless of how long previous iterations
+    take. Each thread runs scenario once, and appends result (together
+    with intended and actual start time of the iteration) to queue.
+    Threads are not waited for longer than timeout.
+
+    If max_concurrency iterations are already in flight, the next one is
+    handled according to overload_policy: "queue" waits for a free slot,
+    "skip" drops the iteration, "abort" stops the schedule of all workers.
+
+    When the worker is done, it puts its statistics (the number of
+    in-flight iterations sampled by _sample_in_flight() and the number of
+    dropped iterations) to stats_queue.
+
+    :param rps: total runs per second of all workers
+    :param iterations: sequence of iteration numbers to be run by worker
+    :param queue: queue object to append results
+    :param context: benchmark context
+    :param timeout: timeout of a single iteration, iterations running
+                    longer are reported as failed ones
+    :param start_time: time of the start of the schedule
+    :param max_concurrency: max number of in-flight iterations of worker,
+                            None means no limit
+    :param overload_policy: one of "queue", "skip" or "abort"
+    :param stats_queue: queue object to put worker statistics
+    :param aborted: event shared by all workers, set on abort
     :param cls: scenario class
     :param method_name: scenario method name
     :param args: scenario args
     """
 
+    base._clear_clients_cache()
     pool = []
-    i = 0
-    start = time.time()
-    sleep = 1.0 / rps
-
-    # Injecting timeout to exclude situations, where start time and
-    # actual time are neglible close
-
-    randsleep_delay = random.randint(int(sleep / 2 * 100), int(sleep * 100))
-    time.sleep(randsleep_delay / 100.0)
-
-    while times > i:
-        i += 1
-        scenario_args = (queue, (worker_id + workers * (i - 1), cls,
-                         method_name, scenario_context, args),)
+    dropped = 0
+    counter = _InFlightCounter(max_concurrency)
+
+    in_flight = {}
+    stopped = threading.Event()
+    sampler = threading.Thread(target=_sample_in_flight,
+                               args=(counter, start_time, stopped, in_flight))
+    sampler.daemon = True
+    sampler.start()
+
+    for i in iterations:
+        if aborted.is_set():
+            break
+        intended_start = start_time + i / float(rps)
+        delay = intended_start - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            LOG.debug("Iteration %(iteration)s is started %(lag).3fs later "
+                      "than scheduled." % {"iteration": i, "lag": -delay})
+
+        if not counter.acquire(overload_policy == OVERLOAD_QUEUE):
+            if overload_policy == OVERLOAD_SKIP:
+                LOG.warning("Iteration %s is dropped: %s iterations are "
+                            "already in flight." % (i, max_concurrency))
+                dropped += 1
+                continue
+            LOG.error("Benchmark is aborted on iteration %s: %s iterations "
+                      "are already in flight." % (i, max_concurrency))
+            aborted.set()
+            break
+
+        reported = threading.Lock()
+        scenario_args = (queue, (i, cls, method_name,
+                                 base._get_scenario_context(context), args),
+                         intended_start, counter, reported)
         thread = threading.Thread(target=_worker_thread,
                                   args=scenario_args)
+        # NOTE: timed out iterations must not block the worker exit
+        thread.daemon = True
         thread.start()
-        pool.append(thread)
-
-        time_gap = time.time() - start
-        real_rps = i / time_gap if time_gap else "Infinity"
+        pool.append((thread, reported, intended_start, time.time()))
+        pool = _report_timeouts(pool, queue, timeout)
 
-        LOG.debug("Worker: %s rps: %s (requested rps: %s)" % (
-            worker_id, real_rps, rps))
+    for thread, reported, intended_start, actual_start in pool:
+        thread.join(max(actual_start + timeout - time.time(), 0))
+    _report_timeouts(pool, queue, timeout)
 
-        # try to join latest thread(s) until it finished, or until time to
-        # start new thread
-        while i / (time.time() - start) > rps:
-            if pool:
-                pool[0].join(sleep)
-                if not pool[0].isAlive():
-                    pool.pop(0)
-            else:
-                time.sleep(sleep)
-
-    while pool:
-        thr = pool.pop(0)
-        thr.join()
+    stopped.set()
+    sampler.join()
+    stats_queue.put({"in_flight": in_flight, "dropped": dropped})
 
 
 class RPSScenarioRunner(base.ScenarioRunner):
@@ -102,6 +235,21 @@ class RPSScenarioRunner(base.ScenarioRunner):
     An example of a rps scenario is booting 1 VM onse per second. This
     execution type is thus very helpful in understanding the maximal load that
     a certain cloud can handle.
+
+    Iterations are started according to an absolute schedule (i-th
+    iteration is intended to start i / rps seconds after the benchmark
+    start), so slow iterations don't decrease the achieved rate silently.
+    Both intended and actual start time are saved in each result.
+
+    The optional max_concurrency parameter limits the number of iterations
+    in flight. When the limit is reached, the next iteration is handled
+    according to overload_policy:
+        queue - wait until one of running iterations finishes (default)
+        skip - don't run the iteration and count it as dropped
+        abort - stop starting new iterations at all
+    The number of in-flight iterations (sampled by all workers at the same
+    ticks, max per second of the schedule), the number of dropped
+    iterations and the abort flag are saved in runner stats.
     """
 
     __execution_type__ = consts.RunnerType.RPS
@@ -119,10 +267,20 @@ class RPSScenarioRunner(base.ScenarioRunner):
             },
             "rps": {
                 "type": "number",
+                "exclusiveMinimum": True,
+                "minimum": 0
             },
             "timeout": {
                 "type": "number",
             },
+            "max_concurrency": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "overload_policy": {
+                "type": "string",
+                "enum": [OVERLOAD_QUEUE, OVERLOAD_SKIP, OVERLOAD_ABORT]
+            },
         },
         "additionalProperties": False
     }
@@ -132,26 +290,35 @@ class RPSScenarioRunner(base.ScenarioRunner):
         timeout = self.config.get("timeout", 600)
         cpu_count = multiprocessing.cpu_count()
         processes_to_start = min(cpu_count, times)
-        rps_per_worker = float(self.config["rps"]) / processes_to_start
+        max_concurrency = self.config.get("max_concurrency")
+        if max_concurrency:
+            processes_to_start = min(processes_to_start, max_concurrency)
+            concurrency_per_worker, rest = divmod(max_concurrency,
+                                                  processes_to_start)
+        overload_policy = self.config.get("overload_policy", OVERLOAD_QUEUE)
 
         queue = multiprocessing.Queue()
+        stats_queue = multiprocessing.Queue()
+        aborted = multiprocessing.Event()
 
         process_pool = []
-        scenario_context = base._get_scenario_context(context)
-
-        times_per_worker, rest = divmod(times, processes_to_start)
+        start_time = time.time()
 
         for i in range(processes_to_start):
-            times = times_per_worker + int(rest > 0)
-            rest -= 1
-            worker_args = (rps_per_worker, times, queue, scenario_context,
-                           timeout, i, processes_to_start, cls,
+            worker_concurrency = None
+            if max_concurrency:
+                worker_concurrency = concurrency_per_worker + int(i < rest)
+            worker_args = (self.config["rps"],
+                           xrange(i, times, processes_to_start), queue,
+                           context, timeout, start_time, worker_concurrency,
+                           overload_policy, stats_queue, aborted, cls,
                            method_name, args)
             process = multiprocessing.Process(target=_worker_process,
                                               args=worker_args)
             process.start()
             process_pool.append(process)
 
+        workers_stats = []
         while process_pool:
             for process in process_pool:
                 process.join(SEND_RESULT_DELAY)
@@ -161,5 +328,28 @@ class RPSScenarioRunner(base.ScenarioRunner):
 
             while not queue.empty():
                 self._send_result(queue.get())
+            while not stats_queue.empty():
+                workers_stats.append(stats_queue.get())
 
         queue.close()
+        stats_queue.close()
+
+        self._update_stats(workers_stats, aborted.is_set())
+
+    def _update_stats(self, workers_stats, aborted):
+        # NOTE: Samples of all workers taken at the same tick are summed up,
+        #       a worker without a sample at some tick (e.g. it was busy)
+        #       counts with its previous sample.
+        samples = [w["in_flight"] for w in workers_stats]
+        latest = [0] * len(samples)
+        in_flight = {}
+        for tick in sorted(set(itertools.chain.from_iterable(samples))):
+            for i, worker_samples in enumerate(samples):
+                latest[i] = worker_samples.get(tick, latest[i])
+            second = tick // IN_FLIGHT_SAMPLES_PER_SECOND
+            in_flight[second] = max(in_flight.get(second, 0), sum(latest))
+        self.stats.update({
+            "in_flight": sorted(in_flight.items()),
+            "dropped": sum(w["dropped"] for w in workers_stats),
+            "aborted": aborted
+        })
@@ -0,0 +1,143 @@
+# Copyright 2014: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import math
+
+from rally.benchmark.runners import base
+from rally.benchmark.runners import constant
+from rally.benchmark.runners import rps
+from rally import consts
+from rally.openstack.common import log as logging
+from rally import utils as rutils
+
+
+LOG = logging.getLogger(__name__)
+
+LOAD_CONCURRENCY = "concurrency"
+LOAD_RPS = "rps"
+
+
+class SteppedScenarioRunner(base.ScenarioRunner):
+    """Raises the load step by step to find saturation point of the cloud.
+
+    The load is either concurrency (like in constant runner) or runs per
+    second (like in rps runner), it is raised through the list of steps
+    specified in the scenario config. Each step is held for the
+    times_per_step iterations or, if specified, for the duration_per_step
+    seconds. All steps are executed inside of the single benchmark
+    context, so users and other resources are created only once.
+
+    Each result is tagged with the index of its step, so latency and
+    error rate can be compared between the steps.
+    """
+
+    __execution_type__ = consts.RunnerType.STEPPED
+
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": rutils.JSON_SCHEMA,
+        "properties": {
+            "type": {
+                "type": "string"
+            },
+            "load": {
+                "enum": [LOAD_CONCURRENCY, LOAD_RPS]
+            },
+            "steps": {
+                "type": "array",
+                "minItems": 1,
+                "items": {
+                    "type": "number",
+                    "exclusiveMinimum": True,
+                    "minimum": 0
+                }
+            },
+            "times_per_step": {
+                "type": "integer",
+                "minimum": 1
+            },
+            "duration_per_step": {
+                "type": "number",
+                "exclusiveMinimum": True,
+                "minimum": 0
+            },
+            "timeout": {
+                "type": "number",
+                "minimum": 1
+            }
+        },
+        "required": ["type", "steps"],
+        # NOTE: concurrency steps are numbers of worker processes, so they
+        # should be integer, rps steps may be fractional.
+        "anyOf": [
+            {
+                "properties": {"load": {"enum": [LOAD_RPS]}},
+                "required": ["load"]
+            },
+            {
+                "properties": {"steps": {"items": {"type": "integer"}}}
+            }
+        ],
+        "not": {"required": ["times_per_step", "duration_per_step"]},
+        "additionalProperties": False
+    }
+
+    def _get_step_runner(self, load):
+        """Return runner that holds one step of the given load."""
+        config = {"timeout": self.config.get("timeout", 600)}
+        duration = self.config.get("duration_per_step")
+        times = self.config.get("times_per_step", 1)
+
+        if self.config.get("load", LOAD_CONCURRENCY) == LOAD_RPS:
+            if duration:
+                times = int(math.ceil(load * duration))
+            config.update({"type": consts.RunnerType.RPS,
+                           "rps": load, "times": times})
+            return rps.RPSScenarioRunner(self.task, config)
+
+        config["concurrency"] = load
+        if duration:
+            config.update({"type": consts.RunnerType.CONSTANT_FOR_DURATION,
+                           "duration": duration})
+            return constant.ConstantForDurationScenarioRunner(self.task,
+                                                              config)
+        config.update({"type": consts.RunnerType.CONSTANT, "times": times})
+        return constant.ConstantScenarioRunner(self.task, config)
+
+    def _run_step(self, step, load, cls, method_name, context, args):
+        """Run one step of the load and save its stats.
+
+        :returns: dict with step stats
+        """
+        LOG.info("Task %(task)s | Step %(step)d: %(mode)s %(load)s" %
+                 {"task": context["task"]["uuid"], "step": step,
+                  "mode": self.config.get("load", LOAD_CONCURRENCY),
+                  "load": load})
+
+        runner = self._get_step_runner(load)
+        runner._send_result = (
+            lambda result: self._send_result(dict(result, step=step)))
+        with rutils.Timer() as timer:
+            runner._run_scenario(cls, method_name, context, args)
+
+        step_stats = {"step": step, "load": load,
+                      "duration": timer.duration(),
+                      "runner_stats": runner.stats}
+        self.stats.setdefault("steps", []).append(step_stats)
+        return step_stats
+
+    def _run_scenario(self, cls, method_name, context, args):
+        for step, load in enumerate(self.config["steps"]):
+            self._run_step(step, load, cls, method_name, context, args)
@@ -25,7 +25,7 @@ from rally import exceptions
 from rally import utils
 
 
-def scenario(context=None):
+def scenario(context=None, nested_scenarios=None):
     """Make from plain python method benchmark.
 
        It sets 2 attributes to function:
@@ -33,10 +33,16 @@ def scenario(context=None):
        func.context = context # default context for benchmark
 
        :param context: Default benchmark context
+       :param nested_scenarios: Name of the argument with a list of other
+                                scenarios (dicts with "name" and "args")
+                                run by the benchmark, their validators and
+                                default contexts apply to the benchmark too
     """
     def wrapper(func):
         func.is_scenario = True
         func.context = context or {}
+        if nested_scenarios:
+            func.nested_scenarios = nested_scenarios
         return func
     return wrapper
 
@@ -75,10 +81,10 @@ class Scenario(object):
         """Returns Scenario class by name."""
         # TODO(msdubov): support approximate string matching
         #                (here and in other base classes).
-        for scenario in utils.itersubclasses(Scenario):
-            if name == scenario.__name__:
-                return scenario
-        raise exceptions.NoSuchScenario(name=name)
+        scenario = utils.get_plugin(Scenario, name)
+        if scenario is None:
+            raise exceptions.NoSuchScenario(name=name)
+        return scenario
 
     @staticmethod
     def get_scenario_by_name(name):
@@ -129,9 +135,63 @@ class Scenario(object):
                 if not result.is_valid:
                     raise exceptions.InvalidScenarioArgument(result.msg)
 
+    @staticmethod
+    def get_nested_scenarios(name, args=None):
+        """Return scenarios run by the benchmark scenario.
+
+        :param name: Scenario name in form 'class.method'
+        :param args: Arguments of the benchmark scenario
+        :returns: list of tuples (nested scenario name, its arguments)
+        """
+        if not args:
+            return []
+        param_name = Scenario.meta(name, "nested_scenarios")
+        if not param_name:
+            return []
+        return [(str(nested["name"]), nested.get("args", {}))
+                for nested in args.get(param_name, [])]
+
+    @staticmethod
+    def get_default_context(name, args=None):
+        """Return default context of the benchmark scenario.
+
+        Default contexts of the nested scenarios are merged into it, lists
+        of cleanup resources are merged as sets.
+
+        :param name: Scenario name in form 'class.method'
+        :param args: Arguments of the benchmark scenario
+        """
+        context = Scenario.meta(name, "context", default={})
+        for nested_name, nested_args in Scenario.get_nested_scenarios(
+                name, args):
+            nested_context = Scenario.get_default_context(nested_name,
+                                                          nested_args)
+            for ctx_name, ctx_config in nested_context.iteritems():
+                if (isinstance(ctx_config, list) and
+                        isinstance(context.get(ctx_name), list)):
+                    context[ctx_name] = sorted(set(context[ctx_name]) |
+                                               set(ctx_config))
+                else:
+                    context.setdefault(ctx_name, ctx_config)
+        return context
+
     @classmethod
     def validate(cls, name, config, admin=None, users=None, task=None):
-        """Semantic check of benchmark arguments."""
+        """Semantic check of benchmark arguments.
+
+        Nested scenarios are validated with the same context config and
+        their own arguments.
+        """
+        cls._validate_scenario(name, config, admin=admin, users=users,
+                               task=task)
+        for nested_name, nested_args in cls.get_nested_scenarios(
+                name, (config or {}).get("args")):
+            cls.validate(nested_name, dict(config, args=nested_args),
+                         admin=admin, users=users, task=task)
+
+    @classmethod
+    def _validate_scenario(cls, name, config, admin=None, users=None,
+                           task=None):
         validators = cls.meta(name, "validators", default=[])
 
         if not validators:
@@ -175,8 +235,10 @@ class Scenario(object):
         :param method_name: method name
         :returns: True if the method is a benchmark scenario, False otherwise
         """
-        return (hasattr(cls, method_name) and
-                Scenario.meta(cls, "is_scenario", method_name, default=False))
+        # NOTE: It's called for every method of every scenario class, so
+        #       the flag is read directly without copying it via meta()
+        method = getattr(cls, method_name, None)
+        return bool(getattr(method, "is_scenario", False))
 
     def context(self):
         """Returns the context of the current benchmark scenario."""
@@ -0,0 +1,69 @@
+# Copyright 2014: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import random
+
+from rally.benchmark.scenarios import base
+from rally.benchmark import types
+from rally.benchmark import validation
+
+
+class MixedWorkload(base.Scenario):
+    """Benchmarks that run a mix of other scenarios as a single load."""
+
+    @staticmethod
+    def _choose_scenario(scenarios):
+        """Choose a scenario of the workload randomly according to weights.
+
+        :param scenarios: list of dicts with scenario name and weight
+        :returns: chosen scenario dict
+        """
+        point = random.uniform(0, sum(s.get("weight", 1) for s in scenarios))
+        for scenario in scenarios:
+            point -= scenario.get("weight", 1)
+            if point < 0:
+                return scenario
+        return scenarios[-1]
+
+    @types.set(scenarios=types.WorkloadResourceType)
+    @validation.workload_scenarios("scenarios")
+    @base.scenario(nested_scenarios="scenarios")
+    def weighted_mix(self, scenarios):
+        """Run one of the scenarios of the mix chosen by its weight.
+
+        All scenarios of the mix share the context of the benchmark and the
+        load created by the runner. Default contexts of the scenarios are
+        merged into the context of the benchmark, and their validators are
+        run during task validation. Duration of each scenario is recorded
+        as an atomic action named after the scenario, so the report shows
+        latency of each of them, the atomic actions of scenarios are kept
+        as well.
+
+        :param scenarios: list of dicts with full scenario name ("name"),
+                          its relative weight ("weight", 1 by default) and
+                          arguments ("args")
+        """
+        scenario = self._choose_scenario(scenarios)
+        cls_name, method_name = scenario["name"].split(".", 1)
+        instance = base.Scenario.get_by_name(cls_name)(
+            context=self.context(), admin_clients=self._admin_clients,
+            clients=self._clients)
+        try:
+            with base.AtomicAction(self, scenario["name"]):
+                return getattr(instance, method_name)(
+                    **scenario.get("args", {}))
+        finally:
+            self._idle_duration += instance.idle_duration()
+            self._atomic_actions.update(instance.atomic_actions())
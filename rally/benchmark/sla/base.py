@@ -20,11 +20,11 @@ with contracted values such as maximum error rate or minimum response time.
 """
 
 import abc
+import math
 
 import jsonschema
 import six
 
-from rally.benchmark.processing import utils as putils
 from rally.openstack.common.gettextutils import _
 from rally import utils
 
@@ -42,8 +42,12 @@ class SLA(object):
 
     @staticmethod
     def validate(config):
+        # NOTE: Lookup of every criterion refreshes the index of criteria
+        #       if some of them were defined after the index was built
+        for name in config:
+            utils.get_plugin(SLA, name, key="OPTION_NAME")
         properties = dict([(c.OPTION_NAME, c.CONFIG_SCHEMA)
-                           for c in utils.itersubclasses(SLA)])
+                           for c in utils.get_plugins(SLA, "OPTION_NAME")])
         schema = {
             "type": "object",
             "properties": properties,
@@ -61,6 +65,27 @@ class SLA(object):
         :returns: True if success
         """
 
+    # NOTE: Criteria are checked incrementally by SLAChecker, so raw results
+    #       of a benchmark are not kept in memory. Criteria which implement
+    #       only check() get all the results, the built-in ones override the
+    #       three methods below and keep only running aggregates.
+
+    @classmethod
+    def init_state(cls):
+        """Return initial state of the incremental check."""
+        return []
+
+    @classmethod
+    def update_state(cls, state, results):
+        """Update state of the incremental check with a chunk of results."""
+        state.extend(results)
+        return state
+
+    @classmethod
+    def check_state(cls, criterion_value, state):
+        """Check criterion using the state of the incremental check."""
+        return cls.check(criterion_value, state)
+
     @staticmethod
     def check_all(config, result):
         """Check all SLA criteria.
@@ -71,11 +96,40 @@ class SLA(object):
         """
 
         results = []
-        opt_name_map = dict([(c.OPTION_NAME, c)
-                             for c in utils.itersubclasses(SLA)])
+        for name, criterion in config.get("sla", {}).iteritems():
+            sla = utils.get_plugin(SLA, name, key="OPTION_NAME")
+            check_result = sla.check(criterion, result)
+            results.append({'criterion': name,
+                            'success': check_result.success,
+                            'detail': check_result.msg})
+        return results
+
+
+class SLAChecker(object):
+    """Checks all SLA criteria of a benchmark chunk by chunk of results."""
+
+    def __init__(self, config):
+        """Initialize checker.
 
+        :param config: benchmark config with optional "sla" section
+        """
+        self.criteria = []
         for name, criterion in config.get("sla", {}).iteritems():
-            check_result = opt_name_map[name].check(criterion, result)
+            sla = utils.get_plugin(SLA, name, key="OPTION_NAME")
+            self.criteria.append([name, criterion, sla, sla.init_state()])
+
+    def add(self, results):
+        """Update criteria with a chunk of iteration results."""
+        if not results:
+            return
+        for criterion in self.criteria:
+            criterion[3] = criterion[2].update_state(criterion[3], results)
+
+    def results(self):
+        """Return a list of sla results, like SLA.check_all() does."""
+        results = []
+        for name, criterion, sla, state in self.criteria:
+            check_result = sla.check_state(criterion, state)
             results.append({'criterion': name,
                             'success': check_result.success,
                             'detail': check_result.msg})
@@ -87,15 +141,28 @@ class FailureRate(SLA):
     OPTION_NAME = "max_failure_percent"
     CONFIG_SCHEMA = {"type": "number", "minimum": 0.0, "maximum": 100.0}
 
-    @staticmethod
-    def check(criterion_value, result):
-        errors = len(filter(lambda x: x['error'], result))
-        if criterion_value < errors * 100.0 / len(result):
-            success = False
-        else:
-            success = True
+    @classmethod
+    def check(cls, criterion_value, result):
+        return cls.check_state(criterion_value,
+                               cls.update_state(cls.init_state(), result))
+
+    @classmethod
+    def init_state(cls):
+        return {"count": 0, "errors": 0}
+
+    @classmethod
+    def update_state(cls, state, results):
+        state["count"] += len(results)
+        state["errors"] += len([r for r in results if r["error"]])
+        return state
+
+    @classmethod
+    def check_state(cls, criterion_value, state):
+        rate = (state["errors"] * 100.0 / state["count"]
+                if state["count"] else 0.0)
+        success = criterion_value >= rate
         msg = (_("Maximum failure percent %s%% failures, actually %s%%") %
-                (criterion_value * 100.0, errors * 100.0 / len(result)))
+                (criterion_value * 100.0, rate))
         return SLAResult(success, msg)
 
 
@@ -105,17 +172,26 @@ class IterationTime(SLA):
     CONFIG_SCHEMA = {"type": "number", "minimum": 0.0,
                      "exclusiveMinimum": True}
 
-    @staticmethod
-    def check(criterion_value, result):
-        duration = 0
-        success = True
-        for i in result:
-            if i['duration'] >= duration:
-                duration = i['duration']
-            if i['duration'] > criterion_value:
-                success = False
+    @classmethod
+    def check(cls, criterion_value, result):
+        return cls.check_state(criterion_value,
+                               cls.update_state(cls.init_state(), result))
+
+    @classmethod
+    def init_state(cls):
+        return {"max": 0}
+
+    @classmethod
+    def update_state(cls, state, results):
+        for r in results:
+            state["max"] = max(state["max"], r["duration"])
+        return state
+
+    @classmethod
+    def check_state(cls, criterion_value, state):
+        success = state["max"] <= criterion_value
         msg = (_("Maximum seconds per iteration %ss, found with %ss") %
-                (criterion_value, duration))
+                (criterion_value, state["max"]))
         return SLAResult(success, msg)
 
 
@@ -125,10 +201,29 @@ class MaxAverageDuration(SLA):
     CONFIG_SCHEMA = {"type": "number", "minimum": 0.0,
                      "exclusiveMinimum": True}
 
-    @staticmethod
-    def check(criterion_value, result):
-        durations = [r["duration"] for r in result if not r.get("error")]
-        avg = putils.mean(durations)
+    @classmethod
+    def check(cls, criterion_value, result):
+        return cls.check_state(criterion_value,
+                               cls.update_state(cls.init_state(), result))
+
+    @classmethod
+    def init_state(cls):
+        return {"count": 0, "total": 0.0}
+
+    @classmethod
+    def update_state(cls, state, results):
+        durations = [r["duration"] for r in results if not r.get("error")]
+        state["count"] += len(durations)
+        state["total"] += math.fsum(durations)
+        return state
+
+    @classmethod
+    def check_state(cls, criterion_value, state):
+        if not state["count"]:
+            return SLAResult(False, _("Maximum average duration per "
+                                      "iteration %ss, no successful "
+                                      "iterations found") % criterion_value)
+        avg = state["total"] / state["count"]
         success = avg < criterion_value
         msg = (_("Maximum average duration per iteration %ss, found with %ss")
                % (criterion_value, avg))
@@ -49,9 +49,13 @@ def preprocess(cls, method_name, context, args):
                              and resource configuration
 
     """
+    clients = osclients.Clients(context["admin"]["endpoint"])
+    return _preprocess_args(cls, method_name, clients, args)
+
+
+def _preprocess_args(cls, method_name, clients, args):
     preprocessors = base.Scenario.meta(cls, method_name=method_name,
                                        attr_name="preprocessors", default={})
-    clients = osclients.Clients(context["admin"]["endpoint"])
     processed_args = copy.deepcopy(args)
 
     for src, preprocessor in preprocessors.items():
@@ -201,4 +205,27 @@ class NeutronNetworkResourceType(ResourceType):
 
         raise exceptions.InvalidScenarioArgument(
             "Neutron network with name '{name}' not found".format(
-                name=resource_config.get("name")))
\ No newline at end of file
+                name=resource_config.get("name")))
+
+
+class WorkloadResourceType(ResourceType):
+
+    @classmethod
+    def transform(cls, clients, resource_config):
+        """Preprocess arguments of each scenario of the mixed workload.
+
+        :param clients: openstack admin client handles
+        :param resource_config: list of dicts with scenario `name`, `weight`
+                                and `args`
+
+        :returns: list of scenarios with transformed args
+        """
+        workload = []
+        for scenario in resource_config:
+            scenario = dict(scenario)
+            cls_name, method_name = scenario["name"].split(".", 1)
+            scenario["args"] = _preprocess_args(
+                base.Scenario.get_by_name(cls_name), method_name, clients,
+                scenario.get("args", {}))
+            workload.append(scenario)
+        return workload
@@ -15,7 +15,7 @@
 
 import itertools
 import logging
-import multiprocessing
+import multiprocessing.pool
 import time
 import traceback
 
@@ -164,14 +164,18 @@ def run_concurrent_helper(args):
 def run_concurrent(concurrent, cls, fn, fn_args):
     """Run given function using pool of threads.
 
+    Threads are enough for network bound calls to OpenStack APIs, and
+    unlike processes they don't need arguments to be pickled, so clients
+    that are already authenticated may be shared between calls.
+
     :param concurrent: number of threads in the pool
-    :param cls: class to be called in the pool
-    :param fn: class method to be called in the pool
+    :param cls: class (or object) to be called in the pool
+    :param fn: class (or object) method to be called in the pool
     :param fn_args: list of arguments for function fn() in the pool
     :returns: iterator from Pool.imap()
     """
 
-    pool = multiprocessing.Pool(concurrent)
+    pool = multiprocessing.pool.ThreadPool(concurrent)
     iterator = pool.imap(run_concurrent_helper,
                          [(cls, fn, args) for args in fn_args])
     pool.close()
@@ -19,6 +19,7 @@ import os
 from glanceclient import exc as glance_exc
 from novaclient import exceptions as nova_exc
 
+from rally.benchmark.scenarios import base as base_scenario
 from rally.benchmark import types as types
 from rally import consts
 from rally import exceptions
@@ -345,6 +346,41 @@ def required_parameters(config, clients, task, *required_params):
     return ValidationResult()
 
 
+@validator
+def workload_scenarios(config, clients, task, param_name):
+    """Validator checks scenarios of the mixed workload.
+
+    Each scenario of the workload should be an existing benchmark scenario
+    with a positive weight.
+
+    :param param_name: Name of parameter with the list of scenarios
+    """
+    workload = config.get("args", {}).get(param_name)
+    if not workload:
+        return ValidationResult(
+            False, _("%s should be a non-empty list of scenarios")
+            % param_name)
+    for scenario in workload:
+        name = scenario.get("name", "")
+        if "." not in name:
+            return ValidationResult(
+                False, _("Scenario %r of the workload should be specified "
+                         "by its full name") % name)
+        try:
+            base_scenario.Scenario.get_scenario_by_name(name)
+        except exceptions.NoSuchScenario:
+            return ValidationResult(
+                False, _("Scenario %r of the workload is not found") % name)
+        weight = scenario.get("weight", 1)
+        if (not isinstance(weight, (int, long, float))
+                or isinstance(weight, bool) or weight <= 0):
+            return ValidationResult(
+                False, _("Weight of scenario %(name)s is %(weight)s which "
+                         "is not a positive number")
+                % {"name": name, "weight": weight})
+    return ValidationResult()
+
+
 @validator
 def required_services(config, clients, task, *required_services):
     """Validator checks if specified OpenStack services are available.
@@ -66,6 +66,10 @@ class KeystoneWrapper(object):
     def delete_user(self, user_id):
         """Deletes user."""
 
+    @abc.abstractmethod
+    def update_user_password(self, user_id, password):
+        """Sets new password of user."""
+
     @abc.abstractmethod
     def list_users(self):
         """List all users."""
@@ -132,6 +136,9 @@ class KeystoneV2Wrapper(KeystoneWrapper):
     def delete_user(self, user_id):
         self.client.users.delete(user_id)
 
+    def update_user_password(self, user_id, password):
+        self.client.users.update_password(user_id, password)
+
     def list_users(self):
         return map(KeystoneV2Wrapper._wrap_v2_user, self.client.users.list())
 
@@ -196,6 +203,9 @@ class KeystoneV3Wrapper(KeystoneWrapper):
     def delete_user(self, user_id):
         self.client.users.delete(user_id)
 
+    def update_user_password(self, user_id, password):
+        self.client.users.update(user_id, password=password)
+
     def list_users(self):
         return map(KeystoneV3Wrapper._wrap_v3_user, self.client.users.list())
 
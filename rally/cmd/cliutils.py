@@ -19,10 +19,12 @@ import os
 import sys
 
 from oslo.config import cfg
+import six
 
 from rally.openstack.common.apiclient import exceptions
 from rally.openstack.common import cliutils
 from rally.openstack.common.gettextutils import _
+from rally.openstack.common import importutils
 from rally.openstack.common import log as logging
 from rally import version
 
@@ -70,6 +72,33 @@ def _methods_of(obj):
     return result
 
 
+def _load_category(command):
+    """Return class of a command category.
+
+    :param command: class or full import path of the class, e.g.
+                    "rally.cmd.commands.task.TaskCommands"
+    """
+    if isinstance(command, six.string_types):
+        return importutils.import_class(command)
+    return command
+
+
+def _get_requested_categories(argv, categories):
+    """Return categories which should be loaded to parse argv.
+
+    Commands (and their dependencies) are imported only if they are going
+    to be run, so e.g. `rally task list` doesn't import deploy engines and
+    tempest verifier. If the category can't be found in argv all of them
+    are loaded to show the full help message.
+    """
+    for arg in argv[1:]:
+        if arg in ("version", "bash-completion"):
+            return {}
+        if arg in categories:
+            return {arg: categories[arg]}
+    return categories
+
+
 def _add_command_parsers(categories, subparsers):
     parser = subparsers.add_parser('version')
 
@@ -77,7 +106,7 @@ def _add_command_parsers(categories, subparsers):
     parser.add_argument('query_category', nargs='?')
 
     for category in categories:
-        command_object = categories[category]()
+        command_object = _load_category(categories[category])()
 
         parser = subparsers.add_parser(category)
         parser.set_defaults(command_object=command_object)
@@ -109,7 +138,8 @@ def _add_command_parsers(categories, subparsers):
 
 
 def run(argv, categories):
-    parser = lambda subparsers: _add_command_parsers(categories, subparsers)
+    requested = _get_requested_categories(argv, categories)
+    parser = lambda subparsers: _add_command_parsers(requested, subparsers)
     category_opt = cfg.SubCommandOpt('category',
                                      title='Command categories',
                                      help='Available categories',
@@ -153,7 +183,7 @@ def run(argv, categories):
         if not CONF.category.query_category:
             print(" ".join(categories.keys()))
         elif CONF.category.query_category in categories:
-            fn = categories[CONF.category.query_category]
+            fn = _load_category(categories[CONF.category.query_category])
             command_object = fn()
             actions = _methods_of(command_object)
             print(" ".join([k for (k, v) in actions]))
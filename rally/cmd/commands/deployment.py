@@ -33,11 +33,13 @@ from rally import exceptions
 from rally.objects import endpoint
 from rally.openstack.common import cliutils as common_cliutils
 from rally.openstack.common.gettextutils import _
-from rally.orchestrator import api
 from rally import osclients
 from rally import utils
 
 
+api = utils.LazyModule("rally.orchestrator.api")
+
+
 class DeploymentCommands(object):
 
     @cliutils.args('--name', type=str, required=True,
@@ -22,21 +22,26 @@ import pprint
 import webbrowser
 
 from oslo.config import cfg
-import yaml
 
-from rally.benchmark.processing import plot
-from rally.benchmark.processing import utils
 from rally.cmd import cliutils
 from rally.cmd.commands import use
 from rally.cmd import envutils
 from rally import db
 from rally import exceptions
+from rally import objects
 from rally.openstack.common import cliutils as common_cliutils
 from rally.openstack.common.gettextutils import _
-from rally.orchestrator import api
 from rally import utils as rutils
 
 
+# NOTE: Heavy modules are imported only by commands which use them, so
+#       e.g. `rally task list` doesn't load the benchmark engine and mako
+api = rutils.LazyModule("rally.orchestrator.api")
+plot = rutils.LazyModule("rally.benchmark.processing.plot")
+utils = rutils.LazyModule("rally.benchmark.processing.utils")
+yaml = rutils.LazyModule("yaml")
+
+
 class TaskCommands(object):
 
     @cliutils.args('--deploy-id', type=str, dest='deploy_id', required=False,
@@ -135,11 +140,7 @@ class TaskCommands(object):
         def _print_iterations_data(raw_data):
             headers = ["iteration", "full duration"]
             float_cols = ["full duration"]
-            atomic_actions = []
-            for row in raw_data:
-                # find first non-error result to get atomic actions names
-                if not row["error"] and "atomic_actions" in row:
-                    atomic_actions = row["atomic_actions"].keys()
+            atomic_actions = utils.get_atomic_actions_names(raw_data)
             for row in raw_data:
                 if row["atomic_actions"]:
                     for (c, a) in enumerate(atomic_actions, 1):
@@ -197,7 +198,7 @@ class TaskCommands(object):
                 print(yaml.safe_load(verification[2]))
             return
 
-        for result in task["results"]:
+        for result in objects.Task.merge_results(task["results"]):
             key = result["key"]
             print("-" * 80)
             print()
@@ -238,12 +239,88 @@ class TaskCommands(object):
             common_cliutils.print_list(table_rows, fields=table_cols,
                                        formatters=formatters)
 
+            http_calls_data = utils.get_http_calls_data(raw)
+            if http_calls_data:
+                headers = ["call", "count", "per iteration", "min (sec)",
+                           "avg (sec)", "max (sec)", "errors"]
+                float_cols = ["per iteration", "min (sec)", "avg (sec)",
+                              "max (sec)"]
+                formatters = dict(zip(float_cols,
+                                      [cliutils.pretty_float_formatter(col, 3)
+                                       for col in float_cols]))
+                table_rows = [rutils.Struct(**dict(zip(headers, row)))
+                              for row in http_calls_data]
+                print("\nHTTP Calls\n")
+                common_cliutils.print_list(table_rows, fields=headers,
+                                           formatters=formatters)
+
+            rps_data = utils.get_rps_data(raw)
+            if rps_data:
+                headers = ["second", "requested", "achieved"]
+                table_rows = [rutils.Struct(**dict(zip(headers, row)))
+                              for row in rps_data]
+                print("\nRequested vs Achieved Iterations Per Second\n")
+                common_cliutils.print_list(table_rows, fields=headers)
+
+            runner_stats = result["data"].get("runner_stats", {})
+            steps_data = utils.get_steps_data(raw)
+            if steps_data:
+                loads = utils.get_step_loads(key["kw"].get("runner", {}),
+                                             runner_stats)
+                headers = ["step", "load", "count", "failures",
+                           "avg (sec)", "90 percentile", "95 percentile",
+                           "max (sec)"]
+                float_cols = ["avg (sec)", "90 percentile", "95 percentile",
+                              "max (sec)"]
+                formatters = dict(zip(float_cols,
+                                      [cliutils.pretty_float_formatter(col, 3)
+                                       for col in float_cols]))
+                table_rows = []
+                for row in steps_data:
+                    data = ([row[0], loads.get(row[0]), row[1],
+                             "%.1f%%" % row[2]] + list(row[3:]))
+                    table_rows.append(rutils.Struct(**dict(zip(headers,
+                                                               data))))
+                print("\nLoad Steps\n")
+                common_cliutils.print_list(table_rows, fields=headers,
+                                           formatters=formatters)
+
             if iterations_data:
                 _print_iterations_data(raw)
 
             print(_("Whole scenario time without context preparation: "),
                   scenario_time)
 
+            if "capacity" in runner_stats:
+                print(_("Capacity found by SLA search: "),
+                      runner_stats["capacity"])
+            if runner_stats.get("in_flight"):
+                print(_("Max iterations in flight: "),
+                      max(count for second, count
+                          in runner_stats["in_flight"]))
+            if runner_stats.get("dropped"):
+                print(_("Iterations dropped due to overload: "),
+                      runner_stats["dropped"])
+            if runner_stats.get("aborted"):
+                print(_("Benchmark was aborted due to overload."))
+            if runner_stats.get("throughput") is not None:
+                print(_("Throughput within the duration (iterations/sec): "),
+                      round(runner_stats["throughput"], 3))
+            if runner_stats.get("iterations_after_deadline"):
+                print(_("Iterations ended after the duration: "),
+                      runner_stats["iterations_after_deadline"])
+            if runner_stats.get("clients_cache"):
+                print(_("Clients cache: "),
+                      _("%(hits)d hits, %(misses)d misses, "
+                        "%(authentications)d keystone authentications took "
+                        "%(auth_duration).3fs, saved ~%(auth_time_saved).3fs")
+                      % runner_stats["clients_cache"])
+            if runner_stats.get("http_pool"):
+                print(_("HTTP pool: "),
+                      _("%(requests)d requests over %(connections)d "
+                        "connections in %(processes)d processes")
+                      % runner_stats["http_pool"])
+
             # NOTE(hughsaunders): ssrs=scenario specific results
             ssrs = []
             for result in raw:
@@ -308,7 +385,8 @@ class TaskCommands(object):
         """
         results = map(lambda x: {"key": x["key"], 'result': x['data']['raw'],
                                  "sla": x["data"]["sla"]},
-                      db.task_result_get_all_by_uuid(task_id))
+                      objects.Task.merge_results(
+                          db.task_result_get_all_by_uuid(task_id)))
 
         if results:
             if all([output_pprint, output_json]):
@@ -350,8 +428,10 @@ class TaskCommands(object):
         :param open_it: bool, whether to open output file in web browser
         """
         results = map(lambda x: {"key": x["key"],
-                                 "result": x["data"]["raw"]},
-                      db.task_result_get_all_by_uuid(task_id))
+                                 "result": x["data"]["raw"],
+                                 "runner_stats": x["data"]["runner_stats"]},
+                      objects.Task.merge_results(
+                          db.task_result_get_all_by_uuid(task_id)))
         if out:
             out = os.path.expanduser(out)
         output_file = out or ("%s.html" % task_id)
@@ -402,7 +482,8 @@ class TaskCommands(object):
         :param task_id: Task uuid.
         :returns: Number of failed criteria.
         """
-        task = db.task_result_get_all_by_uuid(task_id)
+        task = objects.Task.merge_results(
+            db.task_result_get_all_by_uuid(task_id))
         failed_criteria = 0
         results = []
         for result in task:
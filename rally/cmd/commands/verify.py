@@ -29,8 +29,12 @@ from rally import exceptions
 from rally import objects
 from rally.openstack.common import cliutils as common_cliutils
 from rally.openstack.common.gettextutils import _
-from rally.orchestrator import api
-from rally.verification.verifiers.tempest import json2html
+from rally import utils
+
+
+api = utils.LazyModule("rally.orchestrator.api")
+json2html = utils.LazyModule(
+    "rally.verification.verifiers.tempest.json2html")
 
 
 class VerifyCommands(object):
@@ -20,24 +20,22 @@ from __future__ import print_function
 import sys
 
 from rally.cmd import cliutils
-from rally.cmd.commands import deployment
-from rally.cmd.commands import info
-from rally.cmd.commands import show
-from rally.cmd.commands import task
-from rally.cmd.commands import use
-from rally.cmd.commands import verify
+
+
+# NOTE: Categories are given by import paths, so only the module of
+#       the command which is actually run gets imported
+CATEGORIES = {
+    'deployment': 'rally.cmd.commands.deployment.DeploymentCommands',
+    'info': 'rally.cmd.commands.info.InfoCommands',
+    'show': 'rally.cmd.commands.show.ShowCommands',
+    'task': 'rally.cmd.commands.task.TaskCommands',
+    'use': 'rally.cmd.commands.use.UseCommands',
+    'verify': 'rally.cmd.commands.verify.VerifyCommands'
+}
 
 
 def main():
-    categories = {
-        'deployment': deployment.DeploymentCommands,
-        'info': info.InfoCommands,
-        'show': show.ShowCommands,
-        'task': task.TaskCommands,
-        'use': use.UseCommands,
-        'verify': verify.VerifyCommands
-    }
-    return cliutils.run(sys.argv, categories)
+    return cliutils.run(sys.argv, CATEGORIES)
 
 
 if __name__ == '__main__':
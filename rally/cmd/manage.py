@@ -22,6 +22,7 @@ import sys
 from rally.cmd import cliutils
 from rally.cmd import envutils
 from rally import db
+from rally.openstack.common import cliutils as common_cliutils
 from rally.verification.verifiers.tempest import tempest
 
 
@@ -46,9 +47,49 @@ class TempestCommands(object):
         verifier.install()
 
 
+class WorkerCommands(object):
+    """Commands for rally agents of distributed benchmarks."""
+
+    @cliutils.args('--host', type=str, dest='host', required=False,
+                   help='Address to listen on (127.0.0.1 by default). '
+                        'Agents on other interfaces must be reached '
+                        'through a TLS or SSH tunnel.')
+    @cliutils.args('--port', type=int, dest='port', required=False,
+                   help='Port to listen on (random free port by default)')
+    @cliutils.args('--hostname', type=str, dest='hostname', required=False,
+                   help='Host name that the distributed runner uses to '
+                        'connect to this agent (the address to listen on '
+                        'or FQDN for 0.0.0.0 by default)')
+    def start(self, host=None, port=None, hostname=None):
+        """Start rally agent on this host."""
+        # NOTE: the distributed runner is imported only by worker commands
+        from rally.benchmark.runners import distributed
+
+        agent = distributed.Agent(host or distributed.DEFAULT_AGENT_HOST,
+                                  port or 0, hostname)
+        print("Agent %s is started" % agent.hostname)
+        try:
+            agent.serve()
+        except KeyboardInterrupt:
+            pass
+
+    def list(self):
+        """Print a list of registered agents."""
+        from rally.benchmark.runners import distributed
+
+        alive = [w['hostname'] for w in distributed.get_alive_workers()]
+        workers = [{'hostname': w['hostname'],
+                    'updated_at': w['updated_at'],
+                    'alive': w['hostname'] in alive}
+                   for w in db.worker_list()]
+        common_cliutils.print_list(workers,
+                                   ('hostname', 'updated_at', 'alive'))
+
+
 def main():
     categories = {'db': DBCommands,
-                  'tempest': TempestCommands}
+                  'tempest': TempestCommands,
+                  'worker': WorkerCommands}
     cliutils.run(sys.argv, categories)
 
 
@@ -78,7 +78,11 @@ class _RunnerType(utils.ImmutableMixin, utils.EnumMixin):
     SERIAL = "serial"
     CONSTANT = "constant"
     CONSTANT_FOR_DURATION = "constant_for_duration"
+    CONSTANT_ASYNC = "constant_async"
     RPS = "rps"
+    STEPPED = "stepped"
+    CAPACITY = "capacity"
+    DISTRIBUTED = "distributed"
 
 
 class _Service(utils.ImmutableMixin, utils.EnumMixin):
@@ -249,6 +249,72 @@ def resource_delete(id):
     return IMPL.resource_delete(id)
 
 
+def pooled_tenant_create(values):
+    """Add a pre-provisioned tenant to the tenant pool of a deployment.
+
+    :param values: a dict with deployment_uuid, info on the tenant and its
+                   users and optionally task_uuid of the task that leases
+                   the tenant.
+    :returns: a dict with data on the pooled tenant.
+    """
+    return IMPL.pooled_tenant_create(values)
+
+
+def pooled_tenant_get_all(deployment_uuid, task_uuid=None, free=False):
+    """Return tenants of the tenant pool of a deployment.
+
+    :param deployment_uuid: filter by uuid of a deployment
+    :param task_uuid: filter by uuid of the task that leases tenants
+    :param free: return only tenants that are not leased by any task
+    :returns: a list of dicts with data on pooled tenants ordered by id
+    """
+    return IMPL.pooled_tenant_get_all(deployment_uuid, task_uuid=task_uuid,
+                                      free=free)
+
+
+def pooled_tenant_lease(id, task_uuid):
+    """Lease a free pooled tenant to a task.
+
+    :param id: ID of a pooled tenant.
+    :param task_uuid: UUID of the task.
+    :returns: True if the tenant is leased, False if it is already leased
+              by some task.
+    """
+    return IMPL.pooled_tenant_lease(id, task_uuid)
+
+
+def pooled_tenant_reclaim(deployment_uuid):
+    """Return tenants leased by tasks that are over to the pool.
+
+    Tenants leased by finished, failed or deleted tasks are released, so
+    leases of tasks that have crashed before the cleanup are not lost.
+
+    :param deployment_uuid: UUID of a deployment.
+    :returns: number of released tenants.
+    """
+    return IMPL.pooled_tenant_reclaim(deployment_uuid)
+
+
+def pooled_tenant_release(id):
+    """Return a leased tenant to the pool.
+
+    :param id: ID of a pooled tenant.
+    :raises: :class:`rally.exceptions.PooledTenantNotFound` if the tenant
+             does not exist.
+    """
+    return IMPL.pooled_tenant_release(id)
+
+
+def pooled_tenant_delete(id):
+    """Delete a tenant from the tenant pool.
+
+    :param id: ID of a pooled tenant.
+    :raises: :class:`rally.exceptions.PooledTenantNotFound` if the tenant
+             does not exist.
+    """
+    return IMPL.pooled_tenant_delete(id)
+
+
 def verification_create(deployment_uuid):
     """Create Verification record in DB.
 
@@ -320,7 +386,10 @@ def verification_result_create(verification_uuid, values):
 
 
 def register_worker(values):
-    """Register a new worker service at the specified hostname.
+    """Register a worker service at the specified hostname.
+
+    If a worker with the same hostname is already registered, its record
+    is marked as active and returned.
 
     :param values: A dict of values which must contain the following:
                    {
@@ -328,7 +397,6 @@ def register_worker(values):
                                 this worker service.
                    }
     :returns: A worker.
-    :raises: WorkerAlreadyRegistered
     """
     return IMPL.register_worker(values)
 
@@ -343,6 +411,14 @@ def get_worker(hostname):
     return IMPL.get_worker(hostname)
 
 
+def worker_list():
+    """Get a list of all registered worker services.
+
+    :returns: A list of workers ordered by hostname.
+    """
+    return IMPL.worker_list()
+
+
 def unregister_worker(hostname):
     """Unregister this worker with the service registry.
 
@@ -22,6 +22,7 @@ from oslo.db.sqlalchemy import session as db_session
 import sqlalchemy as sa
 from sqlalchemy.orm.exc import NoResultFound
 
+from rally import consts
 from rally.db.sqlalchemy import models
 from rally import exceptions
 from rally.openstack.common.gettextutils import _
@@ -162,7 +163,8 @@ class Connection(object):
 
     def task_result_get_all_by_uuid(self, uuid):
         return (self.model_query(models.TaskResult).
-                filter_by(task_uuid=uuid).all())
+                filter_by(task_uuid=uuid).
+                order_by(models.TaskResult.id).all())
 
     def _deployment_get(self, uuid, session=None):
         deploy = (self.model_query(models.Deployment, session=session).
@@ -182,6 +184,8 @@ class Connection(object):
         with session.begin():
             count = (self.model_query(models.Resource, session=session).
                      filter_by(deployment_uuid=uuid).count())
+            count += (self.model_query(models.PooledTenant, session=session).
+                      filter_by(deployment_uuid=uuid).count())
             if count:
                 raise exceptions.DeploymentIsBusy(uuid=uuid)
 
@@ -232,6 +236,50 @@ class Connection(object):
         if not count:
             raise exceptions.ResourceNotFound(id=id)
 
+    def pooled_tenant_create(self, values):
+        tenant = models.PooledTenant()
+        tenant.update(values)
+        tenant.save()
+        return tenant
+
+    def pooled_tenant_get_all(self, deployment_uuid, task_uuid=None,
+                              free=False):
+        query = (self.model_query(models.PooledTenant).
+                 filter_by(deployment_uuid=deployment_uuid))
+        if free:
+            query = query.filter_by(task_uuid=None)
+        elif task_uuid is not None:
+            query = query.filter_by(task_uuid=task_uuid)
+        return query.order_by(models.PooledTenant.id).all()
+
+    def pooled_tenant_lease(self, id, task_uuid):
+        count = (self.model_query(models.PooledTenant).
+                 filter_by(id=id, task_uuid=None).
+                 update({"task_uuid": task_uuid}))
+        return count == 1
+
+    def pooled_tenant_reclaim(self, deployment_uuid):
+        active_tasks = sa.select([models.Task.uuid]).where(
+            ~models.Task.status.in_([consts.TaskStatus.FINISHED,
+                                     consts.TaskStatus.FAILED]))
+        return (self.model_query(models.PooledTenant).
+                filter_by(deployment_uuid=deployment_uuid).
+                filter(models.PooledTenant.task_uuid.isnot(None)).
+                filter(~models.PooledTenant.task_uuid.in_(active_tasks)).
+                update({"task_uuid": None}, synchronize_session=False))
+
+    def pooled_tenant_release(self, id):
+        count = (self.model_query(models.PooledTenant).
+                 filter_by(id=id).update({"task_uuid": None}))
+        if not count:
+            raise exceptions.PooledTenantNotFound(id=id)
+
+    def pooled_tenant_delete(self, id):
+        count = (self.model_query(models.PooledTenant).
+                 filter_by(id=id).delete(synchronize_session=False))
+        if not count:
+            raise exceptions.PooledTenantNotFound(id=id)
+
     def verification_create(self, deployment_uuid):
         verification = models.Verification()
         verification.update({"deployment_uuid": deployment_uuid})
@@ -293,8 +341,10 @@ class Connection(object):
             worker.save()
             return worker
         except db_exc.DBDuplicateEntry:
-            raise exceptions.WorkerAlreadyRegistered(
-                    worker=values['hostname'])
+            # NOTE: a worker that is restarted on the same host and port
+            #       takes over its old record
+            self.update_worker(values['hostname'])
+            return self.get_worker(values['hostname'])
 
     def get_worker(self, hostname):
         try:
@@ -303,6 +353,10 @@ class Connection(object):
         except NoResultFound:
             raise exceptions.WorkerNotFound(worker=hostname)
 
+    def worker_list(self):
+        return (self.model_query(models.Worker).
+                order_by(models.Worker.hostname).all())
+
     def unregister_worker(self, hostname):
         count = (self.model_query(models.Worker).
                  filter_by(hostname=hostname).delete())
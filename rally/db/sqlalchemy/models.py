@@ -131,6 +131,41 @@ class Resource(BASE, RallyBase):
     )
 
 
+class PooledTenant(BASE, RallyBase):
+    """Represent a pre-provisioned tenant (with users) of a deployment."""
+    __tablename__ = "tenant_pool"
+    __table_args__ = (
+        sa.Index("pooled_tenant_deployment_uuid", "deployment_uuid"),
+        sa.Index("pooled_tenant_task_uuid", "deployment_uuid", "task_uuid"),
+    )
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+
+    # NOTE: info contains the tenant and its users with their endpoints,
+    #       passwords of the users are not stored, they are reset every
+    #       time the tenant is leased
+    info = sa.Column(
+        sa_types.MutableJSONEncodedDict,
+        default={},
+        nullable=False,
+    )
+
+    # NOTE: uuid of the task that leased the tenant, None if it is free
+    task_uuid = sa.Column(sa.String(36), default=None, nullable=True)
+
+    deployment_uuid = sa.Column(
+        sa.String(36),
+        sa.ForeignKey(Deployment.uuid),
+        nullable=False,
+    )
+    deployment = sa.orm.relationship(
+        Deployment,
+        backref=sa.orm.backref("tenant_pool"),
+        foreign_keys=deployment_uuid,
+        primaryjoin=(deployment_uuid == Deployment.uuid),
+    )
+
+
 class Task(BASE, RallyBase):
     """Represents a Benchmark task."""
     __tablename__ = "tasks"
@@ -172,7 +207,8 @@ class TaskResult(BASE, RallyBase):
 
     task_uuid = sa.Column(sa.String(36), sa.ForeignKey('tasks.uuid'))
     task = sa.orm.relationship(Task,
-                               backref=sa.orm.backref('results'),
+                               backref=sa.orm.backref(
+                                   'results', order_by='TaskResult.id'),
                                foreign_keys=task_uuid,
                                primaryjoin='TaskResult.task_uuid == Task.uuid')
 
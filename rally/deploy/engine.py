@@ -81,10 +81,10 @@ class EngineFactory(object):
     @staticmethod
     def get_by_name(name):
         """Return Engine class by name."""
-        for engine in utils.itersubclasses(EngineFactory):
-            if name == engine.__name__:
-                return engine
-        raise exceptions.NoSuchEngine(engine_name=name)
+        engine = utils.get_plugin(EngineFactory, name)
+        if engine is None:
+            raise exceptions.NoSuchEngine(engine_name=name)
+        return engine
 
     @staticmethod
     def get_engine(name, deployment):
@@ -134,10 +134,10 @@ class ProviderFactory(object):
     @staticmethod
     def get_by_name(name):
         """Return Server Provider class by type."""
-        for provider in utils.itersubclasses(ProviderFactory):
-            if name == provider.__name__:
-                return provider
-        raise exceptions.NoSuchVMProvider(vm_provider_name=name)
+        provider = utils.get_plugin(ProviderFactory, name)
+        if provider is None:
+            raise exceptions.NoSuchVMProvider(vm_provider_name=name)
+        return provider
 
     @staticmethod
     def get_provider(config, deployment):
@@ -161,10 +161,19 @@ class ResourceNotFound(NotFoundException):
     msg_fmt = _("Resource with id=%(id)s not found.")
 
 
+class PooledTenantNotFound(NotFoundException):
+    msg_fmt = _("Pooled tenant with id=%(id)s not found.")
+
+
 class TimeoutException(RallyException):
     msg_fmt = _("Timeout exceeded.")
 
 
+class IterationWorkerDied(RallyException):
+    msg_fmt = _("Worker of iteration %(iteration)s has died with exit code "
+                "%(exitcode)s.")
+
+
 class GetResourceFailure(RallyException):
     msg_fmt = _("Failed to get the resource %(resource)s: %(err)s")
 
@@ -238,3 +247,21 @@ class WorkerNotFound(NotFoundException):
 
 class WorkerAlreadyRegistered(RallyException):
     msg_fmt = _("Worker %(worker)s already registered")
+
+
+class NoAliveWorkers(RallyException):
+    msg_fmt = _("There are no alive workers to run the benchmark")
+
+
+class WorkerLost(RallyException):
+    msg_fmt = _("Worker %(worker)s is lost: %(reason)s")
+
+
+class InsecureTokenCache(RallyException):
+    msg_fmt = _("Keystone token cache directory %(path)s should be owned by "
+                "the current user and not writable by others")
+
+
+class InsecureWorkerAuthkey(RallyException):
+    msg_fmt = _("The benchmark.worker_authkey option should be set to a "
+                "secret value on all hosts of distributed benchmarks")
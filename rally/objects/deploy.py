@@ -86,5 +86,31 @@ class Deployment(object):
     def delete_resource(resource_id):
         db.resource_delete(resource_id)
 
+    def add_pooled_tenant(self, info, task_uuid=None):
+        return db.pooled_tenant_create({
+            "deployment_uuid": self.deployment["uuid"],
+            "info": info,
+            "task_uuid": task_uuid,
+        })
+
+    def get_pooled_tenants(self, task_uuid=None, free=False):
+        return db.pooled_tenant_get_all(self.deployment["uuid"],
+                                        task_uuid=task_uuid, free=free)
+
+    @staticmethod
+    def lease_pooled_tenant(tenant_id, task_uuid):
+        return db.pooled_tenant_lease(tenant_id, task_uuid)
+
+    def reclaim_pooled_tenants(self):
+        return db.pooled_tenant_reclaim(self.deployment["uuid"])
+
+    @staticmethod
+    def release_pooled_tenant(tenant_id):
+        db.pooled_tenant_release(tenant_id)
+
+    @staticmethod
+    def delete_pooled_tenant(tenant_id):
+        db.pooled_tenant_delete(tenant_id)
+
     def delete(self):
         db.deployment_delete(self.deployment["uuid"])
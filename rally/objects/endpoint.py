@@ -35,6 +35,10 @@ class Endpoint(object):
         self.domain_name = domain_name
         self.user_domain_name = user_domain_name
         self.project_domain_name = project_domain_name
+        # NOTE: keystone AccessInfo (token & service catalog) obtained in
+        #       advance, it is not a part of the endpoint config so it is
+        #       not returned by to_dict()
+        self.auth_ref = None
 
     def to_dict(self, include_permission=False):
         dct = {"auth_url": self.auth_url, "username": self.username,
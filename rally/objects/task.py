@@ -56,5 +56,40 @@ class Task(object):
     def append_results(self, key, value):
         db.task_result_create(self.task['uuid'], key, value)
 
+    def get_results(self):
+        return Task.merge_results(
+            db.task_result_get_all_by_uuid(self.task['uuid']))
+
+    @staticmethod
+    def merge_results(results):
+        """Merge task results stored in several records.
+
+        Results of a benchmark may be flushed to the database incrementally,
+        so there can be several records with the same key. Raw results of
+        such records are concatenated, the rest of data (sla, duration...)
+        is taken from the last of them.
+
+        :param results: list of TaskResult records
+        :returns: list of dicts with key and data, one per benchmark
+        """
+        merged = []
+        # NOTE: keys are dicts, so they are indexed by their JSON dumps
+        index = {}
+        for result in results:
+            key = json.dumps(result['key'], sort_keys=True)
+            benchmark = index.get(key)
+            if benchmark is None:
+                benchmark = {'key': result['key'],
+                             'data': {'raw': [], 'sla': [],
+                                      'scenario_duration': None,
+                                      'runner_stats': {}}}
+                index[key] = benchmark
+                merged.append(benchmark)
+            raw = benchmark['data']['raw']
+            benchmark['data'].update(result['data'])
+            raw.extend(result['data']['raw'])
+            benchmark['data']['raw'] = raw
+        return merged
+
     def delete(self, status=None):
         db.task_delete(self.task['uuid'], status=status)
@@ -15,6 +15,7 @@
 
 import jsonschema
 
+from rally.benchmark.context import users as users_ctx
 from rally.benchmark import engine
 from rally import consts
 from rally import deploy
@@ -61,6 +62,7 @@ def destroy_deploy(deploy_uuid):
     deployment = objects.Deployment.get(deploy_uuid)
     deployer = deploy.EngineFactory.get_engine(deployment['config']['type'],
                                                deployment)
+    users_ctx.UserGenerator.delete_tenant_pool(deployment)
     with deployer:
         deployer.make_cleanup()
         deployment.delete()
@@ -13,26 +13,46 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import contextlib
+import errno
+import hashlib
+import json
+import os
+import re
+import stat
+import threading
+import time
 import urlparse
 
-from ceilometerclient import client as ceilometer
-from cinderclient import client as cinder
-from designateclient import v1 as designate
-import glanceclient as glance
-from heatclient import client as heat
-from ironicclient import client as ironic
-from keystoneclient import discover as keystone_discover
-from keystoneclient import exceptions as keystone_exceptions
-from keystoneclient.v2_0 import client as keystone_v2
-from keystoneclient.v3 import client as keystone_v3
-from neutronclient.neutron import client as neutron
-from novaclient import client as nova
 from oslo.config import cfg
-from saharaclient import client as sahara
-from zaqarclient.queues import client as zaqar
+import requests
+from requests import adapters as requests_adapters
 
 from rally import consts
 from rally import exceptions
+from rally.openstack.common import lockutils
+from rally import utils
+
+
+# NOTE: Client libraries are heavy, so they are imported only on the first
+#       use of the matching Clients method
+ceilometer = utils.LazyModule("ceilometerclient.client")
+cinder = utils.LazyModule("cinderclient.client")
+designate = utils.LazyModule("designateclient.v1")
+eventlet_corolocal = utils.LazyModule("eventlet.corolocal")
+glance = utils.LazyModule("glanceclient")
+heat = utils.LazyModule("heatclient.client")
+ironic = utils.LazyModule("ironicclient.client")
+keystone_access = utils.LazyModule("keystoneclient.access")
+keystone_discover = utils.LazyModule("keystoneclient.discover")
+keystone_exceptions = utils.LazyModule("keystoneclient.exceptions")
+keystone_session = utils.LazyModule("keystoneclient.session")
+keystone_v2 = utils.LazyModule("keystoneclient.v2_0.client")
+keystone_v3 = utils.LazyModule("keystoneclient.v3.client")
+neutron = utils.LazyModule("neutronclient.neutron.client")
+nova = utils.LazyModule("novaclient.client")
+sahara = utils.LazyModule("saharaclient.client")
+zaqar = utils.LazyModule("zaqarclient.queues.client")
 
 
 CONF = cfg.CONF
@@ -42,14 +62,25 @@ CONF.register_opts([
     cfg.BoolOpt("https_insecure", default=False,
                 help="Use SSL for all OpenStack API interfaces"),
     cfg.StrOpt("https_cacert", default=None,
-               help="Path to CA server cetrificate for SSL")
+               help="Path to CA server cetrificate for SSL"),
+    cfg.BoolOpt("keystone_token_cache", default=False,
+                help="Share keystone tokens and service catalogs of the same "
+                     "endpoint between all Rally processes on the host "
+                     "(e.g. between runner workers)"),
+    cfg.StrOpt("keystone_token_cache_path", default="~/.rally/token-cache",
+               help="Directory for keystone token cache files, it's created "
+                    "with mode 0700 and must not be writable by other users"),
+    cfg.IntOpt("http_pool_size", default=50,
+               help="Max number of keep-alive HTTP connections to each "
+                    "OpenStack endpoint host shared by all clients of "
+                    "a process"),
+    cfg.BoolOpt("trace_http_calls", default=False,
+                help="Record method, URL, status and latency of every HTTP "
+                     "call done via the shared HTTP connection pool and "
+                     "attach them to benchmark iterations results")
 ])
 
 
-# NOTE(boris-42): super dirty hack to fix nova python client 2.17 thread safe
-nova._adapter_pool = lambda x: nova.adapters.HTTPAdapter()
-
-
 def cached(func):
     """Cache client handles."""
 
@@ -66,7 +97,13 @@ def cached(func):
     return wrapper
 
 
-def create_keystone_client(args):
+def create_keystone_client(args, auth_ref=None):
+    if auth_ref is not None:
+        # NOTE: The version of an already obtained token is known, so
+        #       there is no need to discover keystone versions
+        if auth_ref.version == "v3":
+            return keystone_v3.Client(auth_ref=auth_ref, **args)
+        return keystone_v2.Client(auth_ref=auth_ref, **args)
     discover = keystone_discover.Discover(**args)
     for version_data in discover.version_data():
         version = version_data['version']
@@ -78,16 +115,281 @@ def create_keystone_client(args):
         'Failed to discover keystone version for url %(auth_url)s.', **args)
 
 
+class TokenCache(object):
+    """Keystone tokens and service catalogs shared between processes.
+
+    Tokens are stored in files (one per endpoint), access to them is
+    synchronized by inter-process file locks, so all Rally processes on the
+    host reuse the same tokens until they expire. Expired tokens are
+    removed on read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._check_path()
+
+    def _check_path(self):
+        """Create the cache directory, refuse it if it isn't private."""
+        try:
+            os.makedirs(self.path, 0o700)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+        st = os.lstat(self.path)
+        if (not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or
+                st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)):
+            raise exceptions.InsecureTokenCache(path=self.path)
+
+    @staticmethod
+    def _key(endpoint):
+        return hashlib.sha1(json.dumps(endpoint.to_dict(),
+                                       sort_keys=True)).hexdigest()
+
+    def _get_file_name(self, endpoint):
+        return os.path.join(self.path, "%s.json" % self._key(endpoint))
+
+    @contextlib.contextmanager
+    def lock(self, endpoint):
+        """Lock the cached token of the endpoint in all processes."""
+        with lockutils.lock(self._key(endpoint), lock_file_prefix="rally-",
+                            external=True, lock_path=self.path):
+            yield
+
+    def get(self, endpoint):
+        """Return cached keystone AccessInfo of the endpoint.
+
+        :param endpoint: objects.Endpoint instance
+        :returns: AccessInfo or None if there is no token or it expires soon
+        """
+        try:
+            with open(self._get_file_name(endpoint)) as f:
+                data = json.load(f)
+            key = "token" if data["version"] == "v3" else "access"
+            auth_ref = keystone_access.AccessInfo.factory(
+                body={key: data["body"]}, auth_token=data["auth_token"])
+        except (IOError, ValueError, KeyError):
+            auth_ref = None
+
+        if auth_ref is None or auth_ref.will_expire_soon():
+            self.misses += 1
+            self.delete(endpoint)
+            return None
+        self.hits += 1
+        return auth_ref
+
+    def set(self, endpoint, auth_ref):
+        """Save keystone AccessInfo of the endpoint to the cache."""
+        data = {"version": auth_ref.version,
+                "auth_token": auth_ref.auth_token,
+                "body": dict(auth_ref)}
+        # NOTE: Tokens should be readable only by the owner
+        fd = os.open(self._get_file_name(endpoint),
+                     os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+
+    def delete(self, endpoint):
+        """Remove the cached token of the endpoint."""
+        try:
+            os.remove(self._get_file_name(endpoint))
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_TOKEN_CACHE = {}
+
+
+def get_token_cache():
+    """Return TokenCache of the process or None if it's disabled."""
+    if not CONF.keystone_token_cache:
+        return None
+    path = os.path.expanduser(CONF.keystone_token_cache_path)
+    if path not in _TOKEN_CACHE:
+        _TOKEN_CACHE[path] = TokenCache(path)
+    return _TOKEN_CACHE[path]
+
+
+def _authenticate(args, auth_ref=None):
+    client = create_keystone_client(args, auth_ref=auth_ref)
+    if client.auth_ref is None:
+        client.authenticate()
+    return client
+
+
+_URL_ID_RE = re.compile(r"/([0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?"
+                        r"[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}|\d+)(?=/|$)")
+
+_HTTP_CALLS = None
+_HTTP_CALLS_LOCK = threading.Lock()
+
+
+def _get_http_calls_local():
+    """Return storage of recorded calls, which is local for each thread.
+
+    Iterations of a runner may be green threads of the same OS thread
+    (e.g. constant_async runner), so eventlet local is used, which is
+    local for both green and OS threads.
+    """
+    global _HTTP_CALLS
+    if _HTTP_CALLS is None:
+        with _HTTP_CALLS_LOCK:
+            if _HTTP_CALLS is None:
+                _HTTP_CALLS = eventlet_corolocal.local()
+    return _HTTP_CALLS
+
+
+def get_url_template(url):
+    """Return URL path with ids (UUIDs and numbers) replaced with {id}."""
+    return _URL_ID_RE.sub("/{id}", urlparse.urlsplit(url).path)
+
+
+@contextlib.contextmanager
+def record_http_calls(enabled=True):
+    """Record HTTP calls done via HTTPPool by the current (green) thread.
+
+    :param enabled: if False, nothing is recorded
+    :returns: list which is filled with dicts {"method", "url", "status",
+              "duration"}, url is a template returned by get_url_template()
+              and status is None if there was no response
+    """
+    calls = []
+    if not enabled:
+        yield calls
+        return
+    local = _get_http_calls_local()
+    local.calls = calls
+    try:
+        yield calls
+    finally:
+        local.calls = None
+
+
+class _RecordingHTTPAdapter(requests_adapters.HTTPAdapter):
+    """HTTP adapter which records calls inside of record_http_calls().
+
+    It is shared by many clients, so close() called by one of them (e.g.
+    novaclient closes its requests session) does nothing. Connections are
+    closed only by HTTPPool.close().
+    """
+
+    def close(self):
+        pass
+
+    def send(self, request, *args, **kwargs):
+        calls = getattr(_get_http_calls_local(), "calls", None)
+        if calls is None:
+            return super(_RecordingHTTPAdapter, self).send(request, *args,
+                                                           **kwargs)
+        status = None
+        start = time.time()
+        try:
+            response = super(_RecordingHTTPAdapter, self).send(
+                request, *args, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            calls.append({"method": request.method,
+                          "url": get_url_template(request.url),
+                          "status": status,
+                          "duration": time.time() - start})
+
+
+class HTTPPool(object):
+    """Pool of keep-alive HTTP connections shared by clients.
+
+    There is a single requests HTTPAdapter (i.e. urllib3 connection pool
+    with up to `size` connections) per endpoint host, so all clients of
+    the process that talk to the same host reuse the same connections
+    instead of doing TCP and TLS handshakes for each new client.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._adapters = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_host(url):
+        parsed = urlparse.urlsplit(url)
+        return "%s://%s" % (parsed.scheme, parsed.netloc)
+
+    def get(self, url):
+        """Return HTTP adapter shared by all clients of the url host.
+
+        It has the same interface as novaclient connection pool.
+        """
+        host = self._get_host(url)
+        with self._lock:
+            if host not in self._adapters:
+                self._adapters[host] = _RecordingHTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.size)
+            return self._adapters[host]
+
+    def get_session(self, *urls):
+        """Return requests.Session which uses shared adapters of the urls."""
+        session = requests.Session()
+        for url in urls:
+            session.mount(self._get_host(url), self.get(url))
+        return session
+
+    def close(self):
+        """Close connections of all shared adapters."""
+        with self._lock:
+            for adapter in self._adapters.values():
+                requests_adapters.HTTPAdapter.close(adapter)
+            self._adapters = {}
+
+    def stats(self):
+        """Return number of opened connections & sent requests per host."""
+        stats = {}
+        with self._lock:
+            for host, adapter in self._adapters.items():
+                pools = adapter.poolmanager.pools
+                pools = [pools[key] for key in pools.keys()]
+                stats[host] = {
+                    "connections": sum(p.num_connections for p in pools),
+                    "requests": sum(p.num_requests for p in pools)}
+        return stats
+
+
+_HTTP_POOL = {}
+_HTTP_POOL_LOCK = threading.Lock()
+
+
+def get_http_pool():
+    """Return HTTPPool of the process.
+
+    Connections must not be shared with forked processes (e.g. runner
+    workers), so each process gets its own pool.
+    """
+    pid = os.getpid()
+    with _HTTP_POOL_LOCK:
+        if pid not in _HTTP_POOL:
+            _HTTP_POOL.clear()
+            _HTTP_POOL[pid] = HTTPPool(CONF.http_pool_size)
+        return _HTTP_POOL[pid]
+
+
 class Clients(object):
     """This class simplify and unify work with openstack python clients."""
 
     def __init__(self, endpoint):
         self.endpoint = endpoint
         self.cache = {}
+        self.auth_duration = 0.0
+        self.token_cache_hit = None
 
     def clear(self):
         """Remove all cached client handles."""
         self.cache = {}
+        self.auth_duration = 0.0
+        self.token_cache_hit = None
 
     @cached
     def keystone(self):
@@ -108,9 +410,30 @@ class Clients(object):
                 )
             else:
                 kw["endpoint"] = kw["auth_url"]
-        client = create_keystone_client(kw)
-        if client.auth_ref is None:
-            client.authenticate()
+        kw["session"] = keystone_session.Session(
+            session=get_http_pool().get_session(kw["auth_url"],
+                                                kw.get("endpoint",
+                                                       kw["auth_url"])),
+            verify=CONF.https_cacert or not CONF.https_insecure,
+            timeout=CONF.openstack_client_http_timeout)
+        auth_ref = getattr(self.endpoint, "auth_ref", None)
+        if auth_ref is not None and auth_ref.will_expire_soon():
+            auth_ref = None
+        token_cache = get_token_cache()
+        with utils.Timer() as timer:
+            if auth_ref is None and token_cache is not None:
+                with token_cache.lock(self.endpoint):
+                    auth_ref = token_cache.get(self.endpoint)
+                    self.token_cache_hit = auth_ref is not None
+                    client = _authenticate(kw, auth_ref=auth_ref)
+                    if not self.token_cache_hit:
+                        token_cache.set(self.endpoint, client.auth_ref)
+            else:
+                client = _authenticate(kw, auth_ref=auth_ref)
+        self.auth_duration = timer.duration()
+        if getattr(self.endpoint, "auth_ref", None) is not None:
+            # NOTE: Keep the pre-obtained token of the endpoint fresh
+            self.endpoint.auth_ref = client.auth_ref
         return client
 
     def verified_keystone(self):
@@ -147,6 +470,9 @@ class Clients(object):
                              insecure=CONF.https_insecure,
                              cacert=CONF.https_cacert)
         client.set_management_url(compute_api_url)
+        # NOTE: novaclient takes HTTP adapters per host from its connection
+        #       pool, so it's replaced with the pool shared by all clients
+        client.client._connection_pool = get_http_pool()
         return client
 
     @cached
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import ctypes
+import ctypes.util
 import functools
 import imp
 import inspect
@@ -22,9 +24,9 @@ import re
 import StringIO
 import sys
 import time
+import weakref
 
 import six
-from sphinx.util import docstrings
 
 from rally import exceptions
 from rally.openstack.common.gettextutils import _
@@ -79,6 +81,36 @@ class StdErrCapture(object):
         sys.stderr = self.stderr
 
 
+class LazyModule(object):
+    """Proxy of a module, which is imported on the first attribute access.
+
+    :param name: full name of the module, e.g. "novaclient.client"
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importutils.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        # NOTE: __getattr__ is called only for attributes which are not
+        #       found in the proxy itself
+        if attr.startswith("__") or attr in ("_name", "_module"):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        return "<lazy module '%s'>" % self._name
+
+
+# NOTE: sphinx is heavy and it's used only to parse docstrings
+docstrings = LazyModule("sphinx.util.docstrings")
+
+
 class Timer(object):
     def __enter__(self):
         self.error = None
@@ -94,6 +126,62 @@ class Timer(object):
         return self.finish - self.start
 
 
+def _load_librt():
+    """Load librt without forking ldconfig if possible.
+
+    ctypes.util.find_library() runs ldconfig in a subprocess, so it is used
+    only if librt can't be loaded by its usual soname.
+    """
+    try:
+        return ctypes.CDLL("librt.so.1", use_errno=True)
+    except OSError:
+        return ctypes.CDLL(ctypes.util.find_library("rt"), use_errno=True)
+
+
+def _get_monotonic_clock():
+    """Return function that reads monotonic clock in seconds.
+
+    Python 2 has no time.monotonic(), so on Linux CLOCK_MONOTONIC is read
+    with clock_gettime() directly. If it's not possible time.time() is used.
+    """
+    if hasattr(time, "monotonic"):
+        return time.monotonic
+    if not sys.platform.startswith("linux"):
+        return time.time
+    try:
+        clock_gettime = _load_librt().clock_gettime
+    except (OSError, AttributeError):
+        return time.time
+
+    class timespec(ctypes.Structure):
+        _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+    CLOCK_MONOTONIC = 1
+
+    def monotonic():
+        ts = timespec()
+        if clock_gettime(CLOCK_MONOTONIC, ctypes.byref(ts)):
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        return ts.tv_sec + ts.tv_nsec * 1e-9
+
+    return monotonic
+
+
+monotonic = _get_monotonic_clock()
+_MONOTONIC_TO_WALL = time.time() - monotonic()
+
+
+def timestamp():
+    """Return current wall time measured with monotonic clock.
+
+    Monotonic clock is mapped to wall time once (on import), so timestamps
+    are not affected by system clock adjustments and are comparable between
+    forked benchmark workers.
+    """
+    return _MONOTONIC_TO_WALL + monotonic()
+
+
 class Struct(object):
     def __init__(self, **entries):
         self.__dict__.update(entries)
@@ -118,6 +206,56 @@ def itersubclasses(cls, _seen=None):
                 yield sub
 
 
+# NOTE: Index of plugins {(base class, key attribute): {name: subclass}}.
+#       Subclasses are referenced weakly, so the index doesn't keep alive
+#       classes which otherwise would be garbage collected.
+_PLUGINS_INDEX = {}
+
+
+def invalidate_plugins_index():
+    """Drop the index of plugins, so it's rebuilt on the next lookup."""
+    _PLUGINS_INDEX.clear()
+
+
+def _get_plugins_index(base, key, rebuild=False):
+    index = _PLUGINS_INDEX.get((base, key))
+    if index is None or rebuild:
+        index = weakref.WeakValueDictionary()
+        for cls in itersubclasses(base):
+            name = getattr(cls, key, None)
+            # NOTE: The first subclass wins, as it did with linear search
+            if name is not None and name not in index:
+                index[name] = cls
+        _PLUGINS_INDEX[(base, key)] = index
+    return index
+
+
+def get_plugin(base, name, key="__name__"):
+    """Return subclass of the base class by its name.
+
+    Subclasses are indexed once per process, so lookups don't walk the
+    whole class hierarchy. Classes may be defined after the index is built,
+    so the index is rebuilt if the name is not found.
+
+    :param base: base class of plugins, e.g. Scenario
+    :param name: name of the plugin
+    :param key: name of the class attribute holding the plugin name
+    :returns: subclass of base or None if it isn't found
+    """
+    index = _get_plugins_index(base, key)
+    if name not in index:
+        index = _get_plugins_index(base, key, rebuild=True)
+    return index.get(name)
+
+
+def get_plugins(base, key="__name__"):
+    """Return list of indexed subclasses of the base class.
+
+    Only one subclass per name is returned, see get_plugin().
+    """
+    return _get_plugins_index(base, key).values()
+
+
 def try_append_module(name, modules):
     if name not in modules:
         modules[name] = importutils.import_module(name)
@@ -137,6 +275,7 @@ def import_modules_from_package(package):
             new_package = ".".join(root.split(os.sep)).split("....")[1]
             module_name = '%s.%s' % (new_package, filename[:-3])
             try_append_module(module_name, sys.modules)
+    invalidate_plugins_index()
 
 
 def _log_wrapper(obj, log, msg, **kw):
@@ -196,6 +335,7 @@ def load_plugins(directory):
             except Exception as e:
                 LOG.error(_("Couldn't load module from %(path)s: %(msg)s") %
                           {"path": fullpath, "msg": six.text_type(e)})
+        invalidate_plugins_index()
 
 
 def get_method_class(func):
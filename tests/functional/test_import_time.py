@@ -0,0 +1,69 @@
+# Copyright 2014: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import subprocess
+import sys
+import time
+import unittest
+
+
+# NOTE: Import time of a fresh interpreter may vary a lot, so the best of
+#       several runs is compared with the limit. Slow CI nodes may raise it
+#       with RALLY_IMPORT_TIME_LIMIT and RALLY_COLD_START_LIMIT.
+RUNS = 5
+DEFAULT_LIMIT = 1.0
+
+
+def measure_import_time(module, runs=RUNS):
+    """Import the module in fresh interpreters, return import times."""
+    code = ("import time\n"
+            "start = time.time()\n"
+            "import %s\n"
+            "print(time.time() - start)" % module)
+    return [float(subprocess.check_output([sys.executable, "-c", code]))
+            for i in range(runs)]
+
+
+def measure_cold_start(args, runs=RUNS):
+    """Run rally CLI in fresh interpreters, return wall times of runs."""
+    times = []
+    with open(os.devnull, "w") as devnull:
+        for i in range(runs):
+            start = time.time()
+            subprocess.call([sys.executable, "-m", "rally.cmd.main"] + args,
+                            stdout=devnull, stderr=devnull)
+            times.append(time.time() - start)
+    return times
+
+
+class ImportTimeTestCase(unittest.TestCase):
+
+    def test_import_time_of_cli(self):
+        limit = float(os.environ.get("RALLY_IMPORT_TIME_LIMIT",
+                                     DEFAULT_LIMIT))
+        times = measure_import_time("rally.cmd.main")
+        print("Import time of rally.cmd.main: best %.3fs, avg %.3fs "
+              "(%d runs)" % (min(times), sum(times) / len(times), len(times)))
+        self.assertLess(min(times), limit)
+
+    def test_cold_start_of_cli_command(self):
+        limit = float(os.environ.get("RALLY_COLD_START_LIMIT",
+                                     DEFAULT_LIMIT))
+        times = measure_cold_start(["task", "list", "--help"])
+        print("Cold start of `rally task list --help`: best %.3fs, "
+              "avg %.3fs (%d runs)" % (min(times), sum(times) / len(times),
+                                       len(times)))
+        self.assertLess(min(times), limit)
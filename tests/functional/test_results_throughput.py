@@ -0,0 +1,50 @@
+# Copyright 2014: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import unittest
+
+import mock
+
+from rally.benchmark.runners import serial
+from rally import utils
+
+
+# NOTE: The fast check of results handles ~50k results per second, while
+#       jsonschema validation handles less than 1k, so the default limit is
+#       loose enough for slow test nodes.
+RESULTS_NUM = 5000
+DEFAULT_MIN_THROUGHPUT = 10000
+
+
+class ResultsThroughputTestCase(unittest.TestCase):
+
+    def test_send_result_throughput(self):
+        min_throughput = float(os.environ.get("RALLY_RESULTS_THROUGHPUT_MIN",
+                                              DEFAULT_MIN_THROUGHPUT))
+        runner = serial.SerialScenarioRunner(mock.MagicMock(), {})
+        result = {"duration": 1.0, "idle_duration": 0.0, "error": [],
+                  "scenario_output": {"errors": "", "data": {"a": 1.0}},
+                  "atomic_actions": {"action_1": 1.0, "action_2": None}}
+
+        with utils.Timer() as timer:
+            for i in xrange(RESULTS_NUM):
+                runner._send_result(dict(result))
+
+        self.assertEqual(RESULTS_NUM, len(runner.result_queue))
+        throughput = RESULTS_NUM / timer.duration()
+        print("Throughput of _send_result: %.1f results per second"
+              % throughput)
+        self.assertGreater(throughput, min_throughput)
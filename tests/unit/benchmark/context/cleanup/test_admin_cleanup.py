@@ -56,4 +56,27 @@ class AdminCleanupTestCase(test.TestCase):
 
         mock_clients.assert_called_once_with(context["admin"]["endpoint"])
         mock_clients.return_value.keystone.assert_called_with()
-        mock_del_keystone.assert_called_once_with(fake_keystone)
+        mock_del_keystone.assert_called_once_with(fake_keystone, set())
+
+    @mock.patch("%s.osclients.Clients" % BASE)
+    @mock.patch("%s.utils.delete_admin_quotas" % BASE)
+    @mock.patch("%s.utils.delete_keystone_resources" % BASE)
+    def test_cleaner_admin_keeps_shared(self, mock_del_keystone,
+                                        mock_del_quotas, mock_clients):
+        context = {
+            "task": mock.MagicMock(),
+            "config": {"admin_cleanup": ["keystone", "quotas"]},
+            "admin": {"endpoint": mock.MagicMock()},
+            "users": [{"id": "u1"}],
+            "tenants": [{"id": "t1"}],
+            "quotas": {"nova": {"cores": 10}}
+        }
+        res_cleaner = admin_cleanup.AdminCleanup(context)
+
+        with res_cleaner:
+            res_cleaner.setup()
+
+        mock_del_keystone.assert_called_once_with(
+            mock_clients.return_value.keystone.return_value,
+            set(["u1", "t1"]))
+        mock_del_quotas.assert_called_once_with(mock_clients.return_value, [])
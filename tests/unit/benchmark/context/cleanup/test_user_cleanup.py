@@ -77,6 +77,26 @@ class UserCleanupTestCase(test.TestCase):
         self.assertEqual(mock_del_cinder.call_count, 2)
         self.assertEqual(mock_del_neutron.call_count, 2)
 
+    @mock.patch("%s.osclients.Clients" % BASE)
+    @mock.patch("%s.utils.delete_nova_resources" % BASE)
+    def test_cleaner_keeps_shared(self, mock_del_nova, mock_clients):
+        context = {
+            "task": mock.MagicMock(),
+            "users": [{"id": "u1", "endpoint": mock.MagicMock(),
+                       "keypair": {"private": "key"}}],
+            "config": {"cleanup": ["nova"]},
+            "tenants": [{"id": "t1"}],
+            "allow_ssh": "rally_ssh_open"
+        }
+        user_cleaner = user_cleanup.UserCleanup(context)
+
+        with user_cleaner:
+            user_cleaner.setup()
+
+        mock_del_nova.assert_called_once_with(
+            mock_clients.return_value.nova.return_value,
+            keep=set(["u1", "t1", "rally_ssh_key", "rally_ssh_open"]))
+
     @mock.patch("%s.UserCleanup._cleanup_resources" % BASE)
     def test_cleaner_default_behavior(self, mock_cleanup):
         context = {
@@ -68,6 +68,25 @@ class CleanupUtilsTestCase(test.TestCase):
         sahara.cluster_templates.delete.assert_called_once_with(42)
         sahara.node_group_templates.delete.assert_called_once_with(42)
 
+    def test_delete_sahara_resources_keep(self):
+        sahara = mock.MagicMock()
+        resource = lambda id, **kwargs: mock.Mock(id=id, **kwargs)
+        sahara.job_binaries.list.return_value = [
+            resource("jb1", url="internal-db://jbi1"),
+            resource("jb2", url="internal-db://jbi2")]
+        sahara.job_binary_internals.list.return_value = [resource("jbi1"),
+                                                         resource("jbi2")]
+        sahara.data_sources.list.return_value = [resource("ds1"),
+                                                 resource("ds2")]
+        sahara.clusters.list.return_value = [resource("c1")]
+
+        utils.delete_sahara_resources(sahara, keep={"jb1", "ds1", "c1"})
+
+        sahara.job_binaries.delete.assert_called_once_with("jb2")
+        sahara.job_binary_internals.delete.assert_called_once_with("jbi2")
+        sahara.data_sources.delete.assert_called_once_with("ds2")
+        self.assertFalse(sahara.clusters.delete.called)
+
     def test_delete_cinder_resources(self):
         cinder = fakes.FakeClients().cinder()
         scenario = scenarios.cinder.utils.CinderScenario()
@@ -98,6 +117,27 @@ class CleanupUtilsTestCase(test.TestCase):
         utils.delete_nova_resources(nova)
         self.assertEqual(total(nova), 1)
 
+    def test_delete_cinder_resources_keep(self):
+        cinder = fakes.FakeClients().cinder()
+        kept = cinder.volumes.create()
+        cinder.volumes.create()
+        utils.delete_cinder_resources(cinder, keep={kept.id})
+        self.assertEqual([kept], cinder.volumes.list())
+
+    def test_delete_nova_resources_keep(self):
+        nova = fakes.FakeClients().nova()
+        nova.keypairs.create("rally_ssh_key")
+        nova.keypairs.create("dummy")
+        nova.security_groups.create("rally_ssh_open")
+        nova.security_groups.create("dummy")
+        utils.delete_nova_resources(nova,
+                                    keep={"rally_ssh_key", "rally_ssh_open"})
+        self.assertEqual(["rally_ssh_key"],
+                         [kp.name for kp in nova.keypairs.list()])
+        self.assertEqual(["default", "rally_ssh_open"],
+                         sorted(sg.name for sg in
+                                nova.security_groups.list()))
+
     def test_delete_heat_resources(self):
         heat = fakes.FakeClients().heat()
         heat.stacks.create("dummy")
@@ -140,6 +180,15 @@ class CleanupUtilsTestCase(test.TestCase):
         utils.delete_keystone_resources(keystone)
         self.assertEqual(total(keystone), 0)
 
+    @mock.patch('rally.benchmark.wrappers.keystone.wrap')
+    def test_delete_keystone_resources_keep(self, mock_wrap):
+        keystone = fakes.FakeClients().keystone()
+        mock_wrap.return_value = keystone
+        kept = keystone.users.create("rally_keystone_kept", None, None, None)
+        keystone.users.create("rally_keystone_dummy", None, None, None)
+        utils.delete_keystone_resources(keystone, keep={kept.id})
+        self.assertEqual([kept.id], [u.id for u in keystone.users.list()])
+
     def test_delete_glance_resources(self):
         glance = fakes.FakeClients().glance()
         glance.images.create("dummy", None, None, None)
@@ -148,6 +197,32 @@ class CleanupUtilsTestCase(test.TestCase):
         utils.delete_glance_resources(glance, "dummy")
         self.assertEqual(total(glance), 0)
 
+    def test_delete_glance_resources_keep(self):
+        glance = fakes.FakeClients().glance()
+        kept = glance.images.create("kept", None, None, None)
+        glance.images.create("dummy", None, None, None)
+        utils.delete_glance_resources(glance, "dummy", keep={kept.id})
+        self.assertEqual([kept.id], [i.id for i in glance.images.list()])
+
+    def test_get_context_resources(self):
+        context = {
+            "users": [{"id": "u1", "keypair": {}}, {"id": "u2"}],
+            "tenants": [{"id": "t1"}],
+            "allow_ssh": "rally_ssh_open",
+            "images": [{"image_id": ["i1", "i2"]}],
+            "volumes": [{"volume_id": "v1"}],
+            "sahara_images": {"t1": "si1"},
+            "sahara_clusters": {"t1": "c1"},
+            "sahara_inputs": {"t1": "ds1"},
+            "sahara_mains": {"t1": ["jb1"]},
+            "sahara_libs": {"t1": ["jb2"]}
+        }
+        self.assertEqual(
+            set(["u1", "u2", "rally_ssh_key", "t1", "rally_ssh_open", "i1",
+                 "i2", "v1", "si1", "c1", "ds1", "jb1", "jb2"]),
+            utils.get_context_resources(context))
+        self.assertEqual(set(), utils.get_context_resources({}))
+
     def test_delete_zaqar_resources(self):
         zaqar = fakes.FakeClients().zaqar()
         messages = [{'body': {'id': idx}, 'ttl': 360} for idx in range(20)]
@@ -154,6 +154,7 @@ class QuotasTestCase(test.TestCase):
                                                 .update(tenant["id"],
                                                         **cinder_quotas))
             mock_quotas.assert_has_calls(expected_setup_calls, any_order=True)
+            self.assertEqual(ctx["config"]["quotas"], ctx["quotas"])
             mock_quotas.reset_mock()
 
         expected_cleanup_calls = []
@@ -56,20 +56,21 @@ class BaseContextTestCase(test.TestCase):
         self.assertRaises(jsonschema.ValidationError,
                           fakes.FakeContext.validate, {"nonexisting": 2})
 
-    @mock.patch("rally.benchmark.context.base.utils.itersubclasses")
-    def test_get_by_name(self, mock_itersubclasses):
-        A = mock.MagicMock()
-        A.__ctx_name__ = "a"
-        B = mock.MagicMock()
-        B.__ctx_name__ = "b"
-        mock_itersubclasses.return_value = [A, B]
-
-        self.assertEqual(A, base.Context.get_by_name("a"))
-        self.assertEqual(B, base.Context.get_by_name("b"))
-
-    @mock.patch("rally.benchmark.context.base.utils.itersubclasses")
-    def test_get_by_name_non_existing(self, mock_itersubclasses):
-        mock_itersubclasses.return_value = []
+    @mock.patch("rally.benchmark.context.base.utils.get_plugin")
+    def test_get_by_name(self, mock_get_plugin):
+        self.assertEqual(mock_get_plugin.return_value,
+                         base.Context.get_by_name("a"))
+        mock_get_plugin.assert_called_once_with(base.Context, "a",
+                                                key="__ctx_name__")
+
+    def test_get_by_name_real_context(self):
+        self.assertEqual(fakes.FakeContext,
+                         base.Context.get_by_name(
+                             fakes.FakeContext.__ctx_name__))
+
+    @mock.patch("rally.benchmark.context.base.utils.get_plugin",
+                return_value=None)
+    def test_get_by_name_non_existing(self, mock_get_plugin):
         self.assertRaises(exceptions.NoSuchContext,
                           base.Context.get_by_name, "nonexisting")
 
@@ -115,6 +116,12 @@ class BaseContextTestCase(test.TestCase):
         for cls in utils.itersubclasses(base.Context):
             self.assertNotEqual(cls.get_name(), "base", str(cls))
 
+    def test_is_reusable(self):
+        self.assertTrue(fakes.FakeContext.is_reusable())
+        self.assertTrue(base.Context.get_by_name("quotas").is_reusable())
+        for name in ("cleanup", "admin_cleanup"):
+            self.assertFalse(base.Context.get_by_name(name).is_reusable())
+
     def test_lt(self):
 
         class FakeLowerContext(fakes.FakeContext):
@@ -216,6 +223,24 @@ class ContextManagerTestCase(test.TestCase):
                                                     mock.call.setup()],
                                                    any_order=True)
 
+    @mock.patch("rally.benchmark.context.base.LOG")
+    @mock.patch("rally.benchmark.context.base.Context.get_by_name")
+    def test_setup_and_cleanup_log_duration(self, mock_get_by_name,
+                                            mock_log):
+        mock_context = mock.MagicMock()
+        mock_context.return_value.get_name.return_value = "fake"
+        mock_get_by_name.return_value = mock_context
+        manager = base.ContextManager({"config": {"a": []}})
+
+        manager.setup()
+        manager.cleanup()
+
+        self.assertEqual(2, mock_log.info.call_count)
+        self.assertTrue(mock_log.info.call_args_list[0][0][0].startswith(
+            "Context fake setup took "))
+        self.assertTrue(mock_log.info.call_args_list[1][0][0].startswith(
+            "Context fake cleanup took "))
+
     @mock.patch("rally.benchmark.context.base.Context.get_by_name")
     def test_cleanup(self, mock_get_by_name):
         mock_context = mock.MagicMock()
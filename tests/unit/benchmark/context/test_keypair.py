@@ -48,10 +48,10 @@ class KeyPairContextTestCase(test.TestCase):
     @mock.patch('rally.osclients.Clients')
     @mock.patch("%s.keypair.Keypair._keypair_safe_remove" % CTX)
     def test_keypair_cleanup(self, mock_safe_remove, mock_osclients):
+        # NOTE: create child mocks before cleanup() uses them from threads
+        mock_nova = mock_osclients.return_value.nova.return_value
         keypair_ctx = keypair.Keypair(self.ctx_with_keys)
         keypair_ctx.cleanup()
-        mock_clients = mock_osclients.return_value
-        mock_nova = mock_clients.nova.return_value
         self.assertEqual(
             [mock.call(mock_nova)]
             * self.users,
@@ -77,3 +77,23 @@ class SecGroupContextTestCase(test.TestCase):
         secgrp_ctx = secgroup.AllowSSH(self.ctx_without_keys)
         secgrp_ctx.setup()
         secgrp_ctx.cleanup()
+
+    @mock.patch("rally.benchmark.context.secgroup.bench_utils"
+                ".run_concurrent")
+    def test_sec_group_cleanup(self, mock_run_concurrent):
+        secgrp_ctx = secgroup.AllowSSH(self.ctx_without_keys)
+        secgrp_ctx.secgroup = [mock.MagicMock(), mock.MagicMock()]
+        secgrp_ctx.cleanup()
+        mock_run_concurrent.assert_called_once_with(
+            secgroup.cfg.CONF.users_context.concurrent, secgrp_ctx,
+            "_cleanup_secgroup", secgrp_ctx.secgroup)
+
+    def test__cleanup_secgroup(self):
+        secgrp_ctx = secgroup.AllowSSH(self.ctx_without_keys)
+        fake_secgroup = mock.MagicMock()
+        secgrp_ctx._cleanup_secgroup(fake_secgroup)
+        fake_secgroup.delete.assert_called_once_with()
+
+        # errors are logged, not raised
+        fake_secgroup.delete.side_effect = Exception
+        secgrp_ctx._cleanup_secgroup(fake_secgroup)
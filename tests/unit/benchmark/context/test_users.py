@@ -91,16 +91,14 @@ class UserGeneratorTestCase(test.TestCase):
         tenant2 = {'id': 4}
         networks = [mock.MagicMock(project_id=1),
                     mock.MagicMock(project_id=2)]
-        admin_endpoint, tenants = (mock.MagicMock(), [tenant1, tenant2])
+        tenants = [tenant1, tenant2]
         nova_admin = mock.MagicMock()
         clients = mock.MagicMock()
-        self.osclients.Clients.return_value = clients
         clients.services.return_value = {'compute': 'nova'}
         clients.nova.return_value = nova_admin
         nova_admin.networks.list.return_value = networks
         nova_admin.networks.get = fake_get_network
-        users.UserGenerator._remove_associated_networks(admin_endpoint,
-                                                        tenants)
+        users.UserGenerator._remove_associated_networks(clients, tenants)
         mock_check_service_status.assert_called_once_with(mock.ANY,
                                                           'nova-network')
         nova_admin.networks.disassociate.assert_called_once_with(networks[0])
@@ -117,17 +115,15 @@ class UserGeneratorTestCase(test.TestCase):
         tenant2 = {'id': 4}
         networks = [mock.MagicMock(project_id=1),
                     mock.MagicMock(project_id=2)]
-        admin_endpoint, tenants = (mock.MagicMock(), [tenant1, tenant2])
+        tenants = [tenant1, tenant2]
         nova_admin = mock.MagicMock()
         clients = mock.MagicMock()
-        self.osclients.Clients.return_value = clients
         clients.services.return_value = {'compute': 'nova'}
         clients.nova.return_value = nova_admin
         nova_admin.networks.list.return_value = networks
         nova_admin.networks.get = fake_get_network
         nova_admin.networks.disassociate.side_effect = Exception()
-        users.UserGenerator._remove_associated_networks(admin_endpoint,
-                                                        tenants)
+        users.UserGenerator._remove_associated_networks(clients, tenants)
         mock_check_service_status.assert_called_once_with(mock.ANY,
                                                           'nova-network')
         nova_admin.networks.disassociate.assert_called_once_with(networks[0])
@@ -151,6 +147,47 @@ class UserGeneratorTestCase(test.TestCase):
             mock.call(user1["id"]),
             mock.call(user2["id"])])
 
+    def test_get_admin_clients(self):
+        ctx_dict = self.context
+        ctx = users.UserGenerator(ctx_dict)
+        clients = ctx._get_admin_clients()
+        self.assertEqual(clients, ctx._get_admin_clients())
+        self.osclients.Clients.assert_called_once_with(
+            ctx_dict["admin"]["endpoint"])
+        clients.keystone.assert_called_once_with()
+
+    def test_prewarm_token(self):
+        user = {"id": "u1", "endpoint": mock.MagicMock(auth_ref=None)}
+        users.UserGenerator._prewarm_token(user)
+        self.osclients.Clients.assert_called_once_with(user["endpoint"])
+        self.assertEqual(
+            self.osclients.Clients.return_value.keystone.return_value.
+            auth_ref, user["endpoint"].auth_ref)
+
+    def test_prewarm_token_fails(self):
+        user = {"id": "u1", "endpoint": mock.MagicMock(auth_ref=None)}
+        self.osclients.Clients.return_value.keystone.side_effect = Exception
+        users.UserGenerator._prewarm_token(user)
+        self.assertIsNone(user["endpoint"].auth_ref)
+
+    @mock.patch("rally.benchmark.context.users.UserGenerator."
+                "_prewarm_token")
+    def test_setup_prewarm_tokens(self, mock_prewarm_token):
+        context = self.context
+        context["config"]["users"]["prewarm_tokens"] = True
+        ctx = users.UserGenerator(context)
+        ctx.setup()
+        mock_prewarm_token.assert_has_calls(
+            [mock.call(user) for user in ctx.context["users"]],
+            any_order=True)
+
+    @mock.patch("rally.benchmark.context.users.UserGenerator."
+                "_prewarm_token")
+    def test_setup_without_prewarm_tokens(self, mock_prewarm_token):
+        ctx = users.UserGenerator(self.context)
+        ctx.setup()
+        self.assertFalse(mock_prewarm_token.called)
+
     def test_setup_and_cleanup(self):
         with users.UserGenerator(self.context) as ctx:
             self.assertEqual(self.wrapped_keystone.create_user.call_count, 0)
@@ -179,6 +216,8 @@ class UserGeneratorTestCase(test.TestCase):
                          self.users_num)
         self.assertEqual(self.wrapped_keystone.delete_project.call_count,
                          self.tenants_num)
+        token_cache = self.osclients.get_token_cache.return_value
+        self.assertEqual(self.users_num, token_cache.delete.call_count)
 
     def test_users_and_tenants_in_context(self):
         task = {"uuid": "abcdef"}
@@ -224,3 +263,99 @@ class UserGeneratorTestCase(test.TestCase):
                                                     tenants_ids, user_list):
                 self.assertEqual(user["id"], orig_user.id)
                 self.assertEqual(user["tenant_id"], tenant_id)
+
+    def test_setup_benchmark_index(self):
+        context = self.context
+        context.update({"benchmark_index": 3, "task": {"uuid": "abcdef"}})
+        with users.UserGenerator(context) as ctx:
+            ctx.setup()
+
+        pattern = users.UserGenerator.PATTERN_TENANT
+        self.wrapped_keystone.create_project.assert_has_calls(
+            [mock.call(pattern % {"task_id": "abcdef_3", "iter": i},
+                       mock.ANY) for i in range(self.tenants_num)],
+            any_order=True)
+
+    @mock.patch("rally.benchmark.context.users.objects.Deployment")
+    def test_setup_tenant_pool(self, mock_deployment):
+        context = self.context
+        context["config"]["users"]["tenant_pool"] = True
+        domains = {"project_domain": "default", "user_domain": "default"}
+        user = {"id": "u", "tenant_id": "t",
+                "endpoint": {"auth_url": "url", "username": "user",
+                             "password": "pwd"}}
+        pooled = [
+            {"id": 1, "info": {"tenant": {"id": "t1"}, "domains": domains,
+                               "users": [user]}},
+            {"id": 2, "info": {"tenant": {"id": "t2"}, "domains": {},
+                               "users": [user] * self.users_per_tenant}},
+            {"id": 3, "info": {"tenant": {"id": "t3"}, "domains": domains,
+                               "users": [user] * self.users_per_tenant}},
+        ]
+        deployment = mock_deployment.get.return_value
+        deployment.reclaim_pooled_tenants.return_value = 1
+        deployment.get_pooled_tenants.return_value = pooled
+        deployment.add_pooled_tenant.side_effect = [
+            {"id": i} for i in range(10, 10 + self.tenants_num)]
+
+        with users.UserGenerator(context) as ctx:
+            ctx.setup()
+            self.assertEqual([3] + range(10, 9 + self.tenants_num),
+                             ctx.leased)
+
+            deployment.lease_pooled_tenant.assert_called_once_with(
+                3, context["task"]["uuid"])
+            self.assertEqual(self.tenants_num - 1,
+                             deployment.add_pooled_tenant.call_count)
+            self.assertEqual(self.tenants_num, len(ctx.context["tenants"]))
+            self.assertEqual(self.users_num, len(ctx.context["users"]))
+            self.assertEqual("t3", ctx.context["tenants"][0]["id"])
+            self.assertEqual("user",
+                             ctx.context["users"][0]["endpoint"].username)
+
+            deployment.reclaim_pooled_tenants.assert_called_once_with()
+            self.assertEqual(
+                self.users_num,
+                self.wrapped_keystone.update_user_password.call_count)
+            self.assertNotEqual("pwd",
+                                ctx.context["users"][0]["endpoint"].password)
+            for call in deployment.add_pooled_tenant.call_args_list:
+                for pooled_user in call[0][0]["users"]:
+                    self.assertIsNone(pooled_user["endpoint"]["password"])
+
+        mock_deployment.release_pooled_tenant.assert_has_calls(
+            [mock.call(3)] + [mock.call(i) for i in
+                              range(10, 9 + self.tenants_num)])
+        self.assertFalse(self.wrapped_keystone.delete_user.called)
+        self.assertFalse(self.wrapped_keystone.delete_project.called)
+
+    @mock.patch("rally.benchmark.context.users.UserGenerator._delete_users")
+    @mock.patch("rally.benchmark.context.users.UserGenerator."
+                "_delete_tenants")
+    @mock.patch("rally.benchmark.context.users.UserGenerator."
+                "_remove_associated_networks")
+    def test_delete_tenant_pool(self, mock_remove_networks,
+                                mock_delete_tenants, mock_delete_users):
+        deployment = mock.MagicMock()
+        deployment.__getitem__.return_value = {"auth_url": "url",
+                                               "username": "admin",
+                                               "password": "pwd"}
+        deployment.get_pooled_tenants.return_value = [
+            {"id": 1, "info": {"tenant": {"id": "t1"},
+                               "users": [{"id": "u1"}, {"id": "u2"}]}},
+            {"id": 2, "info": {"tenant": {"id": "t2"},
+                               "users": [{"id": "u3"}]}}]
+
+        users.UserGenerator.delete_tenant_pool(deployment)
+
+        admin_endpoint = self.osclients.Clients.call_args[0][0]
+        self.assertEqual("admin", admin_endpoint.username)
+        admin_clients = self.osclients.Clients.return_value
+        mock_delete_users.assert_called_once_with(
+            (admin_clients, [{"id": "u1"}, {"id": "u2"}, {"id": "u3"}]))
+        mock_remove_networks.assert_called_once_with(
+            admin_clients, [{"id": "t1"}, {"id": "t2"}])
+        mock_delete_tenants.assert_called_once_with(
+            (admin_clients, [{"id": "t1"}, {"id": "t2"}]))
+        deployment.delete_pooled_tenant.assert_has_calls(
+            [mock.call(1), mock.call(2)])
@@ -49,10 +49,12 @@ class PlotTestCase(test.TestCase):
                                           % mock_dirname.return_value)
 
     @mock.patch("rally.benchmark.processing.plot._prepare_data")
+    @mock.patch("rally.benchmark.processing.plot._process_steps")
+    @mock.patch("rally.benchmark.processing.plot._process_timeline")
     @mock.patch("rally.benchmark.processing.plot._process_atomic")
     @mock.patch("rally.benchmark.processing.plot._process_main_duration")
     def test__process_results(self, mock_main_duration, mock_atomic,
-                              mock_prepare):
+                              mock_timeline, mock_steps, mock_prepare):
         results = [
             {"key": {"name": "Klass.method_foo", "pos": 0, "kw": "config1"}},
             {"key": {"name": "Klass.method_foo", "pos": 1, "kw": "config2"}},
@@ -90,10 +92,83 @@ class PlotTestCase(test.TestCase):
                 "config": config,
                 "duration": mock_main_duration.return_value,
                 "atomic": mock_atomic.return_value,
+                "timeline": mock_timeline.return_value,
+                "steps": mock_steps.return_value,
                 "table_cols": table_cols,
                 "table_rows": [['total', None, None, None, None, None, 0, 0]]
             })
 
+    def test__process_timeline(self):
+        result = {"result": [
+            {"timestamp": 10.0, "duration": 1.5, "idle_duration": 0.0,
+             "error": []},
+            {"timestamp": 10.5, "duration": 0.2, "idle_duration": 0.0,
+             "error": ["Exception"]}
+        ]}
+
+        output = plot._process_timeline(result)
+
+        self.assertEqual({
+            "rps": [{"key": "started", "values": [[0, 2]]},
+                    {"key": "failed", "values": [[0, 1]]}],
+            "concurrency": [{"key": "in flight",
+                             "values": [[0, 2], [1, 1]]}],
+            "schedule": []
+        }, output)
+
+    def test__process_timeline_schedule(self):
+        result = {"result": [
+            {"timestamp": 10.0, "duration": 0.5, "idle_duration": 0.0,
+             "error": [], "intended_start": 10.0, "actual_start": 10.0},
+            {"timestamp": 11.5, "duration": 0.5, "idle_duration": 0.0,
+             "error": [], "intended_start": 10.5, "actual_start": 11.5}
+        ]}
+
+        output = plot._process_timeline(result)
+
+        self.assertEqual([{"key": "requested", "values": [[0, 2], [1, 0]]},
+                          {"key": "achieved", "values": [[0, 1], [1, 1]]}],
+                         output["schedule"])
+
+    def test__process_timeline_no_timestamps(self):
+        self.assertEqual({"rps": [], "concurrency": [], "schedule": []},
+                         plot._process_timeline({"result": []}))
+
+    def test__process_steps(self):
+        result = {
+            "key": {"kw": {"runner": {"type": "stepped", "steps": [1, 5]}}},
+            "result": [
+                {"step": 0, "duration": 1.0, "error": []},
+                {"step": 1, "duration": 2.0, "error": ["Exception"]}
+            ]
+        }
+
+        output = plot._process_steps(result)
+
+        self.assertEqual(8, len(output["cols"]))
+        self.assertEqual([[0, 1, 1, "0.0%", 1.0, 1.0, 1.0, 1.0],
+                          [1, 5, 1, "100.0%", None, None, None, None]],
+                         output["rows"])
+        self.assertNotIn("capacity", output)
+
+    def test__process_steps_capacity(self):
+        result = {
+            "key": {"kw": {"runner": {"type": "capacity", "max": 4}}},
+            "result": [
+                {"step": 0, "duration": 1.0, "error": []},
+                {"step": 1, "duration": 2.0, "error": ["Exception"]}
+            ],
+            "runner_stats": {"capacity": 1,
+                             "steps": [{"step": 0, "load": 1},
+                                       {"step": 1, "load": 4}]}
+        }
+
+        output = plot._process_steps(result)
+
+        self.assertEqual([0, 1], [row[0] for row in output["rows"]])
+        self.assertEqual([1, 4], [row[1] for row in output["rows"]])
+        self.assertEqual(1, output["capacity"])
+
     def test__process_main_time(self):
         result = {
             "result": [
@@ -311,3 +386,15 @@ class PlotTestCase(test.TestCase):
                               52.2, 64.8, 76.8, 87.8, 98.8]
         atomic_a2 = new_data["atomic_durations"]["a2"]
         assertAlmostEqualLists(expected_durations, atomic_a2)
+
+    def test__prepare_data_different_atomic_actions(self):
+        data = [
+            {"duration": 1, "idle_duration": 0, "error": [],
+             "atomic_actions": {"a1": 1}},
+            {"duration": 2, "idle_duration": 0, "error": [],
+             "atomic_actions": {"a2": 2}},
+            {"error": ["error"]}
+        ]
+        new_data = plot._prepare_data({"result": data})
+        self.assertEqual({"a1": [1, 0, 0], "a2": [0, 2, 0]},
+                         new_data["atomic_durations"])
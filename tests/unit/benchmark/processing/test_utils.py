@@ -83,3 +83,130 @@ class AtomicActionsDataTestCase(test.TestCase):
 
         output = utils.get_atomic_actions_data(raw_data)
         self.assertEqual(output, atomic_actions_data)
+
+    def test_get_atomic_actions_data_different_actions(self):
+        raw_data = [
+            {"error": [], "duration": 3, "atomic_actions": {"a": 1}},
+            {"error": ["error"], "duration": 1, "atomic_actions": {"c": 1}},
+            {"error": [], "duration": 5, "atomic_actions": {"b": 2}},
+            {"error": [], "duration": 4, "atomic_actions": {"a": 3, "b": 1}}
+        ]
+        self.assertEqual(["a", "b"],
+                         sorted(utils.get_atomic_actions_names(raw_data)))
+        self.assertEqual({"a": [1, 3], "b": [2, 1], "total": [3, 5, 4]},
+                         utils.get_atomic_actions_data(raw_data))
+
+    def test_get_atomic_actions_data_from_intended_start(self):
+        raw_data = [
+            {"error": [], "duration": 3, "idle_duration": 1,
+             "atomic_actions": {}, "intended_start": 10.0,
+             "actual_start": 10.5},
+            {"error": ["error"], "duration": 1, "idle_duration": 0,
+             "atomic_actions": {}, "intended_start": 11.0,
+             "actual_start": 11.0}
+        ]
+
+        output = utils.get_atomic_actions_data(raw_data)
+        self.assertEqual({"total": [3], "total (from intended start)": [4.5]},
+                         output)
+
+
+class RPSDataTestCase(test.TestCase):
+
+    def test_get_rps_data(self):
+        raw_data = [
+            {"intended_start": 10.0, "actual_start": 10.1},
+            {"intended_start": 10.5, "actual_start": 10.6},
+            {"intended_start": 11.0, "actual_start": 12.9},
+            {"intended_start": 11.5, "actual_start": 13.0}
+        ]
+        self.assertEqual([(0, 2, 2), (1, 2, 0), (2, 0, 1), (3, 0, 1)],
+                         utils.get_rps_data(raw_data))
+
+    def test_get_rps_data_no_schedule(self):
+        self.assertEqual([], utils.get_rps_data([{"duration": 1}]))
+
+
+class HTTPCallsDataTestCase(test.TestCase):
+
+    def test_get_http_calls_data(self):
+        raw_data = [
+            {"http_calls": {
+                "GET /s/{id}": {"count": 3, "duration": 0.5, "min": 0.125,
+                                "max": 0.25, "errors": 1},
+                "POST /s": {"count": 1, "duration": 1.0, "min": 1.0,
+                            "max": 1.0, "errors": 0}}},
+            {"http_calls": {
+                "GET /s/{id}": {"count": 1, "duration": 0.5, "min": 0.5,
+                                "max": 0.5, "errors": 0}}},
+            {"duration": 1}
+        ]
+        self.assertEqual([("GET /s/{id}", 4, 2.0, 0.125, 0.25, 0.5, 1),
+                          ("POST /s", 1, 0.5, 1.0, 1.0, 1.0, 0)],
+                         utils.get_http_calls_data(raw_data))
+
+    def test_get_http_calls_data_not_recorded(self):
+        self.assertEqual([], utils.get_http_calls_data([{"duration": 1}]))
+
+
+class TimelineTestCase(test.TestCase):
+
+    def test_get_throughput_timeline(self):
+        raw_data = [
+            {"timestamp": 10.0, "error": []},
+            {"timestamp": 10.5, "error": ["Exception"]},
+            {"timestamp": 12.2, "error": []},
+            {"duration": 1, "error": []}
+        ]
+        self.assertEqual([(0, 2, 1), (1, 0, 0), (2, 1, 0)],
+                         utils.get_throughput_timeline(raw_data))
+
+    def test_get_throughput_timeline_no_timestamps(self):
+        self.assertEqual([], utils.get_throughput_timeline(
+            [{"duration": 1, "error": []}]))
+
+    def test_get_concurrency_timeline(self):
+        raw_data = [
+            {"timestamp": 10.0, "duration": 2.5, "idle_duration": 0.0},
+            {"timestamp": 10.5, "duration": 0.2, "idle_duration": 0.1},
+            {"timestamp": 11.0, "duration": 0.5, "idle_duration": 0.0},
+            {"timestamp": 14.0, "duration": 0.5, "idle_duration": 0.0}
+        ]
+        self.assertEqual([(0, 2), (1, 2), (2, 1), (3, 0), (4, 1)],
+                         utils.get_concurrency_timeline(raw_data))
+
+    def test_get_concurrency_timeline_no_timestamps(self):
+        self.assertEqual([], utils.get_concurrency_timeline(
+            [{"duration": 1, "idle_duration": 0}]))
+
+
+class StepsDataTestCase(test.TestCase):
+
+    def test_get_steps_data(self):
+        raw_data = [
+            {"step": 1, "duration": 4.0, "error": []},
+            {"step": 0, "duration": 1.0, "error": []},
+            {"step": 0, "duration": 1.0, "error": []},
+            {"step": 1, "duration": 0.0, "error": ["Exception"]},
+            {"step": 2, "duration": 0.0, "error": ["Exception"]},
+            {"duration": 10.0, "error": []}
+        ]
+        self.assertEqual([(0, 2, 0.0, 1.0, 1.0, 1.0, 1.0),
+                          (1, 2, 50.0, 4.0, 4.0, 4.0, 4.0),
+                          (2, 1, 100.0, None, None, None, None)],
+                         utils.get_steps_data(raw_data))
+
+    def test_get_steps_data_no_steps(self):
+        self.assertEqual([], utils.get_steps_data(
+            [{"duration": 1.0, "error": []}]))
+
+    def test_get_step_loads(self):
+        self.assertEqual({0: 1, 1: 2}, utils.get_step_loads(
+            {"type": "stepped", "steps": [1, 2]}, {}))
+
+    def test_get_step_loads_from_runner_stats(self):
+        runner_stats = {"steps": [{"step": 0, "load": 1},
+                                  {"step": 1, "load": 8},
+                                  {"step": 2, "load": 4}]}
+        self.assertEqual({0: 1, 1: 8, 2: 4}, utils.get_step_loads(
+            {"type": "capacity", "max": 8}, runner_stats))
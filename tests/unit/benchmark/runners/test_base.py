@@ -13,6 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+import threading
+
 import jsonschema
 import mock
 
@@ -20,12 +23,18 @@ from rally.benchmark.runners import base
 from rally.benchmark.runners import serial
 from rally.benchmark.scenarios import base as scenario_base
 from rally import exceptions
+from rally import utils as rutils
 from tests.unit import fakes
 from tests.unit import test
 
 
 class ScenarioHelpersTestCase(test.TestCase):
 
+    def setUp(self):
+        super(ScenarioHelpersTestCase, self).setUp()
+        base._clear_clients_cache()
+        self.addCleanup(base._clear_clients_cache)
+
     @mock.patch("rally.benchmark.runners.base.utils.format_exc")
     def test_format_result_on_timeout(self, mock_format_exc):
         mock_exc = mock.MagicMock()
@@ -62,8 +71,44 @@ class ScenarioHelpersTestCase(test.TestCase):
 
         self.assertEqual(expected_context, base._get_scenario_context(context))
 
+    def test_get_scenario_context_with_user_index(self):
+        context = {"users": [mock.MagicMock(), mock.MagicMock()],
+                   "tenants": [mock.MagicMock()]}
+        expected_context = {"user": context["users"][1],
+                            "tenants": context["tenants"]}
+        self.assertEqual(expected_context,
+                         base._get_scenario_context(context, 1))
+
+    @mock.patch("rally.benchmark.runners.base.random.randrange")
+    def test_get_user_index(self, mock_randrange):
+        context = {"users": [mock.MagicMock(), mock.MagicMock()]}
+        self.assertEqual(mock_randrange.return_value,
+                         base._get_user_index(context))
+        mock_randrange.assert_called_once_with(2)
+
+    def test_get_user_index_without_users(self):
+        self.assertIsNone(base._get_user_index({}))
+        self.assertIsNone(base._get_user_index({"users": []}))
+
+    @mock.patch("rally.benchmark.runners.base._run_scenario_once")
+    def test_run_scenario_once_in_worker(self, mock_run_once):
+        self.addCleanup(base._WORKER_BENCHMARK.clear)
+        context = {"task": {"uuid": "uuid"},
+                   "users": [mock.MagicMock(), mock.MagicMock()]}
+        base._worker_init("cls", "method", context, {"a": 1})
+
+        result = base._run_scenario_once_in_worker((5, 1))
+
+        self.assertEqual(mock_run_once.return_value, result)
+        mock_run_once.assert_called_once_with(
+            (5, "cls", "method",
+             {"task": context["task"], "user": context["users"][1]},
+             {"a": 1}))
+
+    @mock.patch("rally.benchmark.runners.base._get_clients_cache_stats")
     @mock.patch("rally.benchmark.runners.base.osclients")
-    def test_run_scenario_once_internal_logic(self, mock_clients):
+    def test_run_scenario_once_internal_logic(self, mock_clients,
+                                              mock_cache_stats):
         mock_clients.Clients.return_value = "cl"
 
         context = base._get_scenario_context(fakes.FakeUserContext({}).context)
@@ -80,21 +125,137 @@ class ScenarioHelpersTestCase(test.TestCase):
         ]
         scenario_cls.assert_has_calls(expected_calls, any_order=True)
 
+    @mock.patch("rally.benchmark.runners.base.osclients")
+    def test_get_clients(self, mock_osclients):
+        endpoint = fakes.FakeUserContext.user["endpoint"]
+        clients = mock_osclients.Clients.return_value
+        clients.cache = {}
+
+        self.assertEqual((clients, False), base._get_clients(endpoint))
+        self.assertEqual((clients, False), base._get_clients(endpoint))
+        mock_osclients.Clients.assert_called_once_with(endpoint)
+
+        keystone = mock.MagicMock()
+        keystone.auth_ref.will_expire_soon.return_value = False
+        clients.cache["keystone"] = keystone
+        self.assertEqual((clients, True), base._get_clients(endpoint))
+        self.assertFalse(clients.clear.called)
+
+    @mock.patch("rally.benchmark.runners.base._clear_clients_cache")
+    def test_worker_init_clears_clients_cache(self, mock_clear):
+        self.addCleanup(base._WORKER_BENCHMARK.clear)
+        base._worker_init("cls", "method", {}, {})
+        mock_clear.assert_called_once_with()
+
+    @mock.patch("rally.benchmark.runners.base.osclients")
+    def test_get_clients_token_expires(self, mock_osclients):
+        endpoint = fakes.FakeUserContext.user["endpoint"]
+        clients = mock_osclients.Clients.return_value
+        keystone = mock.MagicMock()
+        keystone.auth_ref.will_expire_soon.return_value = True
+        clients.cache = {"keystone": keystone}
+
+        base._get_clients(endpoint)
+        self.assertEqual((clients, False), base._get_clients(endpoint))
+        clients.clear.assert_called_once_with()
+
+    def test_get_clients_cache_stats(self):
+        authenticated = mock.MagicMock(cache={"keystone": "kc"},
+                                       auth_duration=1.5,
+                                       token_cache_hit=None)
+        not_used = mock.MagicMock(cache={}, auth_duration=0.0)
+
+        stats = base._get_clients_cache_stats((authenticated, False),
+                                              (not_used, False),
+                                              (authenticated, True))
+        self.assertEqual({"hits": 1, "misses": 2, "authentications": 1,
+                          "auth_duration": 1.5, "token_cache_hits": 0,
+                          "token_cache_misses": 0}, stats)
+
+    def test_get_http_calls_stats(self):
+        calls = [
+            {"method": "GET", "url": "/s/{id}", "status": 200,
+             "duration": 0.25},
+            {"method": "POST", "url": "/s", "status": 202, "duration": 1.0},
+            {"method": "GET", "url": "/s/{id}", "status": 404,
+             "duration": 0.125},
+            {"method": "GET", "url": "/s/{id}", "status": None,
+             "duration": 0.5}]
+        self.assertEqual(
+            {"GET /s/{id}": {"count": 3, "duration": 0.875, "min": 0.125,
+                             "max": 0.5, "errors": 2},
+             "POST /s": {"count": 1, "duration": 1.0, "min": 1.0,
+                         "max": 1.0, "errors": 0}},
+            base._get_http_calls_stats(calls))
+
+    @mock.patch("rally.benchmark.runners.base.rutils")
+    def test_run_scenario_once_with_http_calls(self, mock_rutils):
+        base.CONF.set_override("trace_http_calls", True)
+        self.addCleanup(base.CONF.clear_override, "trace_http_calls")
+        mock_rutils.Timer = fakes.FakeTimer
+        mock_rutils.timestamp.return_value = 10.0
+        context = base._get_scenario_context(fakes.FakeUserContext({}).context)
+        args = (1, fakes.FakeScenario, "do_it", context, {})
+
+        with mock.patch("rally.benchmark.runners.base.osclients") as mock_os:
+            calls = [{"method": "GET", "url": "/", "status": 200,
+                      "duration": 0.5}]
+            mock_os.record_http_calls.return_value.__enter__.return_value = (
+                calls)
+            result = base._run_scenario_once(args)
+
+        mock_os.record_http_calls.assert_called_once_with(True)
+        self.assertEqual({"GET /": {"count": 1, "duration": 0.5, "min": 0.5,
+                                    "max": 0.5, "errors": 0}},
+                         result["http_calls"])
+        self.assertIsNotNone(base.ScenarioRunnerResult(
+            dict((k, v) for k, v in result.items()
+                 if k not in ("clients_cache", "http_pool"))))
+
+    @mock.patch("rally.benchmark.runners.base.osclients.get_http_pool")
+    def test_get_http_pool_stats(self, mock_get_http_pool):
+        mock_get_http_pool.return_value.stats.return_value = {
+            "http://a:5000": {"connections": 1, "requests": 10},
+            "http://a:8774": {"connections": 2, "requests": 5}}
+        self.assertEqual({"pid": os.getpid(), "connections": 3,
+                          "requests": 15}, base._get_http_pool_stats())
+
+    def test_get_clients_cache_stats_token_cache(self):
+        token_cache_hit = mock.MagicMock(cache={"keystone": "kc"},
+                                         auth_duration=0.1,
+                                         token_cache_hit=True)
+        token_cache_miss = mock.MagicMock(cache={"keystone": "kc"},
+                                          auth_duration=1.5,
+                                          token_cache_hit=False)
+
+        stats = base._get_clients_cache_stats((token_cache_hit, False),
+                                              (token_cache_miss, False))
+        self.assertEqual({"hits": 0, "misses": 2, "authentications": 1,
+                          "auth_duration": 1.5, "token_cache_hits": 1,
+                          "token_cache_misses": 1}, stats)
+
     @mock.patch("rally.benchmark.runners.base.rutils")
     @mock.patch("rally.benchmark.runners.base.osclients")
     def test_run_scenario_once_without_scenario_output(self, mock_clients,
                                                        mock_rutils):
         mock_rutils.Timer = fakes.FakeTimer
+        mock_rutils.timestamp.return_value = 10.0
         context = base._get_scenario_context(fakes.FakeUserContext({}).context)
         args = (1, fakes.FakeScenario, "do_it", context, {})
         result = base._run_scenario_once(args)
 
         expected_result = {
             "duration": fakes.FakeTimer().duration(),
+            "timestamp": 10.0,
             "idle_duration": 0,
             "error": [],
             "scenario_output": {"errors": "", "data": {}},
-            "atomic_actions": {}
+            "atomic_actions": {},
+            "clients_cache": {"hits": 0, "misses": 2, "authentications": 0,
+                              "auth_duration": 0.0, "token_cache_hits": 0,
+                              "token_cache_misses": 0},
+            "http_pool": {"pid": os.getpid(), "connections": 0,
+                          "requests": 0}
         }
         self.assertEqual(expected_result, result)
 
@@ -103,16 +264,23 @@ class ScenarioHelpersTestCase(test.TestCase):
     def test_run_scenario_once_with_scenario_output(self, mock_clients,
                                                     mock_rutils):
         mock_rutils.Timer = fakes.FakeTimer
+        mock_rutils.timestamp.return_value = 10.0
         context = base._get_scenario_context(fakes.FakeUserContext({}).context)
         args = (1, fakes.FakeScenario, "with_output", context, {})
         result = base._run_scenario_once(args)
 
         expected_result = {
             "duration": fakes.FakeTimer().duration(),
+            "timestamp": 10.0,
             "idle_duration": 0,
             "error": [],
             "scenario_output": fakes.FakeScenario().with_output(),
-            "atomic_actions": {}
+            "atomic_actions": {},
+            "clients_cache": {"hits": 0, "misses": 2, "authentications": 0,
+                              "auth_duration": 0.0, "token_cache_hits": 0,
+                              "token_cache_misses": 0},
+            "http_pool": {"pid": os.getpid(), "connections": 0,
+                          "requests": 0}
         }
         self.assertEqual(expected_result, result)
 
@@ -120,21 +288,58 @@ class ScenarioHelpersTestCase(test.TestCase):
     @mock.patch("rally.benchmark.runners.base.osclients")
     def test_run_scenario_once_exception(self, mock_clients, mock_rutils):
         mock_rutils.Timer = fakes.FakeTimer
+        mock_rutils.timestamp.return_value = 10.0
         context = base._get_scenario_context(fakes.FakeUserContext({}).context)
         args = (1, fakes.FakeScenario, "something_went_wrong", context, {})
         result = base._run_scenario_once(args)
         expected_error = result.pop("error")
         expected_result = {
             "duration": fakes.FakeTimer().duration(),
+            "timestamp": 10.0,
             "idle_duration": 0,
             "scenario_output": {"errors": "", "data": {}},
-            "atomic_actions": {}
+            "atomic_actions": {},
+            "clients_cache": {"hits": 0, "misses": 2, "authentications": 0,
+                              "auth_duration": 0.0, "token_cache_hits": 0,
+                              "token_cache_misses": 0},
+            "http_pool": {"pid": os.getpid(), "connections": 0,
+                          "requests": 0}
         }
         self.assertEqual(expected_result, result)
         self.assertEqual(expected_error[:2],
                          [str(Exception), "Something went wrong"])
 
 
+class ResultQueueTestCase(test.TestCase):
+
+    def test_append_and_get_batch(self):
+        queue = base.ResultQueue()
+        for i in range(5):
+            queue.append(i)
+
+        self.assertEqual(5, len(queue))
+        self.assertEqual([0, 1, 2], queue.get_batch(3))
+        self.assertEqual([3, 4], queue.get_batch(3))
+        self.assertEqual([], queue.get_batch(3))
+
+    def test_get_batch_timeout(self):
+        queue = base.ResultQueue()
+        self.assertEqual([], queue.get_batch(1, timeout=0.01))
+
+    def test_append_blocks_when_full(self):
+        queue = base.ResultQueue(maxsize=2)
+        queue.append(1)
+        queue.append(2)
+        producer = threading.Thread(target=queue.append, args=(3,))
+        producer.start()
+        producer.join(0.05)
+        self.assertTrue(producer.isAlive())
+
+        self.assertEqual([1], queue.get_batch(1))
+        producer.join()
+        self.assertEqual([2, 3], list(queue))
+
+
 class ScenarioRunnerResultTestCase(test.TestCase):
 
     def test_validate(self):
@@ -169,6 +374,72 @@ class ScenarioRunnerResultTestCase(test.TestCase):
         self.assertRaises(jsonschema.ValidationError,
                           base.ScenarioRunnerResult, config)
 
+    def test_validate_strict(self):
+        base.CONF.set_override("strict_results_validation", True,
+                               "benchmark")
+        self.addCleanup(base.CONF.clear_override,
+                        "strict_results_validation", "benchmark")
+        result = {"duration": 1.0, "error": [],
+                  "atomic_actions": {"a": None}}
+        self.assertEqual(result, base.ScenarioRunnerResult(result))
+        self.assertRaises(jsonschema.ValidationError,
+                          base.ScenarioRunnerResult, {"a": 10})
+
+    def test__check_matches_schema(self):
+        valid = {"duration": 1, "idle_duration": 0.5, "error": ["e"],
+                 "scenario_output": {"data": {"a": 1}, "errors": ""},
+                 "atomic_actions": {"a": 1.0, "b": None},
+                 "intended_start": 1.0, "actual_start": 2.0,
+                 "after_deadline": False,
+                 "http_calls": {"GET /v2/servers": {"count": 2,
+                                                    "duration": 0.5}}}
+        invalid = [
+            [],
+            {"http_calls": []},
+            {"http_calls": {"GET /": 1}},
+            {"http_calls": {"GET /": {"count": "1"}}},
+            {"duration": "1"},
+            {"duration": True},
+            {"idle_duration": None},
+            {"error": "e"},
+            {"error": [1]},
+            {"atomic_actions": []},
+            {"atomic_actions": {"a": "1"}},
+            {"scenario_output": []},
+            {"scenario_output": {"data": []}},
+            {"scenario_output": {"data": {"a": "1"}}},
+            {"scenario_output": {"errors": 1}},
+            {"scenario_output": {"other": 1}},
+            {"actual_start": "1"},
+            {"after_deadline": 1},
+            {"unknown": 1},
+        ]
+        base.ScenarioRunnerResult._check(valid)
+        base.ScenarioRunnerResult.RESULT_VALIDATOR.validate(valid)
+        for result in invalid:
+            self.assertRaises(jsonschema.ValidationError,
+                              base.ScenarioRunnerResult._check, result)
+            self.assertRaises(
+                jsonschema.ValidationError,
+                base.ScenarioRunnerResult.RESULT_VALIDATOR.validate, result)
+
+    def test__compile_schema_check(self):
+        check = base._compile_schema_check(
+            {"type": ["integer", "null"],
+             "$schema": rutils.JSON_SCHEMA})
+        check(1)
+        check(None)
+        for value in (1.5, True, "1", [], {}):
+            self.assertRaises(jsonschema.ValidationError, check, value)
+
+    def test__compile_schema_check_unsupported(self):
+        for schema in ({"type": "integer", "minimum": 1},
+                       {"type": "object", "additionalProperties": {}},
+                       {"type": "object",
+                        "patternProperties": {"^a": {"type": "integer"}}}):
+            self.assertRaises(ValueError, base._compile_schema_check,
+                              schema)
+
 
 class ScenarioRunnerTestCase(test.TestCase):
 
@@ -237,6 +508,11 @@ class ScenarioRunnerTestCase(test.TestCase):
 
         self.assertEqual(result, mock_duration.return_value)
         self.assertEqual(list(runner.result_queue), [])
+        self.assertEqual(dict(runner.clients_cache_stats,
+                              auth_time_saved=0.0),
+                         runner.stats["clients_cache"])
+        self.assertEqual({"connections": 0, "requests": 0, "processes": 0},
+                         runner.stats["http_pool"])
 
         cls_name, method_name = scenario_name.split(".", 1)
         cls = scenario_base.Scenario.get_by_name(cls_name)
@@ -245,6 +521,43 @@ class ScenarioRunnerTestCase(test.TestCase):
         runner._run_scenario.assert_called_once_with(
             cls, method_name, context_obj, expected_config_kwargs)
 
+    def test_send_result_http_pool_stats(self):
+        runner = serial.SerialScenarioRunner(mock.MagicMock(), {})
+        result = {"duration": 1.0, "idle_duration": 0.0, "error": [],
+                  "scenario_output": {"errors": "", "data": {}},
+                  "atomic_actions": {}}
+        for pid, connections, requests in ((1, 2, 10), (2, 1, 1),
+                                           (1, 1, 5), (1, 3, 20)):
+            stats = {"pid": pid, "connections": connections,
+                     "requests": requests}
+            runner._send_result(dict(result, http_pool=stats))
+
+        self.assertEqual([result] * 4, list(runner.result_queue))
+        self.assertEqual({"connections": 4, "requests": 21, "processes": 2},
+                         runner.get_http_pool_totals())
+
+    def test_send_result_clients_cache_stats(self):
+        runner = serial.SerialScenarioRunner(mock.MagicMock(), {})
+        result = {"duration": 1.0, "idle_duration": 0.0, "error": [],
+                  "scenario_output": {"errors": "", "data": {}},
+                  "atomic_actions": {}}
+        for hits, auth_duration in ((0, 2.0), (2, 0.0), (1, 1.0)):
+            stats = {"hits": hits, "misses": 2 - hits,
+                     "authentications": 2 - hits,
+                     "auth_duration": auth_duration}
+            runner._send_result(dict(result, clients_cache=stats))
+
+        self.assertEqual([result] * 3, list(runner.result_queue))
+        self.assertEqual({"hits": 3, "misses": 3, "authentications": 3,
+                          "auth_duration": 3.0, "token_cache_hits": 0,
+                          "token_cache_misses": 0},
+                         runner.clients_cache_stats)
+        self.assertEqual(3.0, runner.get_auth_time_saved())
+
+    def test_get_auth_time_saved_no_authentications(self):
+        runner = serial.SerialScenarioRunner(mock.MagicMock(), {})
+        self.assertEqual(0.0, runner.get_auth_time_saved())
+
     def test_runner_send_result_exception(self):
         runner = serial.SerialScenarioRunner(
             mock.MagicMock(),
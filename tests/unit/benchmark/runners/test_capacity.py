@@ -0,0 +1,187 @@
+# Copyright 2014: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import jsonschema
+import mock
+
+from rally.benchmark.runners import base
+from rally.benchmark.runners import capacity
+from rally import consts
+from tests.unit import fakes
+from tests.unit import test
+
+
+class CapacityScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(CapacityScenarioRunnerTestCase, self).setUp()
+        self.config = {"type": consts.RunnerType.CAPACITY,
+                       "min": 1, "max": 8, "times_per_step": 2,
+                       "sla": {"max_failure_percent": 0}, "timeout": 2}
+        self.context = fakes.FakeUserContext({"task":
+                                             {"uuid": "uuid"}}).context
+        self.args = {"a": 1}
+
+    def _get_runner(self, capacity_load):
+        """Return runner whose probes pass up to the capacity_load."""
+        runner = capacity.CapacityScenarioRunner(None, self.config)
+        runner.probed = []
+
+        def probe(step, load, cls, method_name, context, args):
+            runner.probed.append(load)
+            step_stats = {"step": step, "load": load,
+                          "iterations": self.config.get("times_per_step", 2),
+                          "success": load <= capacity_load}
+            runner.stats.setdefault("steps", []).append(step_stats)
+            return step_stats
+
+        runner._probe = probe
+        return runner
+
+    def test_validate(self):
+        capacity.CapacityScenarioRunner.validate(self.config)
+
+    def test_validate_rps(self):
+        self.config.update({"load": "rps", "min": 0.5, "max": 2.5})
+        capacity.CapacityScenarioRunner.validate(self.config)
+
+    def test_validate_fractional_concurrency(self):
+        self.config["max"] = 2.5
+        self.assertRaises(jsonschema.ValidationError,
+                          capacity.CapacityScenarioRunner.validate,
+                          self.config)
+
+    def test_validate_no_sla(self):
+        del self.config["sla"]
+        self.assertRaises(jsonschema.ValidationError,
+                          capacity.CapacityScenarioRunner.validate,
+                          self.config)
+
+    def test_validate_wrong_sla(self):
+        self.config["sla"] = {"wrong_criterion": 1}
+        self.assertRaises(jsonschema.ValidationError,
+                          capacity.CapacityScenarioRunner.validate,
+                          self.config)
+
+    def test_validate_wrong_sla_value(self):
+        self.config["sla"] = {"max_failure_percent": "0"}
+        self.assertRaises(jsonschema.ValidationError,
+                          capacity.CapacityScenarioRunner.validate,
+                          self.config)
+
+    def test__next_load(self):
+        runner = capacity.CapacityScenarioRunner(None, self.config)
+        self.assertEqual(4, runner._next_load(1, 8))
+        self.assertEqual(3, runner._next_load(2, 4))
+        self.assertIsNone(runner._next_load(4, 5))
+        self.assertIsNone(runner._next_load(None, 5))
+        self.assertIsNone(runner._next_load(8, None))
+
+    def test__next_load_rps(self):
+        self.config.update({"load": "rps", "precision": 0.5})
+        runner = capacity.CapacityScenarioRunner(None, self.config)
+        self.assertEqual(4.5, runner._next_load(1, 8))
+        self.assertAlmostEqual(1.3, runner._next_load(1, 1.6))
+        self.assertIsNone(runner._next_load(1, 1.5))
+
+    def test__expected_iterations(self):
+        runner = capacity.CapacityScenarioRunner(None, self.config)
+        self.assertEqual(2, runner._expected_iterations(5))
+
+        del self.config["times_per_step"]
+        self.config.update({"duration_per_step": 10})
+        self.assertEqual(5, runner._expected_iterations(5))
+        runner._iterations_duration = 8.0
+        runner._iterations_num = 2
+        self.assertEqual(13, runner._expected_iterations(5))
+        runner._iterations_duration = 60.0
+        self.assertEqual(5, runner._expected_iterations(5))
+
+        self.config["load"] = "rps"
+        self.assertEqual(25, runner._expected_iterations(2.5))
+
+    def test_run_scenario_bisect(self):
+        runner = self._get_runner(5)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        self.assertEqual([1, 8, 4, 6, 5], runner.probed)
+        self.assertEqual(5, runner.stats["capacity"])
+
+    def test_run_scenario_max_passed(self):
+        runner = self._get_runner(8)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        self.assertEqual([1, 8], runner.probed)
+        self.assertEqual(8, runner.stats["capacity"])
+
+    def test_run_scenario_min_failed(self):
+        runner = self._get_runner(0)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        self.assertEqual([1], runner.probed)
+        self.assertIsNone(runner.stats["capacity"])
+
+    def test_run_scenario_budget(self):
+        self.config["max_iterations"] = 7
+        runner = self._get_runner(5)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        self.assertEqual([1, 8, 4], runner.probed)
+        self.assertEqual(4, runner.stats["capacity"])
+
+    def test__probe(self):
+        runner = capacity.CapacityScenarioRunner(None, self.config)
+
+        step_stats = runner._probe(0, 2, fakes.FakeScenario, "do_it",
+                                   self.context, self.args)
+
+        self.assertTrue(step_stats["success"])
+        self.assertEqual(2, step_stats["iterations"])
+        self.assertEqual([{"criterion": "max_failure_percent",
+                           "success": True, "detail": mock.ANY}],
+                         step_stats["sla"])
+        self.assertEqual([], runner._step_results)
+        self.assertEqual(2, runner._iterations_num)
+
+    def test__probe_failed(self):
+        runner = capacity.CapacityScenarioRunner(None, self.config)
+
+        step_stats = runner._probe(0, 2, fakes.FakeScenario,
+                                   "something_went_wrong", self.context,
+                                   self.args)
+
+        self.assertFalse(step_stats["success"])
+
+    def test_run_scenario(self):
+        self.config["max"] = 2
+        runner = capacity.CapacityScenarioRunner(None, self.config)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        self.assertEqual(2, runner.stats["capacity"])
+        self.assertEqual([1, 2], [s["load"] for s in runner.stats["steps"]])
+        self.assertEqual([0, 0, 1, 1],
+                         [r["step"] for r in runner.result_queue])
+        for result in runner.result_queue:
+            self.assertIsNotNone(base.ScenarioRunnerResult(result))
@@ -13,15 +13,103 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+import time
+
 import jsonschema
 
 from rally.benchmark.runners import base
 from rally.benchmark.runners import constant
 from rally import consts
+from rally import utils as rutils
 from tests.unit import fakes
 from tests.unit import test
 
 
+class FakeHangingScenario(fakes.FakeScenario):
+
+    def hang(self, **kwargs):
+        time.sleep(10)
+
+    def die(self, **kwargs):
+        os._exit(3)
+
+
+class IterationPoolTestCase(test.TestCase):
+
+    def setUp(self):
+        super(IterationPoolTestCase, self).setUp()
+        self.context = fakes.FakeUserContext({"task":
+                                             {"uuid": "uuid"}}).context
+
+    def _get_results(self, pool, count):
+        results = []
+        while len(results) < count:
+            results.extend(pool.get_results())
+        return results
+
+    def test_run(self):
+        pool = constant._IterationPool(2, 10, fakes.FakeScenario, "do_it",
+                                       self.context, {})
+        try:
+            self.assertEqual(2, pool.idle)
+            pool.submit((0, 0))
+            pool.submit((1, 0))
+            self.assertEqual((0, 2), (pool.idle, pool.busy))
+
+            results = self._get_results(pool, 2)
+
+            self.assertEqual((2, 0), (pool.idle, pool.busy))
+            for result in results:
+                self.assertEqual([], result["error"])
+            self.assertEqual([0, 1],
+                             sorted(result["iteration"] for result in results))
+        finally:
+            pool.close()
+
+    def test_timeout(self):
+        pool = constant._IterationPool(1, 0.1, FakeHangingScenario, "hang",
+                                       self.context, {})
+        try:
+            worker = pool._processes.values()[0]
+            pool.submit((0, 0))
+            with rutils.Timer() as timer:
+                results = self._get_results(pool, 1)
+
+            self.assertTrue(timer.duration() < 5)
+            self.assertIn("TimeoutException", results[0]["error"][0])
+            self.assertEqual(0.1, results[0]["duration"])
+            self.assertIn("timestamp", results[0])
+            self.assertEqual(0, results[0]["iteration"])
+            self.assertIsNotNone(base.ScenarioRunnerResult(results[0]))
+
+            # NOTE: the stuck worker is replaced, so the slot is free
+            self.assertFalse(worker.is_alive())
+            self.assertEqual((1, 0), (pool.idle, pool.busy))
+            self.assertNotIn(worker, pool._processes.values())
+        finally:
+            pool.close()
+
+    def test_worker_died(self):
+        pool = constant._IterationPool(1, 10, FakeHangingScenario, "die",
+                                       self.context, {})
+        try:
+            worker = pool._processes.values()[0]
+            pool.submit((5, 0))
+            results = self._get_results(pool, 1)
+
+            self.assertIn("IterationWorkerDied", results[0]["error"][0])
+            self.assertIn("exit code 3", results[0]["error"][1])
+            self.assertNotIn("TimeoutException", results[0]["error"][0])
+            self.assertEqual(5, results[0]["iteration"])
+            self.assertIsNotNone(base.ScenarioRunnerResult(results[0]))
+
+            self.assertFalse(worker.is_alive())
+            self.assertEqual((1, 0), (pool.idle, pool.busy))
+        finally:
+            pool.close()
+
+
 class ConstantScenarioRunnerTestCase(test.TestCase):
 
     def setUp(self):
@@ -45,6 +133,14 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                           constant.ConstantScenarioRunner.validate,
                           self.config)
 
+    def test__iter_scenario_args(self):
+        users_num = len(self.context["users"])
+        args = list(constant.ConstantScenarioRunner._iter_scenario_args(
+            self.context, 3))
+        self.assertEqual([0, 1, 2], [i for i, user_index in args])
+        for i, user_index in args:
+            self.assertTrue(0 <= user_index < users_num)
+
     def test_run_scenario_constantly_for_times(self):
         runner = constant.ConstantScenarioRunner(
                         None, self.config)
@@ -77,6 +173,21 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
             self.assertIsNotNone(base.ScenarioRunnerResult(result))
         self.assertIn('error', runner.result_queue[0])
 
+    def test_run_scenario_constantly_for_times_hang(self):
+        self.config.update({"times": 3, "timeout": 1})
+        runner = constant.ConstantScenarioRunner(None, self.config)
+
+        with rutils.Timer() as timer:
+            runner._run_scenario(FakeHangingScenario, "hang", self.context,
+                                 self.args)
+
+        # NOTE: stuck iterations are cancelled, so the third one is
+        # started right after the first two time out
+        self.assertTrue(timer.duration() < 5)
+        self.assertEqual(3, len(runner.result_queue))
+        for result in runner.result_queue:
+            self.assertIn("TimeoutException", result["error"][0])
+
 
 class ConstantForDurationScenarioRunnerTeestCase(test.TestCase):
 
@@ -107,8 +218,9 @@ class ConstantForDurationScenarioRunnerTeestCase(test.TestCase):
 
         runner._run_scenario(fakes.FakeScenario, "do_it",
                              self.context, self.args)
-        # NOTE(mmorais): when duration is 0, scenario executes exactly 1 time
-        expected_times = 1
+        # NOTE: when duration is 0, scenario executes exactly once in each
+        # of the concurrent workers
+        expected_times = self.config["concurrency"]
         self.assertEqual(len(runner.result_queue), expected_times)
         for result in runner.result_queue:
             self.assertIsNotNone(base.ScenarioRunnerResult(result))
@@ -119,21 +231,70 @@ class ConstantForDurationScenarioRunnerTeestCase(test.TestCase):
 
         runner._run_scenario(fakes.FakeScenario,
                              "something_went_wrong", self.context, self.args)
-        # NOTE(mmorais): when duration is 0, scenario executes exactly 1 time
-        expected_times = 1
+        # NOTE: when duration is 0, scenario executes exactly once in each
+        # of the concurrent workers
+        expected_times = self.config["concurrency"]
         self.assertEqual(len(runner.result_queue), expected_times)
         for result in runner.result_queue:
             self.assertIsNotNone(base.ScenarioRunnerResult(result))
         self.assertIn('error', runner.result_queue[0])
 
+    def test_run_scenario_constantly_for_duration_stats(self):
+        runner = constant.ConstantForDurationScenarioRunner(None,
+                                                            self.config)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        # NOTE: with duration 0 every iteration ends after the deadline
+        self.assertEqual({"iterations_in_window": 0,
+                          "iterations_after_deadline": 2,
+                          "throughput": None}, runner.stats)
+        for result in runner.result_queue:
+            self.assertTrue(result["after_deadline"])
+
+    def test_run_scenario_constantly_for_duration_in_window(self):
+        self.config["duration"] = 0.5
+        runner = constant.ConstantForDurationScenarioRunner(None,
+                                                            self.config)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        in_window = runner.stats["iterations_in_window"]
+        self.assertTrue(in_window > 0)
+        self.assertEqual(len(runner.result_queue),
+                         in_window + runner.stats["iterations_after_deadline"])
+        self.assertEqual(in_window, len([r for r in runner.result_queue
+                                         if "after_deadline" not in r]))
+        self.assertEqual(in_window / 0.5, runner.stats["throughput"])
+
+    def test_run_scenario_constantly_for_duration_grace_timeout(self):
+        self.config["grace_timeout"] = 0.1
+        runner = constant.ConstantForDurationScenarioRunner(None,
+                                                            self.config)
+
+        with rutils.Timer() as timer:
+            runner._run_scenario(FakeHangingScenario, "hang", self.context,
+                                 self.args)
+
+        self.assertTrue(timer.duration() < 5)
+        self.assertEqual(2, len(runner.result_queue))
+        for result in runner.result_queue:
+            self.assertIsNotNone(base.ScenarioRunnerResult(result))
+            self.assertTrue(result["after_deadline"])
+            self.assertIn("TimeoutException", result["error"][0])
+            self.assertTrue(result["duration"] < 5)
+
     def test_run_scenario_constantly_for_duration_timeout(self):
         runner = constant.ConstantForDurationScenarioRunner(
             None, self.config)
 
         runner._run_scenario(fakes.FakeScenario,
                              "raise_timeout", self.context, self.args)
-        # NOTE(mmorais): when duration is 0, scenario executes exactly 1 time
-        expected_times = 1
+        # NOTE: when duration is 0, scenario executes exactly once in each
+        # of the concurrent workers
+        expected_times = self.config["concurrency"]
         self.assertEqual(len(runner.result_queue), expected_times)
         for result in runner.result_queue:
             self.assertIsNotNone(base.ScenarioRunnerResult(result))
@@ -0,0 +1,166 @@
+# Copyright 2014: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import multiprocessing
+import shutil
+import tempfile
+
+import eventlet
+import jsonschema
+import mock
+from oslo.config import cfg
+
+from rally.benchmark.runners import base
+from rally.benchmark.runners import constant_async
+from rally import consts
+from rally.objects import endpoint
+from rally import osclients
+from tests.unit import fakes
+from tests.unit import test
+
+
+class FakeGreenScenario(fakes.FakeScenario):
+
+    def green_sleep(self, **kwargs):
+        eventlet.sleep(10)
+
+    def lock_cached_token(self, **kwargs):
+        token_cache = osclients.get_token_cache()
+        with token_cache.lock(endpoint.Endpoint("http://auth_url", "user",
+                                                "pass", "tenant")):
+            eventlet.sleep(0.1)
+
+
+class ConstantAsyncScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ConstantAsyncScenarioRunnerTestCase, self).setUp()
+        self.config = {"times": 4, "concurrency": 2, "timeout": 2,
+                       "processes": 2,
+                       "type": consts.RunnerType.CONSTANT_ASYNC}
+        self.context = fakes.FakeUserContext({"task":
+                                             {"uuid": "uuid"}}).context
+        self.args = {"a": 1}
+
+    def test_validate(self):
+        constant_async.ConstantAsyncScenarioRunner.validate(self.config)
+
+    def test_validate_failed(self):
+        self.config["processes"] = 0
+        self.assertRaises(jsonschema.ValidationError,
+                          constant_async.ConstantAsyncScenarioRunner.validate,
+                          self.config)
+
+    @mock.patch("rally.benchmark.runners.constant_async.eventlet."
+                "monkey_patch")
+    def test__worker_process(self, mock_monkey_patch):
+        queue = mock.MagicMock()
+
+        constant_async._worker_process(queue, [1, 3, 5], 2, 600,
+                                       self.context, fakes.FakeScenario,
+                                       "do_it", {})
+
+        mock_monkey_patch.assert_called_once_with(socket=True, select=True,
+                                                  time=True, thread=True)
+        self.assertEqual(3, queue.put.call_count)
+        for call in queue.put.mock_calls:
+            self.assertEqual([], call[1][0]["error"])
+
+    @mock.patch("rally.benchmark.runners.constant_async.eventlet."
+                "monkey_patch")
+    def test__worker_process_timeout(self, mock_monkey_patch):
+        queue = mock.MagicMock()
+
+        constant_async._worker_process(queue, [0, 1], 2, 0.01,
+                                       self.context, FakeGreenScenario,
+                                       "green_sleep", {})
+
+        self.assertEqual(2, queue.put.call_count)
+        for call in queue.put.mock_calls:
+            result = call[1][0]
+            self.assertIn("TimeoutException", result["error"][0])
+            self.assertTrue(result["duration"] < 10)
+
+    def test__worker_process_with_token_cache(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        for name, value in (("keystone_token_cache", True),
+                            ("keystone_token_cache_path", path)):
+            cfg.CONF.set_override(name, value)
+            self.addCleanup(cfg.CONF.clear_override, name)
+        queue = multiprocessing.Queue()
+        # NOTE: The worker monkey patches the process, so it's run in a
+        #       separate one, which is killed if green threads deadlock
+        process = multiprocessing.Process(
+            target=constant_async._worker_process,
+            args=(queue, range(4), 4, 5, self.context, FakeGreenScenario,
+                  "lock_cached_token", {}))
+        process.start()
+        try:
+            results = [queue.get(timeout=30) for i in range(4)]
+        finally:
+            process.terminate()
+            process.join()
+
+        for result in results:
+            self.assertEqual([], result["error"])
+
+    def test_run_scenario(self):
+        runner = constant_async.ConstantAsyncScenarioRunner(None,
+                                                            self.config)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        self.assertEqual(self.config["times"], len(runner.result_queue))
+        for result in runner.result_queue:
+            self.assertIsNotNone(base.ScenarioRunnerResult(result))
+
+    def test_run_scenario_exception(self):
+        runner = constant_async.ConstantAsyncScenarioRunner(None,
+                                                            self.config)
+
+        runner._run_scenario(fakes.FakeScenario, "something_went_wrong",
+                             self.context, self.args)
+
+        self.assertEqual(self.config["times"], len(runner.result_queue))
+        for result in runner.result_queue:
+            self.assertIsNotNone(base.ScenarioRunnerResult(result))
+            self.assertTrue(result["error"])
+
+    @mock.patch("rally.benchmark.runners.constant_async.multiprocessing")
+    def test_run_scenario_workers(self, mock_multiprocessing):
+        mock_multiprocessing.Queue.return_value.get.side_effect = (
+            constant_async.Queue.Empty)
+        mock_multiprocessing.Process.return_value.is_alive.return_value = (
+            False)
+        self.config.update({"times": 5, "concurrency": 3, "processes": 4})
+        runner = constant_async.ConstantAsyncScenarioRunner(None,
+                                                            self.config)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        queue = mock_multiprocessing.Queue.return_value
+        workers_args = [
+            (list(call[2]["args"][1]), call[2]["args"][2])
+            for call in mock_multiprocessing.Process.mock_calls
+            if call[0] == ""]
+        self.assertEqual([([0, 3], 1), ([1, 4], 1), ([2], 1)],
+                         workers_args)
+        for call in mock_multiprocessing.Process.mock_calls:
+            if call[0] == "":
+                self.assertEqual(queue, call[2]["args"][0])
+        self.assertEqual(0, len(runner.result_queue))
@@ -0,0 +1,259 @@
+# Copyright 2014: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import multiprocessing
+import threading
+
+import jsonschema
+import mock
+
+from rally.benchmark.runners import base
+from rally.benchmark.runners import distributed
+from rally import consts
+from rally import exceptions
+from rally.openstack.common.fixture import config
+from rally.openstack.common import timeutils
+from tests.unit import fakes
+from tests.unit import test
+
+
+class DistributedScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(DistributedScenarioRunnerTestCase, self).setUp()
+        self.useFixture(config.Config()).config(worker_authkey="secret",
+                                                group="benchmark")
+        self.config = {"type": consts.RunnerType.DISTRIBUTED,
+                       "runner": {"type": consts.RunnerType.CONSTANT,
+                                  "times": 5, "concurrency": 2,
+                                  "timeout": 10}}
+        self.context = fakes.FakeUserContext({"task":
+                                             {"uuid": "uuid"}}).context
+        self.args = {"a": 1}
+
+    def _start_agents(self, count):
+        """Start agents in local processes, return their hostnames."""
+        hostnames = []
+        for i in range(count):
+            agent = distributed.Agent("127.0.0.1", 0, "127.0.0.1")
+            # NOTE: agent processes are not daemonic, since runners
+            # start their own worker processes
+            process = multiprocessing.Process(target=agent.serve)
+            process.start()
+            agent.listener.close()
+            self.addCleanup(process.join)
+            self.addCleanup(process.terminate)
+            hostnames.append(agent.hostname)
+        return hostnames
+
+    def test_validate(self):
+        distributed.DistributedScenarioRunner.validate(self.config)
+
+    def test_validate_not_splittable_runner(self):
+        self.config["runner"] = {"type": consts.RunnerType.SERIAL}
+        self.assertRaises(jsonschema.ValidationError,
+                          distributed.DistributedScenarioRunner.validate,
+                          self.config)
+
+    def test_validate_wrong_runner_config(self):
+        self.config["runner"]["times"] = 0
+        self.assertRaises(jsonschema.ValidationError,
+                          distributed.DistributedScenarioRunner.validate,
+                          self.config)
+
+    def test__split_config_constant(self):
+        runner = distributed.DistributedScenarioRunner(None, self.config)
+        self.assertEqual(
+            [{"type": "constant", "times": 3, "concurrency": 1,
+              "timeout": 10},
+             {"type": "constant", "times": 2, "concurrency": 1,
+              "timeout": 10}],
+            runner._split_config(3))
+
+    def test__split_config_constant_for_duration(self):
+        self.config["runner"] = {"type": "constant_for_duration",
+                                 "duration": 10, "concurrency": 5}
+        runner = distributed.DistributedScenarioRunner(None, self.config)
+        self.assertEqual([3, 2], [c["concurrency"]
+                                  for c in runner._split_config(2)])
+        self.assertEqual([10, 10], [c["duration"]
+                                    for c in runner._split_config(2)])
+
+    def test__split_config_rps(self):
+        self.config["runner"] = {"type": "rps", "times": 10, "rps": 5}
+        runner = distributed.DistributedScenarioRunner(None, self.config)
+        self.assertEqual([{"type": "rps", "times": 4, "rps": 5 / 3.0},
+                          {"type": "rps", "times": 3, "rps": 5 / 3.0},
+                          {"type": "rps", "times": 3, "rps": 5 / 3.0}],
+                         runner._split_config(3))
+
+    @mock.patch("rally.benchmark.runners.distributed.db")
+    def test_get_alive_workers(self, mock_db):
+        now = datetime.datetime(2014, 1, 1, 12, 0, 0)
+        timeutils.set_time_override(now)
+        self.addCleanup(timeutils.clear_time_override)
+        workers = [
+            {"hostname": "a:1", "updated_at": now},
+            {"hostname": "b:1",
+             "updated_at": now - datetime.timedelta(seconds=61)}]
+        mock_db.worker_list.return_value = workers
+
+        self.assertEqual(workers[:1], distributed.get_alive_workers())
+
+    @mock.patch("rally.benchmark.runners.distributed.get_alive_workers")
+    def test_run_scenario_no_workers(self, mock_get_alive_workers):
+        mock_get_alive_workers.return_value = []
+        runner = distributed.DistributedScenarioRunner(None, self.config)
+        self.assertRaises(exceptions.NoAliveWorkers, runner._run_scenario,
+                          fakes.FakeScenario, "do_it", self.context,
+                          self.args)
+
+    @mock.patch("rally.benchmark.runners.distributed.select.select")
+    @mock.patch("rally.benchmark.runners.distributed.connect")
+    @mock.patch("rally.benchmark.runners.distributed.get_alive_workers")
+    def test_run_scenario_worker_lost(self, mock_get_alive_workers,
+                                      mock_connect, mock_select):
+        mock_get_alive_workers.return_value = [{"hostname": "a:1"}]
+        mock_select.side_effect = lambda r, w, x, timeout: (r, w, x)
+        conn = mock_connect.return_value
+        conn.recv.side_effect = [
+            ("results", [{"duration": 1.0, "idle_duration": 0.0,
+                          "error": []}]),
+            ("heartbeat", None),
+            EOFError()]
+        runner = distributed.DistributedScenarioRunner(None, self.config)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        mock_connect.assert_called_once_with("a:1")
+        error = runner.stats["workers"]["a:1"]["error"]
+        self.assertIn("WorkerLost", error[0])
+        self.assertIn("EOFError", error[1])
+        # NOTE: iterations that the worker owes are failed
+        results = list(runner.result_queue)
+        self.assertEqual(5, len(results))
+        self.assertEqual([], results[0]["error"])
+        for result in results[1:]:
+            self.assertEqual(error[:2], result["error"][:2])
+            self.assertIsNotNone(base.ScenarioRunnerResult(result))
+        conn.close.assert_called_once_with()
+
+    @mock.patch("rally.benchmark.runners.distributed.rutils")
+    @mock.patch("rally.benchmark.runners.distributed.select.select")
+    @mock.patch("rally.benchmark.runners.distributed.connect")
+    @mock.patch("rally.benchmark.runners.distributed.get_alive_workers")
+    def test_run_scenario_worker_timeout(self, mock_get_alive_workers,
+                                         mock_connect, mock_select,
+                                         mock_rutils):
+        mock_get_alive_workers.return_value = [{"hostname": "a:1"}]
+        mock_rutils.monotonic.side_effect = [0, 30, 61]
+        mock_rutils.timestamp.return_value = 10.0
+        mock_select.return_value = ([], [], [])
+        conn = mock_connect.return_value
+        runner = distributed.DistributedScenarioRunner(None, self.config)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        self.assertEqual(2, mock_select.call_count)
+        mock_select.assert_called_with([conn], [], [], 10)
+        self.assertIn("no messages for 60 seconds",
+                      runner.stats["workers"]["a:1"]["error"][1])
+        self.assertEqual(5, len(runner.result_queue))
+        conn.close.assert_called_once_with()
+
+    @mock.patch("rally.benchmark.runners.distributed.db")
+    @mock.patch("rally.benchmark.runners.distributed.get_alive_workers")
+    def test_run_scenario(self, mock_get_alive_workers, mock_db):
+        hostnames = self._start_agents(2)
+        mock_get_alive_workers.return_value = [{"hostname": hostname}
+                                               for hostname in hostnames]
+        runner = distributed.DistributedScenarioRunner(None, self.config)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        self.assertEqual(5, len(runner.result_queue))
+        for result in runner.result_queue:
+            self.assertIsNotNone(base.ScenarioRunnerResult(result))
+            self.assertEqual([], result["error"])
+        self.assertEqual(sorted(hostnames),
+                         sorted(runner.stats["workers"]))
+        for stats in runner.stats["workers"].values():
+            self.assertEqual({"runner_stats": {}}, stats)
+        # NOTE: each iteration takes admin and user clients
+        self.assertEqual(10, runner.clients_cache_stats["hits"] +
+                         runner.clients_cache_stats["misses"])
+        self.assertEqual(
+            set(hostnames),
+            set(key.rsplit(":", 1)[0] for key in runner.http_pool_stats))
+
+
+class AgentTestCase(test.TestCase):
+
+    def setUp(self):
+        super(AgentTestCase, self).setUp()
+        self.conf = self.useFixture(config.Config())
+        self.conf.config(worker_authkey="secret", group="benchmark")
+
+    def test_init(self):
+        agent = distributed.Agent("127.0.0.1", 0, "host")
+        self.addCleanup(agent.listener.close)
+        self.assertEqual("host:%d" % agent.listener.address[1],
+                         agent.hostname)
+
+    def test_init_defaults(self):
+        agent = distributed.Agent()
+        self.addCleanup(agent.listener.close)
+        self.assertEqual(("127.0.0.1", agent.listener.address[1]),
+                         agent.listener.address)
+        self.assertEqual("127.0.0.1:%d" % agent.listener.address[1],
+                         agent.hostname)
+
+    def test_init_insecure_authkey(self):
+        for authkey in (None, "", "rally"):
+            self.conf.config(worker_authkey=authkey, group="benchmark")
+            self.assertRaises(exceptions.InsecureWorkerAuthkey,
+                              distributed.Agent)
+
+    @mock.patch("rally.benchmark.runners.distributed.db")
+    def test_serve_and_stop(self, mock_db):
+        agent = distributed.Agent("127.0.0.1", 0, "host")
+        thread = threading.Thread(target=agent.serve)
+        thread.start()
+
+        agent.stop()
+        thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        mock_db.register_worker.assert_called_once_with(
+            {"hostname": agent.hostname})
+        mock_db.unregister_worker.assert_called_once_with(agent.hostname)
+
+    @mock.patch("rally.benchmark.runners.distributed.db")
+    def test__heartbeat(self, mock_db):
+        agent = distributed.Agent("127.0.0.1", 0, "host")
+        self.addCleanup(agent.listener.close)
+        agent._stop.wait = mock.MagicMock(side_effect=[False, False, True])
+        mock_db.update_worker.side_effect = [
+            None, exceptions.WorkerNotFound(worker=agent.hostname)]
+
+        agent._heartbeat()
+
+        self.assertEqual(2, mock_db.update_worker.call_count)
+        mock_db.register_worker.assert_called_once_with(
+            {"hostname": agent.hostname})
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import jsonschema
 import mock
 
@@ -43,6 +45,11 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         self.assertRaises(jsonschema.ValidationError,
                           rps.RPSScenarioRunner.validate, config)
 
+    def test_validate_zero_rps(self):
+        config = {"type": consts.RunnerType.RPS, "times": 1, "rps": 0}
+        self.assertRaises(jsonschema.ValidationError,
+                          rps.RPSScenarioRunner.validate, config)
+
     @mock.patch("rally.benchmark.runners.base.scenario_base")
     @mock.patch("rally.benchmark.runners.base.osclients")
     def test_get_rps_runner(self, mock_osclients, mock_base):
@@ -54,62 +61,224 @@ class RPSScenarioRunnerTestCase(test.TestCase):
                                                  consts.RunnerType.RPS})
         self.assertIsNotNone(runner)
 
-    @mock.patch("rally.benchmark.runners.rps.LOG")
-    @mock.patch("rally.benchmark.runners.rps.time")
-    @mock.patch("rally.benchmark.runners.rps.threading.Thread")
-    @mock.patch("rally.benchmark.runners.rps.multiprocessing.Queue")
-    def test__worker_process(self, mock_queue, mock_thread, mock_time,
-                             mock_log):
+    def _mock_clock(self, mock_time, now):
+        clock = [now]
+
+        def sleep(delay):
+            clock[0] += delay
 
-        def time_side():
-            time_side.last += 0.03
-            time_side.count += 1
-            return time_side.last
-        time_side.last = 0
-        time_side.count = 0
+        mock_time.time.side_effect = lambda: clock[0]
+        mock_time.sleep.side_effect = sleep
 
-        mock_time.time = time_side
+    @mock.patch("rally.benchmark.runners.rps.time")
+    @mock.patch("rally.benchmark.runners.rps.threading.Thread")
+    @mock.patch("rally.benchmark.runners.rps.base._get_scenario_context")
+    def test__worker_process(self, mock_get_context, mock_thread, mock_time):
+        self._mock_clock(mock_time, 100.0)
 
         mock_thread_instance = mock.MagicMock(
             isAlive=mock.MagicMock(return_value=False))
         mock_thread.return_value = mock_thread_instance
+        mock_queue = mock.MagicMock()
+        mock_stats_queue = mock.MagicMock()
+        aborted = threading.Event()
 
-        times = 4
-
-        rps._worker_process(10, times, mock_queue, None, 600, 1, 1,
-                            "Dummy", "dummy", ())
-
-        self.assertEqual(times, mock_log.debug.call_count)
-        self.assertEqual(times, mock_thread.call_count)
-
-        self.assertEqual(times, mock_thread_instance.start.call_count)
-        self.assertEqual(times, mock_thread_instance.join.call_count)
-        self.assertEqual(3, mock_time.sleep.call_count)
-        self.assertEqual(times, mock_thread_instance.isAlive.call_count)
-        self.assertEqual(15, mock_time.time.count)
+        rps._worker_process(2, [1, 3, 5], mock_queue, "context", 600,
+                            100.0, None, rps.OVERLOAD_QUEUE,
+                            mock_stats_queue, aborted, "Dummy", "dummy", ())
 
-        for i in range(1, times + 1):
+        self.assertEqual([mock.call(0.5), mock.call(1.0), mock.call(1.0)],
+                         mock_time.sleep.mock_calls)
+        # NOTE: 3 iterations and the sampler of in-flight iterations
+        self.assertEqual(4, mock_thread_instance.start.call_count)
+        self.assertIn(mock.call(target=rps._sample_in_flight,
+                                args=(mock.ANY, 100.0, mock.ANY, {})),
+                      mock_thread.mock_calls)
+        for i in (1, 3, 5):
             call = mock.call(args=(mock_queue,
                                    (i, "Dummy", "dummy",
-                                    None, ())),
+                                    mock_get_context.return_value, ()),
+                                   100.0 + i / 2.0, mock.ANY, mock.ANY),
                              target=rps._worker_thread)
             self.assertIn(call, mock_thread.mock_calls)
+        mock_get_context.assert_has_calls([mock.call("context")] * 3)
+        mock_stats_queue.put.assert_called_once_with(
+            {"in_flight": {}, "dropped": 0})
+
+    @mock.patch("rally.benchmark.runners.rps.time")
+    @mock.patch("rally.benchmark.runners.rps.threading.Thread")
+    def test__worker_process_behind_schedule(self, mock_thread, mock_time):
+        self._mock_clock(mock_time, 105.0)
+        mock_thread.return_value.isAlive.return_value = True
+        mock_stats_queue = mock.MagicMock()
+
+        rps._worker_process(1, [0, 1], mock.MagicMock(),
+                            fakes.FakeUserContext({}).context, 600, 100.0,
+                            None, rps.OVERLOAD_QUEUE, mock_stats_queue,
+                            threading.Event(), "Dummy", "dummy", ())
+
+        self.assertFalse(mock_time.sleep.called)
+        self.assertEqual(3, mock_thread.return_value.start.call_count)
+        mock_thread.return_value.join.assert_has_calls(
+            [mock.call(600), mock.call(600), mock.call()])
+        mock_stats_queue.put.assert_called_once_with(
+            {"in_flight": {}, "dropped": 0})
+
+    @mock.patch("rally.benchmark.runners.rps.time")
+    @mock.patch("rally.benchmark.runners.rps.threading.Thread")
+    def test__worker_process_timeout(self, mock_thread, mock_time):
+        self._mock_clock(mock_time, 100.0)
+        mock_thread.return_value.isAlive.return_value = True
+        mock_thread.return_value.join.side_effect = (
+            lambda timeout=0: mock_time.sleep(timeout))
+        mock_queue = mock.MagicMock()
+
+        rps._worker_process(1, [0], mock_queue,
+                            fakes.FakeUserContext({}).context, 5, 100.0,
+                            None, rps.OVERLOAD_QUEUE, mock.MagicMock(),
+                            threading.Event(), "Dummy", "dummy", ())
+
+        mock_thread.return_value.join.assert_any_call(5)
+        result = mock_queue.put.call_args[0][0]
+        self.assertEqual(5, result["duration"])
+        self.assertEqual("TimeoutException", result["error"][0])
+        self.assertEqual(100.0, result["intended_start"])
+        self.assertEqual(100.0, result["actual_start"])
+        self.assertIsNotNone(base.ScenarioRunnerResult(result))
+
+    @mock.patch("rally.benchmark.runners.rps.time.time", return_value=110.0)
+    def test__report_timeouts(self, mock_time):
+        finished = mock.MagicMock(isAlive=mock.MagicMock(return_value=False))
+        running = mock.MagicMock(isAlive=mock.MagicMock(return_value=True))
+        reported = threading.Lock()
+        pool = [(finished, threading.Lock(), 100.0, 100.0),
+                (running, reported, 100.0, 100.0),
+                (running, threading.Lock(), 108.0, 108.0)]
+        mock_queue = mock.MagicMock()
+
+        self.assertEqual([pool[2]],
+                         rps._report_timeouts(pool, mock_queue, 5))
+        self.assertEqual(1, mock_queue.put.call_count)
+        self.assertFalse(reported.acquire(False))
+
+    @mock.patch("rally.benchmark.runners.rps.base",
+                _run_scenario_once=mock.MagicMock(return_value={}))
+    def test__worker_thread_drops_reported_result(self, mock_base):
+        mock_queue = mock.MagicMock()
+        reported = threading.Lock()
+        reported.acquire()
+
+        rps._worker_thread(mock_queue, ("some_args",), 10.0,
+                           reported=reported)
+
+        self.assertFalse(mock_queue.put.called)
+
+    @mock.patch("rally.benchmark.runners.rps.time")
+    @mock.patch("rally.benchmark.runners.rps.threading.Thread")
+    def test__worker_process_overload_skip(self, mock_thread, mock_time):
+        mock_time.time.return_value = 100.0
+        mock_thread.return_value.isAlive.return_value = True
+        mock_stats_queue = mock.MagicMock()
+
+        rps._worker_process(1, [0, 1, 2], mock.MagicMock(),
+                            fakes.FakeUserContext({}).context, 600, 100.0,
+                            2, rps.OVERLOAD_SKIP, mock_stats_queue,
+                            threading.Event(), "Dummy", "dummy", ())
+
+        self.assertEqual(3, mock_thread.return_value.start.call_count)
+        mock_stats_queue.put.assert_called_once_with(
+            {"in_flight": {}, "dropped": 1})
+
+    @mock.patch("rally.benchmark.runners.rps.time")
+    @mock.patch("rally.benchmark.runners.rps.threading.Thread")
+    def test__worker_process_overload_abort(self, mock_thread, mock_time):
+        mock_time.time.return_value = 100.0
+        mock_thread.return_value.isAlive.return_value = True
+        mock_stats_queue = mock.MagicMock()
+        aborted = threading.Event()
+
+        rps._worker_process(1, [0, 1, 2, 3], mock.MagicMock(),
+                            fakes.FakeUserContext({}).context, 600, 100.0,
+                            1, rps.OVERLOAD_ABORT, mock_stats_queue,
+                            aborted, "Dummy", "dummy", ())
+
+        self.assertTrue(aborted.is_set())
+        self.assertEqual(2, mock_thread.return_value.start.call_count)
+        mock_stats_queue.put.assert_called_once_with(
+            {"in_flight": {}, "dropped": 0})
 
+    @mock.patch("rally.benchmark.runners.rps.time")
+    @mock.patch("rally.benchmark.runners.rps.threading.Thread")
+    def test__worker_process_aborted(self, mock_thread, mock_time):
+        aborted = threading.Event()
+        aborted.set()
+
+        rps._worker_process(1, [0, 1], mock.MagicMock(),
+                            fakes.FakeUserContext({}).context, 600, 100.0,
+                            None, rps.OVERLOAD_QUEUE, mock.MagicMock(),
+                            aborted, "Dummy", "dummy", ())
+
+        # NOTE: only the sampler of in-flight iterations is started
+        mock_thread.assert_called_once_with(target=rps._sample_in_flight,
+                                            args=mock.ANY)
+
+    @mock.patch("rally.benchmark.runners.rps.time.time", return_value=10.5)
     @mock.patch("rally.benchmark.runners.rps.base",
-                _run_scenario_once=mock.MagicMock())
-    def test__worker_thread(self, mock_base):
+                _run_scenario_once=mock.MagicMock(return_value={}))
+    def test__worker_thread(self, mock_base, mock_time):
         mock_queue = mock.MagicMock()
 
         args = ("some_args",)
 
-        rps._worker_thread(mock_queue, args)
+        rps._worker_thread(mock_queue, args, 10.0)
 
-        self.assertEqual(1, mock_queue.put.call_count)
+        mock_queue.put.assert_called_once_with(
+            {"intended_start": 10.0, "actual_start": 10.5})
 
         expected_calls = [mock.call(("some_args",))]
         self.assertEqual(expected_calls,
                          mock_base._run_scenario_once.mock_calls)
 
+    @mock.patch("rally.benchmark.runners.rps.base",
+                _run_scenario_once=mock.MagicMock(side_effect=KeyError))
+    def test__worker_thread_releases_in_flight(self, mock_base):
+        in_flight = mock.MagicMock()
+
+        self.assertRaises(KeyError, rps._worker_thread, mock.MagicMock(),
+                          ("some_args",), 10.0, in_flight)
+
+        in_flight.release.assert_called_once_with()
+
+    @mock.patch("rally.benchmark.runners.rps.time.time", return_value=100.25)
+    def test__sample_in_flight(self, mock_time):
+        counter = rps._InFlightCounter()
+        counter.count = 3
+        stopped = mock.MagicMock()
+        stopped.wait.side_effect = [False, True]
+        samples = {}
+
+        rps._sample_in_flight(counter, 100.0, stopped, samples)
+
+        self.assertEqual({3: 3}, samples)
+        self.assertEqual(2, stopped.wait.call_count)
+        self.assertAlmostEqual(0.05, stopped.wait.call_args[0][0])
+
+    def test__in_flight_counter(self):
+        counter = rps._InFlightCounter(2)
+        self.assertTrue(counter.acquire(False))
+        self.assertTrue(counter.acquire(False))
+        self.assertFalse(counter.acquire(False))
+        self.assertEqual(2, counter.count)
+
+        counter.release()
+        self.assertTrue(counter.acquire(False))
+
+    def test__in_flight_counter_unlimited(self):
+        counter = rps._InFlightCounter()
+        for i in range(100):
+            self.assertTrue(counter.acquire(False))
+        self.assertEqual(100, counter.count)
+
     @mock.patch("rally.benchmark.runners.rps.time.sleep")
     def test__run_scenario(self, mock_sleep):
         context = fakes.FakeUserContext({}).context
@@ -124,6 +293,36 @@ class RPSScenarioRunnerTestCase(test.TestCase):
 
         for result in runner.result_queue:
             self.assertIsNotNone(base.ScenarioRunnerResult(result))
+            self.assertIn("intended_start", result)
+            self.assertIn("actual_start", result)
+        self.assertEqual(0, runner.stats["dropped"])
+        self.assertFalse(runner.stats["aborted"])
+        self.assertIn("in_flight", runner.stats)
+
+    @mock.patch("rally.benchmark.runners.rps.time.sleep")
+    def test__run_scenario_max_concurrency(self, mock_sleep):
+        context = fakes.FakeUserContext({}).context
+        context["task"] = {"uuid": "fake_uuid"}
+        config = {"times": 10, "rps": 20, "max_concurrency": 2,
+                  "overload_policy": rps.OVERLOAD_QUEUE}
+        runner = rps.RPSScenarioRunner(None, config)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", context, {})
+
+        self.assertEqual(config["times"], len(runner.result_queue))
+        self.assertTrue(all(count <= 2
+                            for second, count in runner.stats["in_flight"]))
+
+    def test__update_stats(self):
+        runner = rps.RPSScenarioRunner(None, {"times": 1, "rps": 1})
+        # NOTE: samples are taken 10 times per second
+        workers_stats = [{"in_flight": {0: 2, 5: 3, 10: 1}, "dropped": 1},
+                         {"in_flight": {5: 1, 12: 4}, "dropped": 2}]
+
+        runner._update_stats(workers_stats, False)
+
+        self.assertEqual({"in_flight": [(0, 4), (1, 5)],
+                          "dropped": 3, "aborted": False}, runner.stats)
 
     @mock.patch("rally.benchmark.runners.rps.time.sleep")
     def test__run_scenario_exception(self, mock_sleep):
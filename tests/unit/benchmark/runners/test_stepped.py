@@ -0,0 +1,129 @@
+# Copyright 2014: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import jsonschema
+import mock
+
+from rally.benchmark.runners import base
+from rally.benchmark.runners import constant
+from rally.benchmark.runners import rps
+from rally.benchmark.runners import stepped
+from rally import consts
+from tests.unit import fakes
+from tests.unit import test
+
+
+class SteppedScenarioRunnerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SteppedScenarioRunnerTestCase, self).setUp()
+        self.config = {"type": consts.RunnerType.STEPPED,
+                       "steps": [1, 2], "times_per_step": 3, "timeout": 2}
+        self.context = fakes.FakeUserContext({"task":
+                                             {"uuid": "uuid"}}).context
+        self.args = {"a": 1}
+
+    def test_validate(self):
+        stepped.SteppedScenarioRunner.validate(self.config)
+
+    def test_validate_rps(self):
+        self.config.update({"load": "rps", "steps": [0.5, 1]})
+        stepped.SteppedScenarioRunner.validate(self.config)
+
+    def test_validate_fractional_concurrency(self):
+        self.config["steps"] = [0.5, 1]
+        self.assertRaises(jsonschema.ValidationError,
+                          stepped.SteppedScenarioRunner.validate, self.config)
+
+    def test_validate_times_and_duration(self):
+        self.config["duration_per_step"] = 10
+        self.assertRaises(jsonschema.ValidationError,
+                          stepped.SteppedScenarioRunner.validate, self.config)
+
+    def test_validate_no_steps(self):
+        self.config["steps"] = []
+        self.assertRaises(jsonschema.ValidationError,
+                          stepped.SteppedScenarioRunner.validate, self.config)
+
+    def test__get_step_runner(self):
+        runner = stepped.SteppedScenarioRunner(None, self.config)
+
+        step_runner = runner._get_step_runner(2)
+
+        self.assertIsInstance(step_runner, constant.ConstantScenarioRunner)
+        self.assertEqual({"type": consts.RunnerType.CONSTANT, "timeout": 2,
+                          "concurrency": 2, "times": 3}, step_runner.config)
+
+    def test__get_step_runner_duration(self):
+        del self.config["times_per_step"]
+        self.config["duration_per_step"] = 10
+        runner = stepped.SteppedScenarioRunner(None, self.config)
+
+        step_runner = runner._get_step_runner(2)
+
+        self.assertIsInstance(step_runner,
+                              constant.ConstantForDurationScenarioRunner)
+        self.assertEqual({"type": consts.RunnerType.CONSTANT_FOR_DURATION,
+                          "timeout": 2, "concurrency": 2, "duration": 10},
+                         step_runner.config)
+
+    def test__get_step_runner_rps(self):
+        del self.config["times_per_step"]
+        self.config.update({"load": "rps", "duration_per_step": 10})
+        runner = stepped.SteppedScenarioRunner(None, self.config)
+
+        step_runner = runner._get_step_runner(0.25)
+
+        self.assertIsInstance(step_runner, rps.RPSScenarioRunner)
+        self.assertEqual({"type": consts.RunnerType.RPS, "timeout": 2,
+                          "rps": 0.25, "times": 3}, step_runner.config)
+
+    def test_run_scenario(self):
+        runner = stepped.SteppedScenarioRunner(None, self.config)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        self.assertEqual(6, len(runner.result_queue))
+        self.assertEqual([0, 0, 0, 1, 1, 1],
+                         [r["step"] for r in runner.result_queue])
+        for result in runner.result_queue:
+            self.assertIsNotNone(base.ScenarioRunnerResult(result))
+        self.assertEqual([0, 1], [s["step"] for s in runner.stats["steps"]])
+        self.assertEqual([1, 2], [s["load"] for s in runner.stats["steps"]])
+
+    @mock.patch("rally.benchmark.runners.stepped.SteppedScenarioRunner."
+                "_get_step_runner")
+    def test_run_scenario_clients_cache_stats(self, mock_get_step_runner):
+        step_runner = mock.MagicMock(stats={})
+
+        def run(cls, method_name, context, args):
+            step_runner._send_result(
+                {"duration": 1.0, "error": [],
+                 "clients_cache": {"hits": 1, "misses": 0,
+                                   "authentications": 0,
+                                   "auth_duration": 0.0}})
+
+        step_runner._run_scenario.side_effect = run
+        mock_get_step_runner.return_value = step_runner
+        runner = stepped.SteppedScenarioRunner(None, self.config)
+
+        runner._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                             self.args)
+
+        self.assertEqual([{"duration": 1.0, "error": [], "step": 0},
+                          {"duration": 1.0, "error": [], "step": 1}],
+                         list(runner.result_queue))
+        self.assertEqual(2, runner.clients_cache_stats["hits"])
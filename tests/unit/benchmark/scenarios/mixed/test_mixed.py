@@ -0,0 +1,76 @@
+# Copyright 2014: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from rally.benchmark.scenarios import base
+from rally.benchmark.scenarios.mixed import mixed
+from tests.unit import test
+
+
+MIXED = "rally.benchmark.scenarios.mixed.mixed"
+
+
+class FakeMixedScenario(base.Scenario):
+
+    def fake(self, sleep=0, fail=False):
+        with base.AtomicAction(self, "fake_action"):
+            pass
+        self._idle_duration += sleep
+        if fail:
+            raise ValueError("fail")
+        return {"data": {"a": 1}, "errors": ""}
+
+
+class MixedWorkloadTestCase(test.TestCase):
+
+    @mock.patch(MIXED + ".random.uniform")
+    def test__choose_scenario(self, mock_uniform):
+        scenarios = [{"name": "a", "weight": 6}, {"name": "b", "weight": 3},
+                     {"name": "c"}]
+        for point, name in ((0, "a"), (5.9, "a"), (6, "b"), (8.9, "b"),
+                            (9, "c"), (10, "c")):
+            mock_uniform.return_value = point
+            self.assertEqual(name, mixed.MixedWorkload._choose_scenario(
+                scenarios)["name"])
+        mock_uniform.assert_called_with(0, 10)
+
+    def test_weighted_mix_nested_scenarios(self):
+        self.assertEqual("scenarios", base.Scenario.meta(
+            mixed.MixedWorkload, "nested_scenarios",
+            method_name="weighted_mix"))
+
+    @mock.patch(MIXED + ".MixedWorkload._choose_scenario")
+    def test_weighted_mix(self, mock_choose):
+        mock_choose.return_value = {"name": "FakeMixedScenario.fake",
+                                    "args": {"sleep": 2}}
+        scenario = mixed.MixedWorkload(context={"a": 1})
+        result = scenario.weighted_mix([mock_choose.return_value])
+
+        self.assertEqual({"data": {"a": 1}, "errors": ""}, result)
+        self.assertEqual(2, scenario.idle_duration())
+        self.assertEqual(["FakeMixedScenario.fake", "fake_action"],
+                         sorted(scenario.atomic_actions()))
+
+    @mock.patch(MIXED + ".MixedWorkload._choose_scenario")
+    def test_weighted_mix_failed(self, mock_choose):
+        mock_choose.return_value = {"name": "FakeMixedScenario.fake",
+                                    "args": {"fail": True}}
+        scenario = mixed.MixedWorkload(context={"a": 1})
+        self.assertRaises(ValueError, scenario.weighted_mix,
+                          [mock_choose.return_value])
+        self.assertEqual({"FakeMixedScenario.fake": None,
+                          "fake_action": mock.ANY},
+                         scenario.atomic_actions())
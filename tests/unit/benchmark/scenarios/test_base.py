@@ -198,6 +198,47 @@ class ScenarioTestCase(test.TestCase):
                                        default=empty_list),
                          empty_list)
 
+    @mock.patch("rally.benchmark.scenarios.base.Scenario.meta")
+    def test_get_default_context_nested(self, mock_meta):
+        meta = {
+            ("Mix.mix", "nested_scenarios"): "scenarios",
+            ("Mix.mix", "context"): {"cleanup": ["nova"]},
+            ("A.a", "context"): {"cleanup": ["cinder", "nova"],
+                                 "images": {"a": 1}},
+            ("B.b", "context"): {"images": {"b": 2}, "users": {}}
+        }
+        mock_meta.side_effect = lambda name, attr, default=None: (
+            meta.get((name, attr), default))
+        args = {"scenarios": [{"name": "A.a", "args": {"x": 1}},
+                              {"name": "B.b"}]}
+
+        self.assertEqual({"cleanup": ["cinder", "nova"], "images": {"a": 1},
+                          "users": {}},
+                         base.Scenario.get_default_context("Mix.mix", args))
+        self.assertEqual({"cleanup": ["nova"]},
+                         base.Scenario.get_default_context("Mix.mix"))
+
+    @mock.patch("rally.benchmark.scenarios.base.Scenario._validate_scenario")
+    @mock.patch("rally.benchmark.scenarios.base.Scenario.meta")
+    def test_validate_nested(self, mock_meta, mock_validate_scenario):
+        mock_meta.side_effect = lambda name, attr, default=None: (
+            "scenarios" if name == "Mix.mix" else default)
+        config = {"args": {"scenarios": [{"name": "A.a", "args": {"x": 1}},
+                                         {"name": "B.b"}]},
+                  "context": {"users": {}}}
+
+        base.Scenario.validate("Mix.mix", config, admin="admin",
+                               users=["u1"], task="task")
+
+        self.assertEqual(
+            [mock.call("Mix.mix", config, admin="admin", users=["u1"],
+                       task="task"),
+             mock.call("A.a", {"args": {"x": 1}, "context": {"users": {}}},
+                       admin="admin", users=["u1"], task="task"),
+             mock.call("B.b", {"args": {}, "context": {"users": {}}},
+                       admin="admin", users=["u1"], task="task")],
+            mock_validate_scenario.mock_calls)
+
     def test_is_scenario_success(self):
         scenario = dummy.Dummy()
         self.assertTrue(base.Scenario.is_scenario(scenario, "dummy"))
@@ -15,6 +15,7 @@
 
 
 import jsonschema
+import mock
 
 from rally.benchmark.sla import base
 from tests.unit import test
@@ -63,6 +64,49 @@ class BaseSLATestCase(test.TestCase):
         self.assertEqual(expected, results)
 
 
+class SLACheckerTestCase(test.TestCase):
+
+    def test_results(self):
+        config = {"sla": {"max_failure_percent": 40.0,
+                          "max_seconds_per_iteration": 4.0,
+                          "max_avg_duration": 2.0}}
+        checker = base.SLAChecker(config)
+        checker.add([{"duration": 1.0, "error": []},
+                     {"duration": 3.0, "error": []}])
+        checker.add([])
+        checker.add([{"duration": 5.0, "error": ["error"]}])
+
+        results = dict((r["criterion"], r["success"])
+                       for r in checker.results())
+        self.assertEqual({"max_failure_percent": True,
+                          "max_seconds_per_iteration": False,
+                          "max_avg_duration": False}, results)
+
+    def test_results_same_as_check_all(self):
+        config = {"sla": {"max_failure_percent": 10.0,
+                          "max_seconds_per_iteration": 4.0,
+                          "max_avg_duration": 3.0}}
+        result = [{"duration": 1.0, "error": []},
+                  {"duration": 2.5, "error": []},
+                  {"duration": 3.5, "error": ["error"]}]
+        checker = base.SLAChecker(config)
+        checker.add(result[:2])
+        checker.add(result[2:])
+
+        self.assertEqual(
+            sorted(base.SLA.check_all(config, result)),
+            sorted(checker.results()))
+
+    def test_results_of_criterion_without_state(self):
+        checker = base.SLAChecker({"sla": {"test_criterion": 2}})
+        checker.add([1])
+        checker.add([2])
+
+        with mock.patch.object(TestCriterion, "check") as mock_check:
+            checker.results()
+        mock_check.assert_called_once_with(2, [1, 2])
+
+
 class FailureRateTestCase(test.TestCase):
     def test_check(self):
         result = [
@@ -107,3 +151,7 @@ class MaxAverageDurationTestCase(test.TestCase):
         ]
         self.assertTrue(base.MaxAverageDuration.check(42, result).success)
         self.assertFalse(base.MaxAverageDuration.check(3.62, result).success)
+
+    def test_check_no_successful_iterations(self):
+        result = [{"duration": 3.14, "error": ["error"]}]
+        self.assertFalse(base.MaxAverageDuration.check(42, result).success)
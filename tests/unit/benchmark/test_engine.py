@@ -22,6 +22,7 @@ import jsonschema
 import mock
 
 from rally.benchmark import engine
+from rally.benchmark.runners import base as base_runner
 from rally import consts
 from rally import exceptions
 from tests.unit import fakes
@@ -296,6 +297,154 @@ class BenchmarkEngineTestCase(test.TestCase):
         eng = engine.BenchmarkEngine(config, task).bind({})
         eng.run()
 
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine._run_benchmark")
+    def test_run_one_by_one(self, mock_run_benchmark):
+        config = {"a.benchmark": [{"args": {"a": 1}}, {"args": {"a": 2}}]}
+        eng = engine.BenchmarkEngine(config, mock.MagicMock())
+        eng.run()
+        self.assertEqual([mock.call("a.benchmark", 0, {"args": {"a": 1}}),
+                          mock.call("a.benchmark", 1, {"args": {"a": 2}})],
+                         mock_run_benchmark.mock_calls)
+
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine._run_benchmark")
+    def test_run_parallel(self, mock_run_benchmark):
+        engine.CONF.set_override("max_parallel_benchmarks", 2, "benchmark")
+        self.addCleanup(engine.CONF.clear_override,
+                        "max_parallel_benchmarks", "benchmark")
+        config = {"a.benchmark": [{"args": {"a": 1}}, {"args": {"a": 2}}],
+                  "b.benchmark": [{"args": {"b": 1}}]}
+        task = mock.MagicMock()
+        eng = engine.BenchmarkEngine(config, task)
+        eng.run()
+
+        expected = [
+            mock.call(name, pos, kw, index=index)
+            for index, (name, pos, kw) in enumerate(
+                (name, pos, kw) for name in config
+                for pos, kw in enumerate(config[name]))]
+        self.assertEqual(sorted(expected),
+                         sorted(mock_run_benchmark.mock_calls))
+        task.update_status.assert_has_calls([
+            mock.call(consts.TaskStatus.RUNNING),
+            mock.call(consts.TaskStatus.FINISHED)
+        ])
+
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine._run_benchmark")
+    def test_run_parallel_failed(self, mock_run_benchmark):
+        engine.CONF.set_override("max_parallel_benchmarks", 2, "benchmark")
+        self.addCleanup(engine.CONF.clear_override,
+                        "max_parallel_benchmarks", "benchmark")
+        mock_run_benchmark.side_effect = [KeyError("fail"), None, None]
+        config = {"a.benchmark": [{}, {}, {}]}
+        task = mock.MagicMock()
+        eng = engine.BenchmarkEngine(config, task)
+
+        self.assertRaises(KeyError, eng.run)
+        self.assertEqual(3, mock_run_benchmark.call_count)
+        self.assertNotIn(mock.call(consts.TaskStatus.FINISHED),
+                         task.update_status.mock_calls)
+
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine.consume_results")
+    @mock.patch("rally.benchmark.engine.base_ctx.ContextManager")
+    @mock.patch("rally.benchmark.engine.base_scenario.Scenario")
+    @mock.patch("rally.benchmark.engine.base_runner.ScenarioRunner")
+    def test__run_benchmark_index(self, mock_runner, mock_scenario,
+                                  mock_ctx_manager, mock_consume):
+        mock_scenario.get_default_context.return_value = {}
+        mock_runner.get_runner.return_value.run.return_value = 10
+        eng = engine.BenchmarkEngine({}, mock.MagicMock())
+        eng.admin_endpoint = mock.MagicMock()
+
+        eng._run_benchmark("a.benchmark", 1, {"args": {"a": 1}}, index=5)
+
+        context_obj = mock_ctx_manager.call_args[0][0]
+        self.assertEqual(5, context_obj["benchmark_index"])
+        mock_runner.get_runner.return_value.run.assert_called_once_with(
+            "a.benchmark", context_obj, {"a": 1})
+        self.assertEqual({("a.benchmark", 1): 10}, eng._durations)
+
+    @mock.patch("rally.benchmark.engine.base_ctx.Context.get_by_name")
+    def test__split_context_config(self, mock_get_by_name):
+        mock_get_by_name.side_effect = lambda name: mock.Mock(
+            is_reusable=mock.Mock(return_value=name != "cleanup"))
+        config = {"users": {"tenants": 2}, "cleanup": ["nova"], "a": {}}
+        self.assertEqual(({"users": {"tenants": 2}, "a": {}},
+                          {"cleanup": ["nova"]}),
+                         engine.BenchmarkEngine._split_context_config(config))
+
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine._run_benchmark")
+    @mock.patch("rally.benchmark.engine.base_ctx.ContextManager")
+    @mock.patch("rally.benchmark.engine.base_scenario.Scenario"
+                ".get_default_context")
+    def test_run_with_shared_contexts(self, mock_get_default_context,
+                                      mock_ctx_manager, mock_run_benchmark):
+        engine.CONF.set_override("reuse_contexts", True, "benchmark")
+        self.addCleanup(engine.CONF.clear_override,
+                        "reuse_contexts", "benchmark")
+        default_contexts = {"a.benchmark": {"cleanup": ["nova"]},
+                            "b.benchmark": {"cleanup": ["cinder"]}}
+        mock_get_default_context.side_effect = lambda name, args: (
+            copy.deepcopy(default_contexts.get(name, {})))
+        shared = {"context": {"users": {"tenants": 2}}}
+        other = {"context": {"users": {"tenants": 3}}}
+        config = collections.OrderedDict([
+            ("a.benchmark", [shared, shared, other]),
+            ("b.benchmark", [shared]),
+            ("c.benchmark", [shared, shared])])
+        task = mock.MagicMock()
+        eng = engine.BenchmarkEngine(config, task)
+        eng.admin_endpoint = "admin"
+        eng.run()
+
+        # NOTE: only consecutive benchmarks share contexts, so they are
+        #       run in the task order, cleanup contexts are set up by
+        #       each benchmark itself
+        shared_context = {"task": task, "admin": {"endpoint": "admin"},
+                          "config": {"users": {"tenants": 2}}}
+        self.assertEqual([mock.call(shared_context)] * 2,
+                         [c for c in mock_ctx_manager.mock_calls
+                          if c[0] == ""])
+        self.assertEqual(
+            [mock.call("a.benchmark", 0, shared,
+                       shared_context=shared_context),
+             mock.call("a.benchmark", 1, shared,
+                       shared_context=shared_context),
+             mock.call("a.benchmark", 2, other),
+             mock.call("b.benchmark", 0, shared),
+             mock.call("c.benchmark", 0, shared,
+                       shared_context=shared_context),
+             mock.call("c.benchmark", 1, shared,
+                       shared_context=shared_context)],
+            mock_run_benchmark.mock_calls)
+
+    @mock.patch("rally.benchmark.engine.base_ctx.Context.get_by_name")
+    @mock.patch("rally.benchmark.engine.BenchmarkEngine.consume_results")
+    @mock.patch("rally.benchmark.engine.base_ctx.ContextManager")
+    @mock.patch("rally.benchmark.engine.base_scenario.Scenario")
+    @mock.patch("rally.benchmark.engine.base_runner.ScenarioRunner")
+    def test__run_benchmark_shared_context(self, mock_runner, mock_scenario,
+                                           mock_ctx_manager, mock_consume,
+                                           mock_get_by_name):
+        mock_get_by_name.side_effect = lambda name: mock.Mock(
+            is_reusable=mock.Mock(return_value=name == "users"))
+        mock_scenario.get_default_context.return_value = {
+            "cleanup": ["nova"]}
+        mock_runner.get_runner.return_value.run.return_value = 10
+        eng = engine.BenchmarkEngine({}, mock.MagicMock())
+        eng.admin_endpoint = mock.MagicMock()
+        shared_context = {"task": eng.task, "users": ["user"],
+                          "config": {"users": {}}}
+
+        eng._run_benchmark("a.benchmark", 0, {"args": {"a": 1}},
+                           shared_context=shared_context)
+
+        context_obj = mock_ctx_manager.call_args[0][0]
+        self.assertEqual({"task": eng.task, "users": ["user"],
+                          "scenario_name": "a.benchmark",
+                          "config": {"cleanup": ["nova"]}}, context_obj)
+        mock_runner.get_runner.return_value.run.assert_called_once_with(
+            "a.benchmark", context_obj, {"a": 1})
+
     @mock.patch("rally.benchmark.engine.osclients")
     @mock.patch("rally.benchmark.engine.endpoint.Endpoint")
     def test_bind(self, mock_endpoint, mock_osclients):
@@ -319,10 +468,11 @@ class BenchmarkEngineTestCase(test.TestCase):
         ]
         mock_osclients.assert_has_calls(expected_calls)
 
-    @mock.patch("rally.benchmark.engine.base_scenario.Scenario.meta")
-    def test__prepare_context(self, mock_meta):
+    @mock.patch("rally.benchmark.engine.base_scenario.Scenario"
+                ".get_default_context")
+    def test__prepare_context(self, mock_get_default_context):
         default_context = {"a": 1, "b": 2}
-        mock_meta.return_value = default_context
+        mock_get_default_context.return_value = default_context
         task = mock.MagicMock()
         name = "a.benchmark"
         context = {"b": 3, "c": 4}
@@ -331,7 +481,7 @@ class BenchmarkEngineTestCase(test.TestCase):
             "a.benchmark": [{"context": {"context_a": {"a": 1}}}],
         }
         eng = engine.BenchmarkEngine(config, task)
-        result = eng._prepare_context(context, name, endpoint)
+        result = eng._prepare_context(context, name, endpoint, {"x": 1})
         expected_context = copy.deepcopy(default_context)
         expected_context.setdefault("users", {})
         expected_context.update(context)
@@ -342,10 +492,16 @@ class BenchmarkEngineTestCase(test.TestCase):
             "config": expected_context
         }
         self.assertEqual(result, expected_result)
-        mock_meta.assert_called_once_with(name, "context")
+        mock_get_default_context.assert_called_once_with(name, {"x": 1})
+
+    def _get_result_queue(self, results):
+        result_queue = base_runner.ResultQueue()
+        for result in results:
+            result_queue.append(result)
+        return result_queue
 
-    @mock.patch("rally.benchmark.sla.base.SLA.check_all")
-    def test_consume_results(self, mock_check_all):
+    @mock.patch("rally.benchmark.sla.base.SLAChecker")
+    def test_consume_results(self, mock_sla_checker):
         key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
         task = mock.MagicMock()
         config = {
@@ -354,6 +510,67 @@ class BenchmarkEngineTestCase(test.TestCase):
         is_done = mock.MagicMock()
         is_done.isSet.side_effect = [False, False, True]
         eng = engine.BenchmarkEngine(config, task)
+        eng._durations[("fake", 0)] = 1
+        eng.consume_results(key, task, self._get_result_queue([1, 2]),
+                            is_done, {"dropped": 1})
+        mock_sla_checker.assert_called_once_with({"fake": 2})
+        checker = mock_sla_checker.return_value
+        self.assertEqual([1, 2], sum([c[0][0] for c in
+                                      checker.add.call_args_list], []))
+        task.append_results.assert_called_once_with(
+            key, {"raw": [1, 2], "scenario_duration": 1,
+                  "runner_stats": {"dropped": 1},
+                  "sla": checker.results.return_value})
+
+    @mock.patch("rally.benchmark.engine.CONF")
+    @mock.patch("rally.benchmark.sla.base.SLAChecker")
+    def test_consume_results_flush(self, mock_sla_checker, mock_conf):
+        mock_conf.benchmark.results_flush_size = 2
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        is_done = mock.MagicMock()
+        is_done.isSet.return_value = True
+        eng = engine.BenchmarkEngine({}, task)
+        eng.duration = 1
+        eng.consume_results(key, task,
+                            self._get_result_queue([1, 2, 3, 4, 5]), is_done)
+        checker = mock_sla_checker.return_value
+        self.assertEqual([1, 2, 3, 4, 5],
+                         sum([c[0][0] for c in checker.add.call_args_list],
+                             []))
+        self.assertEqual([
+            mock.call(key, {"raw": [1, 2]}),
+            mock.call(key, {"raw": [3, 4]}),
+            mock.call(key, {"raw": [5], "scenario_duration": 1,
+                            "runner_stats": {},
+                            "sla": checker.results.return_value})
+        ], task.append_results.mock_calls)
+        # NOTE: flushed results are not loaded back from the database
+        self.assertFalse(task.get_results.called)
+
+    @mock.patch("rally.benchmark.engine.CONF")
+    @mock.patch("rally.benchmark.sla.base.SLAChecker")
+    def test_consume_results_append_fails(self, mock_sla_checker, mock_conf):
+        mock_conf.benchmark.results_flush_size = 2
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        task.append_results.side_effect = [Exception, None, None]
+        mock_sla_checker.return_value.add.side_effect = [Exception, None,
+                                                         None, None]
+        is_done = mock.MagicMock()
+        is_done.isSet.return_value = True
+        eng = engine.BenchmarkEngine({}, task)
         eng.duration = 1
-        eng.consume_results(key, task, collections.deque([1, 2]), is_done)
-        mock_check_all.assert_called_once_with({"fake": 2}, [1, 2])
+        result_queue = self._get_result_queue([1, 2, 3, 4, 5])
+
+        eng.consume_results(key, task, result_queue, is_done)
+
+        self.assertEqual(0, len(result_queue))
+        checker = mock_sla_checker.return_value
+        self.assertEqual([
+            mock.call(key, {"raw": [1, 2]}),
+            mock.call(key, {"raw": [3, 4]}),
+            mock.call(key, {"raw": [5], "scenario_duration": 1,
+                            "runner_stats": {},
+                            "sla": checker.results.return_value})
+        ], task.append_results.mock_calls)
@@ -228,4 +228,31 @@ class PreprocessTestCase(test.TestCase):
                                           attr_name="preprocessors")
         mock_osclients.Clients.assert_called_once_with(
             context["admin"]["endpoint"])
-        self.assertEqual({"a": 20, "b": 20}, result)
\ No newline at end of file
+        self.assertEqual({"a": 20, "b": 20}, result)
+
+
+class WorkloadResourceTypeTestCase(test.TestCase):
+
+    @mock.patch("rally.benchmark.types.base.Scenario")
+    def test_transform(self, mock_scenario):
+
+        class Preprocessor(types.ResourceType):
+
+            @classmethod
+            def transform(cls, clients, resource_config):
+                return resource_config * 2
+
+        mock_scenario.meta.side_effect = lambda cls, method_name, **kw: (
+            {"a": Preprocessor} if method_name == "foo" else {})
+        clients = mock.MagicMock()
+        workload = [{"name": "A.foo", "weight": 2, "args": {"a": 10}},
+                    {"name": "B.bar", "args": {"a": 10}},
+                    {"name": "C.foo"}]
+
+        result = types.WorkloadResourceType.transform(clients, workload)
+        self.assertEqual([{"name": "A.foo", "weight": 2, "args": {"a": 20}},
+                          {"name": "B.bar", "args": {"a": 10}},
+                          {"name": "C.foo", "args": {}}], result)
+        self.assertEqual({"a": 10}, workload[0]["args"])
+        self.assertEqual([mock.call("A"), mock.call("B"), mock.call("C")],
+                         mock_scenario.get_by_name.mock_calls)
@@ -140,6 +140,20 @@ class BenchmarkUtilsTestCase(test.TestCase):
         result = utils.run_concurrent_helper(args)
         self.assertEqual(cls.test(), result)
 
+    def test_run_concurrent(self):
+        class Fake(object):
+            def __init__(self):
+                self.calls = []
+
+            def fn(self, arg):
+                self.calls.append(arg)
+                return arg * 2
+
+        fake = Fake()
+        result = utils.run_concurrent(3, fake, "fn", range(10))
+        self.assertEqual([i * 2 for i in range(10)], list(result))
+        self.assertEqual(range(10), sorted(fake.calls))
+
     def test_check_service_status(self):
         class service():
             def __init__(self, name):
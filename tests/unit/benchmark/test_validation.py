@@ -358,6 +358,24 @@ class ValidatorsTestCase(test.TestCase):
         result = validator({"args": {"a": 1, "c": 3}}, None, None)
         self.assertFalse(result.is_valid, result.msg)
 
+    def test_workload_scenarios(self):
+        validator = self._unwrap_validator(validation.workload_scenarios,
+                                           "scenarios")
+        result = validator({"args": {"scenarios": [
+            {"name": "Dummy.dummy", "weight": 3, "args": {"sleep": 1}},
+            {"name": "Dummy.dummy_exception"}]}}, None, None)
+        self.assertTrue(result.is_valid, result.msg)
+
+    def test_workload_scenarios_invalid(self):
+        validator = self._unwrap_validator(validation.workload_scenarios,
+                                           "scenarios")
+        for workload in ([], [{"name": "dummy"}],
+                         [{"name": "Dummy.not_exists"}],
+                         [{"name": "Dummy.dummy", "weight": 0}],
+                         [{"name": "Dummy.dummy", "weight": "1"}]):
+            result = validator({"args": {"scenarios": workload}}, None, None)
+            self.assertFalse(result.is_valid, workload)
+
     def test_required_service(self):
         validator = self._unwrap_validator(validation.required_services,
                                            consts.Service.KEYSTONE,
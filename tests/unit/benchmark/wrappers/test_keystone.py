@@ -109,6 +109,11 @@ class KeystoneV2WrapperTestCase(test.TestCase, KeystoneWrapperTestBase):
         self.wrapped_client.delete_user('fake_id')
         self.client.users.delete.assert_called_once_with('fake_id')
 
+    def test_update_user_password(self):
+        self.wrapped_client.update_user_password('fake_id', 'pwd')
+        self.client.users.update_password.assert_called_once_with('fake_id',
+                                                                  'pwd')
+
     def test_list_users(self):
         user = mock.MagicMock()
         user.id = 'fake_id'
@@ -191,6 +196,11 @@ class KeystoneV3WrapperTestCase(test.TestCase, KeystoneWrapperTestBase):
         self.wrapped_client.delete_user('fake_id')
         self.client.users.delete.assert_called_once_with('fake_id')
 
+    def test_update_user_password(self):
+        self.wrapped_client.update_user_password('fake_id', 'pwd')
+        self.client.users.update.assert_called_once_with('fake_id',
+                                                         password='pwd')
+
     def test_list_users(self):
         user = mock.MagicMock()
         user.id = 'fake_id'
@@ -121,6 +121,116 @@ class TaskCommandsTestCase(test.TestCase):
         self.task.detailed(test_uuid)
         mock_db.task_get_detailed.assert_called_once_with(test_uuid)
 
+    @mock.patch("rally.cmd.commands.task.common_cliutils.print_list")
+    @mock.patch("rally.cmd.commands.task.db")
+    def test_detailed_rps(self, mock_db, mock_print_list):
+        test_uuid = "7a0f3e5c-02e4-4e5c-8e9a-96b3b4a8b7a1"
+        raw = [{"duration": 1.0, "idle_duration": 0.0, "error": [],
+                "atomic_actions": {}, "scenario_output": {},
+                "intended_start": 10.0, "actual_start": 10.2}]
+        mock_db.task_get_detailed.return_value = {
+            "id": "task",
+            "uuid": test_uuid,
+            "status": "status",
+            "results": [{"key": {"name": "fake_name", "pos": "fake_pos",
+                                 "kw": "fake_kw"},
+                         "data": {"scenario_duration": 1.0, "raw": raw,
+                                  "runner_stats": {"in_flight": [[0, 1]],
+                                                   "dropped": 2,
+                                                   "aborted": True,
+                                                   "throughput": 0.5,
+                                                   "iterations_after_deadline":
+                                                   1}}}],
+            "failed": False
+        }
+        self.task.detailed(test_uuid)
+
+        rps_rows = mock_print_list.mock_calls[1][1][0]
+        self.assertEqual(1, len(rps_rows))
+        self.assertEqual((0, 1, 1), (rps_rows[0].second,
+                                     rps_rows[0].requested,
+                                     rps_rows[0].achieved))
+
+    @mock.patch("rally.cmd.commands.task.common_cliutils.print_list")
+    @mock.patch("rally.cmd.commands.task.db")
+    def test_detailed_steps(self, mock_db, mock_print_list):
+        test_uuid = "c0d874d4-7195-4fd5-8688-abe82bfad36f"
+        raw = [{"duration": 1.0, "idle_duration": 0.0, "error": [],
+                "atomic_actions": {}, "scenario_output": {}, "step": 0},
+               {"duration": 2.0, "idle_duration": 0.0, "error": [],
+                "atomic_actions": {}, "scenario_output": {}, "step": 1}]
+        mock_db.task_get_detailed.return_value = {
+            "id": "task",
+            "uuid": test_uuid,
+            "status": "status",
+            "results": [{"key": {"name": "fake_name", "pos": "fake_pos",
+                                 "kw": {"runner": {"type": "stepped",
+                                                   "steps": [2, 4]}}},
+                         "data": {"scenario_duration": 1.0, "raw": raw}}],
+            "failed": False
+        }
+        self.task.detailed(test_uuid)
+
+        steps_rows = mock_print_list.mock_calls[1][1][0]
+        self.assertEqual([(0, 2, 1), (1, 4, 1)],
+                         [(r.step, r.load, r.count) for r in steps_rows])
+
+    @mock.patch("rally.cmd.commands.task.common_cliutils.print_list")
+    @mock.patch("rally.cmd.commands.task.db")
+    def test_detailed_capacity(self, mock_db, mock_print_list):
+        test_uuid = "c0d874d4-7195-4fd5-8688-abe82bfad36f"
+        raw = [{"duration": 1.0, "idle_duration": 0.0, "error": [],
+                "atomic_actions": {}, "scenario_output": {}, "step": 0},
+               {"duration": 2.0, "idle_duration": 0.0, "error": [],
+                "atomic_actions": {}, "scenario_output": {}, "step": 1}]
+        runner_stats = {"capacity": 8,
+                        "steps": [{"step": 0, "load": 1},
+                                  {"step": 1, "load": 8}]}
+        mock_db.task_get_detailed.return_value = {
+            "id": "task",
+            "uuid": test_uuid,
+            "status": "status",
+            "results": [{"key": {"name": "fake_name", "pos": "fake_pos",
+                                 "kw": {"runner": {"type": "capacity",
+                                                   "max": 8}}},
+                         "data": {"scenario_duration": 1.0, "raw": raw,
+                                  "runner_stats": runner_stats}}],
+            "failed": False
+        }
+        self.task.detailed(test_uuid)
+
+        steps_rows = mock_print_list.mock_calls[1][1][0]
+        self.assertEqual([(0, 1), (1, 8)],
+                         [(r.step, r.load) for r in steps_rows])
+
+    @mock.patch("rally.cmd.commands.task.print", create=True)
+    @mock.patch("rally.cmd.commands.task.db")
+    def test_detailed_clients_cache(self, mock_db, mock_print):
+        test_uuid = "c0d874d4-7195-4fd5-8688-abe82bfad36f"
+        runner_stats = {"clients_cache": {"hits": 9, "misses": 1,
+                                          "authentications": 1,
+                                          "auth_duration": 0.5,
+                                          "auth_time_saved": 4.5},
+                        "http_pool": {"requests": 20, "connections": 2,
+                                      "processes": 1}}
+        mock_db.task_get_detailed.return_value = {
+            "id": "task",
+            "uuid": test_uuid,
+            "status": "status",
+            "results": [{"key": {"name": "fake_name", "pos": "fake_pos",
+                                 "kw": "fake_kw"},
+                         "data": {"scenario_duration": 1.0, "raw": [],
+                                  "runner_stats": runner_stats}}],
+            "failed": False
+        }
+        self.task.detailed(test_uuid)
+
+        mock_print.assert_any_call(
+            "Clients cache: ", "9 hits, 1 misses, 1 keystone "
+            "authentications took 0.500s, saved ~4.500s")
+        mock_print.assert_any_call(
+            "HTTP pool: ", "20 requests over 2 connections in 1 processes")
+
     @mock.patch('rally.cmd.commands.task.envutils.get_global')
     def test_detailed_no_task_id(self, mock_default):
         mock_default.side_effect = exceptions.InvalidArgumentsException
@@ -139,7 +249,7 @@ class TaskCommandsTestCase(test.TestCase):
     def test_results_default(self, mock_json, mock_db):
         test_uuid = 'aa808c14-69cc-4faf-a906-97e05f5aebbd'
         value = [
-            {'key': 'key', 'data': {'raw': 'raw', 'sla': []}}
+            {'key': 'key', 'data': {'raw': ['raw'], 'sla': []}}
         ]
         result = map(lambda x: {"key": x["key"],
                                 "result": x["data"]["raw"],
@@ -154,7 +264,7 @@ class TaskCommandsTestCase(test.TestCase):
     def test_results_json(self, mock_json, mock_db):
         test_uuid = 'e87dd629-cd3d-4a1e-b377-7b93c19226fb'
         value = [
-            {'key': 'key', 'data': {'raw': 'raw', 'sla': []}}
+            {'key': 'key', 'data': {'raw': ['raw'], 'sla': []}}
         ]
         result = map(lambda x: {"key": x["key"],
                                 "result": x["data"]["raw"],
@@ -170,7 +280,7 @@ class TaskCommandsTestCase(test.TestCase):
     def test_results_pprint(self, mock_pprint, mock_db):
         test_uuid = 'c1e4bc59-a8fd-458c-9abb-c922d8df4285'
         value = [
-            {'key': 'key', 'data': {'raw': 'raw', 'sla': []}}
+            {'key': 'key', 'data': {'raw': ['raw'], 'sla': []}}
         ]
         result = map(lambda x: {"key": x["key"],
                                 "result": x["data"]["raw"],
@@ -13,6 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import subprocess
+import sys
+
 import mock
 from oslo.config import cfg
 
@@ -23,6 +26,7 @@ from rally.cmd.commands import show
 from rally.cmd.commands import task
 from rally.cmd.commands import use
 from rally.cmd.commands import verify
+from rally.cmd import main
 from rally.openstack.common.apiclient import exceptions
 from tests.unit import test
 
@@ -94,6 +98,54 @@ class CliUtilsTestCase(test.TestCase):
         result = cliutils._methods_of(mock_obj)
         self.assertEqual(result, [])
 
+    def test__load_category(self):
+        self.assertEqual(task.TaskCommands, cliutils._load_category(
+            "rally.cmd.commands.task.TaskCommands"))
+        self.assertEqual(task.TaskCommands,
+                         cliutils._load_category(task.TaskCommands))
+
+    def test__get_requested_categories(self):
+        categories = {"task": "task_cls", "use": "use_cls"}
+        self.assertEqual(
+            {"task": "task_cls"},
+            cliutils._get_requested_categories(
+                ["rally", "--debug", "task", "list"], categories))
+        self.assertEqual(
+            {}, cliutils._get_requested_categories(["rally", "version"],
+                                                   categories))
+        self.assertEqual(
+            {}, cliutils._get_requested_categories(
+                ["rally", "bash-completion", "task"], categories))
+        self.assertEqual(
+            categories, cliutils._get_requested_categories(
+                ["rally", "--help"], categories))
+        self.assertEqual(
+            categories, cliutils._get_requested_categories(
+                ["rally", "unknown"], categories))
+
+    def test_run_imports_only_requested_category(self):
+        modules = ("rally.cmd.commands.deployment", "rally.cmd.commands.info",
+                   "rally.cmd.commands.show", "rally.cmd.commands.verify",
+                   "rally.benchmark.processing.plot", "rally.orchestrator.api",
+                   "mako", "sphinx", "yaml")
+        code = ("import sys\n"
+                "from rally.cmd import main\n"
+                "sys.argv = ['rally', 'task', 'list', '--help']\n"
+                "try:\n"
+                "    main.main()\n"
+                "except SystemExit:\n"
+                "    pass\n"
+                "print(sorted(set(m for m in sys.modules"
+                " if m.split('.')[0] in %r) & set(%r)))" % (
+                    ("rally", "mako", "sphinx", "yaml"), modules))
+        output = subprocess.check_output([sys.executable, "-c", code])
+        self.assertEqual("[]", output.strip().splitlines()[-1])
+
+    def test_main_categories_are_importable(self):
+        for name, path in main.CATEGORIES.items():
+            self.assertEqual(name, cliutils._load_category(path).__module__
+                             .split(".")[-1])
+
     def _unregister_opts(self):
         CONF.reset()
         category_opt = cfg.SubCommandOpt("category",
@@ -27,7 +27,8 @@ class CmdManageTestCase(test.TestCase):
     def test_main(self, cli_mock):
         manage.main()
         categories = {'db': manage.DBCommands,
-                      'tempest': manage.TempestCommands}
+                      'tempest': manage.TempestCommands,
+                      'worker': manage.WorkerCommands}
         cli_mock.run.assert_called_once_with(sys.argv, categories)
 
 
@@ -57,3 +58,35 @@ class TempestCommandsTestCase(test.TestCase):
         mock_tempest.return_value = self.tempest
         self.tempest_commands.install(deploy_id)
         self.tempest.install.assert_called_once_with()
+
+
+class WorkerCommandsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(WorkerCommandsTestCase, self).setUp()
+        self.worker_commands = manage.WorkerCommands()
+
+    @mock.patch('rally.benchmark.runners.distributed.Agent')
+    def test_start(self, mock_agent):
+        self.worker_commands.start(port=1234, hostname='host')
+        mock_agent.assert_called_once_with('127.0.0.1', 1234, 'host')
+        mock_agent.return_value.serve.assert_called_once_with()
+
+    @mock.patch('rally.benchmark.runners.distributed.Agent')
+    def test_start_with_host(self, mock_agent):
+        self.worker_commands.start(host='0.0.0.0')
+        mock_agent.assert_called_once_with('0.0.0.0', 0, None)
+
+    @mock.patch('rally.cmd.manage.common_cliutils.print_list')
+    @mock.patch('rally.benchmark.runners.distributed.get_alive_workers')
+    @mock.patch('rally.cmd.manage.db')
+    def test_list(self, mock_db, mock_alive, mock_print_list):
+        workers = [{'hostname': 'a:1', 'updated_at': 'now'},
+                   {'hostname': 'b:1', 'updated_at': 'long ago'}]
+        mock_db.worker_list.return_value = workers
+        mock_alive.return_value = workers[:1]
+        self.worker_commands.list()
+        mock_print_list.assert_called_once_with(
+            [{'hostname': 'a:1', 'updated_at': 'now', 'alive': True},
+             {'hostname': 'b:1', 'updated_at': 'long ago', 'alive': False}],
+            ('hostname', 'updated_at', 'alive'))
@@ -321,6 +321,83 @@ class DeploymentTestCase(test.DBTestCase):
                           deployment['uuid'])
 
 
+class TenantPoolTestCase(test.DBTestCase):
+    def setUp(self):
+        super(TenantPoolTestCase, self).setUp()
+        self.deployment = db.deployment_create({})
+
+    def _create(self, **values):
+        values.setdefault("deployment_uuid", self.deployment["uuid"])
+        values.setdefault("info", {"tenant": {"id": "t"}})
+        return db.pooled_tenant_create(values)
+
+    def test_create(self):
+        tenant = self._create(task_uuid="task")
+        tenants = db.pooled_tenant_get_all(self.deployment["uuid"])
+        self.assertEqual([tenant["id"]], [t["id"] for t in tenants])
+        self.assertEqual({"tenant": {"id": "t"}}, tenants[0]["info"])
+        self.assertEqual("task", tenants[0]["task_uuid"])
+
+    def test_get_all(self):
+        free = self._create()
+        leased = self._create(task_uuid="task")
+        self._create(deployment_uuid=db.deployment_create({})["uuid"])
+        get_all = lambda **kw: [t["id"] for t in db.pooled_tenant_get_all(
+            self.deployment["uuid"], **kw)]
+        self.assertEqual([free["id"], leased["id"]], get_all())
+        self.assertEqual([free["id"]], get_all(free=True))
+        self.assertEqual([leased["id"]], get_all(task_uuid="task"))
+
+    def test_lease_and_release(self):
+        tenant = self._create()
+        self.assertTrue(db.pooled_tenant_lease(tenant["id"], "task1"))
+        self.assertFalse(db.pooled_tenant_lease(tenant["id"], "task2"))
+        self.assertEqual([], db.pooled_tenant_get_all(
+            self.deployment["uuid"], free=True))
+        db.pooled_tenant_release(tenant["id"])
+        self.assertTrue(db.pooled_tenant_lease(tenant["id"], "task2"))
+
+    def test_release_not_found(self):
+        self.assertRaises(exceptions.PooledTenantNotFound,
+                          db.pooled_tenant_release, 42)
+
+    def test_reclaim(self):
+        def create_task(status):
+            return db.task_create({"deployment_uuid": self.deployment["uuid"],
+                                   "status": status})["uuid"]
+
+        running = self._create(task_uuid=create_task(
+            consts.TaskStatus.RUNNING))
+        finished = self._create(task_uuid=create_task(
+            consts.TaskStatus.FINISHED))
+        failed = self._create(task_uuid=create_task(consts.TaskStatus.FAILED))
+        deleted = self._create(task_uuid="deleted-task")
+        free = self._create()
+
+        self.assertEqual(3, db.pooled_tenant_reclaim(self.deployment["uuid"]))
+        self.assertEqual(
+            [finished["id"], failed["id"], deleted["id"], free["id"]],
+            [t["id"] for t in db.pooled_tenant_get_all(
+                self.deployment["uuid"], free=True)])
+        self.assertEqual(
+            [running["id"]],
+            [t["id"] for t in db.pooled_tenant_get_all(
+                self.deployment["uuid"], task_uuid=running["task_uuid"])])
+
+    def test_delete(self):
+        tenant = self._create()
+        self.assertRaises(exceptions.DeploymentIsBusy, db.deployment_delete,
+                          self.deployment["uuid"])
+        db.pooled_tenant_delete(tenant["id"])
+        self.assertEqual([],
+                         db.pooled_tenant_get_all(self.deployment["uuid"]))
+        db.deployment_delete(self.deployment["uuid"])
+
+    def test_delete_not_found(self):
+        self.assertRaises(exceptions.PooledTenantNotFound,
+                          db.pooled_tenant_delete, 42)
+
+
 class ResourceTestCase(test.DBTestCase):
     def test_create(self):
         deployment = db.deployment_create({})
@@ -426,8 +503,10 @@ class WorkerTestCase(test.DBTestCase):
         self.worker = db.register_worker({'hostname': 'test'})
 
     def test_register_worker_duplicate(self):
-        self.assertRaises(exceptions.WorkerAlreadyRegistered,
-                          db.register_worker, {'hostname': 'test'})
+        worker = db.register_worker({'hostname': 'test'})
+        self.assertEqual(self.worker['id'], worker['id'])
+        self.assertNotEqual(self.worker['updated_at'], worker['updated_at'])
+        self.assertEqual(['test'], [w['hostname'] for w in db.worker_list()])
 
     def test_get_worker(self):
         worker = db.get_worker('test')
@@ -438,6 +517,11 @@ class WorkerTestCase(test.DBTestCase):
         self.assertRaises(exceptions.WorkerNotFound,
                           db.get_worker, 'notfound')
 
+    def test_worker_list(self):
+        db.register_worker({'hostname': 'a-test'})
+        self.assertEqual(['a-test', 'test'],
+                         [w['hostname'] for w in db.worker_list()])
+
     def test_unregister_worker(self):
         db.unregister_worker('test')
         self.assertRaises(exceptions.WorkerNotFound,
@@ -799,6 +799,7 @@ class FakeNovaClient(object):
             rule_manager=self.security_group_rules)
         self.quotas = FakeNovaQuotasManager()
         self.set_management_url = mock.MagicMock()
+        self.client = mock.MagicMock()
 
 
 class FakeHeatClient(object):
@@ -1221,6 +1222,10 @@ class FakeRunner(object):
         "required": ["type", "a"]
     }
 
+    @classmethod
+    def _validate_config(cls, config):
+        pass
+
 
 class FakeScenario(base.Scenario):
 
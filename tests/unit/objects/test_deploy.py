@@ -176,6 +176,48 @@ class DeploymentTestCase(test.TestCase):
         self.assertEqual(len(resources), 1)
         self.assertEqual(resources[0]['id'], self.resource['id'])
 
+    @mock.patch('rally.objects.deploy.db.pooled_tenant_create')
+    def test_add_pooled_tenant(self, mock_create):
+        deploy = objects.Deployment(deployment=self.deployment)
+        tenant = deploy.add_pooled_tenant({'tenant': {}}, task_uuid='task')
+        self.assertEqual(mock_create.return_value, tenant)
+        mock_create.assert_called_once_with({
+            'deployment_uuid': self.deployment['uuid'],
+            'info': {'tenant': {}},
+            'task_uuid': 'task',
+        })
+
+    @mock.patch('rally.objects.deploy.db.pooled_tenant_get_all')
+    def test_get_pooled_tenants(self, mock_get_all):
+        deploy = objects.Deployment(deployment=self.deployment)
+        self.assertEqual(mock_get_all.return_value,
+                         deploy.get_pooled_tenants(free=True))
+        mock_get_all.assert_called_once_with(self.deployment['uuid'],
+                                             task_uuid=None, free=True)
+
+    @mock.patch('rally.objects.deploy.db.pooled_tenant_lease')
+    def test_lease_pooled_tenant(self, mock_lease):
+        self.assertEqual(mock_lease.return_value,
+                         objects.Deployment.lease_pooled_tenant(42, 'task'))
+        mock_lease.assert_called_once_with(42, 'task')
+
+    @mock.patch('rally.objects.deploy.db.pooled_tenant_reclaim')
+    def test_reclaim_pooled_tenants(self, mock_reclaim):
+        deploy = objects.Deployment(deployment=self.deployment)
+        self.assertEqual(mock_reclaim.return_value,
+                         deploy.reclaim_pooled_tenants())
+        mock_reclaim.assert_called_once_with(self.deployment['uuid'])
+
+    @mock.patch('rally.objects.deploy.db.pooled_tenant_release')
+    def test_release_pooled_tenant(self, mock_release):
+        objects.Deployment.release_pooled_tenant(42)
+        mock_release.assert_called_once_with(42)
+
+    @mock.patch('rally.objects.deploy.db.pooled_tenant_delete')
+    def test_delete_pooled_tenant(self, mock_delete):
+        objects.Deployment.delete_pooled_tenant(42)
+        mock_delete.assert_called_once_with(42)
+
     @mock.patch('rally.objects.deploy.datetime.datetime')
     @mock.patch('rally.objects.deploy.db.deployment_update')
     def test_update_set_started(self, mock_update, mock_datetime):
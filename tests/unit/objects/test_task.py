@@ -121,6 +121,36 @@ class TaskTestCase(test.TestCase):
         mock_append_results.assert_called_once_with(self.task['uuid'],
                                                     'opt', 'val')
 
+    @mock.patch('rally.objects.task.db.task_result_get_all_by_uuid')
+    def test_get_results(self, mock_get_all):
+        mock_get_all.return_value = [{'key': 'k', 'data': {'raw': [1]}}]
+        task = objects.Task(task=self.task)
+        results = task.get_results()
+        mock_get_all.assert_called_once_with(self.task['uuid'])
+        self.assertEqual([1], results[0]['data']['raw'])
+
+    def test_merge_results(self):
+        key1 = {'name': 'a', 'pos': 0}
+        key2 = {'name': 'b', 'pos': 0}
+        results = [
+            {'key': key1, 'data': {'raw': [1, 2]}},
+            {'key': key2, 'data': {'raw': [10], 'sla': [],
+                                   'scenario_duration': 2}},
+            {'key': key1, 'data': {'raw': [3]}},
+            {'key': key1, 'data': {'raw': [], 'sla': ['sla'],
+                                   'scenario_duration': 1,
+                                   'runner_stats': {'dropped': 0}}},
+        ]
+        self.assertEqual([
+            {'key': key1, 'data': {'raw': [1, 2, 3], 'sla': ['sla'],
+                                   'scenario_duration': 1,
+                                   'runner_stats': {'dropped': 0}}},
+            {'key': key2, 'data': {'raw': [10], 'sla': [],
+                                   'scenario_duration': 2,
+                                   'runner_stats': {}}}
+        ], objects.Task.merge_results(results))
+        self.assertEqual([1, 2], results[0]['data']['raw'])
+
     @mock.patch('rally.objects.task.db.task_update')
     def test_set_failed(self, mock_update):
         mock_update.return_value = self.task
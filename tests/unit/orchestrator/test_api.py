@@ -184,15 +184,20 @@ class APITestCase(test.TestCase):
             self.deploy_uuid,
             {'status': consts.DeployStatus.DEPLOY_FAILED})
 
+    @mock.patch("rally.orchestrator.api.users_ctx.UserGenerator"
+                ".delete_tenant_pool")
     @mock.patch("rally.objects.deploy.db.deployment_delete")
     @mock.patch("rally.objects.deploy.db.deployment_update")
     @mock.patch("rally.objects.deploy.db.deployment_get")
-    def test_destroy_deploy(self, mock_get, mock_update, mock_delete):
+    def test_destroy_deploy(self, mock_get, mock_update, mock_delete,
+                            mock_delete_pool):
         mock_get.return_value = self.deployment
         mock_update.return_value = self.deployment
         api.destroy_deploy(self.deploy_uuid)
         mock_get.assert_called_once_with(self.deploy_uuid)
         mock_delete.assert_called_once_with(self.deploy_uuid)
+        self.assertEqual(self.deploy_uuid,
+                         mock_delete_pool.call_args[0][0]["uuid"])
 
     @mock.patch("rally.objects.deploy.db.deployment_update")
     @mock.patch("rally.objects.deploy.db.deployment_get")
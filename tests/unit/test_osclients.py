@@ -13,8 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
 import urlparse
 
+import eventlet
 from keystoneclient import exceptions as keystone_exceptions
 import mock
 from oslo.config import cfg
@@ -48,7 +54,8 @@ class OSClientsTestCase(test.TestCase):
     def tearDown(self):
         super(OSClientsTestCase, self).tearDown()
 
-    def test_keystone(self):
+    @mock.patch("rally.osclients.keystone_session")
+    def test_keystone(self, mock_keystone_session):
         self.assertTrue("keystone" not in self.clients.cache)
         client = self.clients.keystone()
         self.assertEqual(client, self.fake_keystone)
@@ -59,11 +66,92 @@ class OSClientsTestCase(test.TestCase):
                                              mgmt_url.path)
         endpoint = {"timeout": cfg.CONF.openstack_client_http_timeout,
                     "insecure": False, "cacert": None,
-                    "endpoint": auth_url}
+                    "endpoint": auth_url,
+                    "session": mock_keystone_session.Session.return_value}
         kwargs = dict(self.endpoint.to_dict().items() + endpoint.items())
-        self.mock_create_keystone_client.assert_called_once_with(kwargs)
+        self.mock_create_keystone_client.assert_called_once_with(
+            kwargs, auth_ref=None)
+        mock_keystone_session.Session.assert_called_once_with(
+            session=mock.ANY, verify=True,
+            timeout=cfg.CONF.openstack_client_http_timeout)
+        session = mock_keystone_session.Session.call_args[1]["session"]
+        http_pool = osclients.get_http_pool()
+        self.assertEqual(http_pool.get(self.endpoint.auth_url),
+                         session.get_adapter(self.endpoint.auth_url))
+        self.assertEqual(http_pool.get(auth_url),
+                         session.get_adapter(auth_url))
         self.assertEqual(self.clients.cache["keystone"], self.fake_keystone)
 
+    def test_keystone_prewarmed_auth_ref(self):
+        auth_ref = mock.MagicMock()
+        auth_ref.will_expire_soon.return_value = False
+        self.endpoint.auth_ref = auth_ref
+        self.fake_keystone.auth_ref = auth_ref
+
+        self.clients.keystone()
+
+        self.mock_create_keystone_client.assert_called_once_with(
+            mock.ANY, auth_ref=auth_ref)
+        self.assertEqual(auth_ref, self.endpoint.auth_ref)
+
+    def test_keystone_prewarmed_auth_ref_expired(self):
+        auth_ref = mock.MagicMock()
+        auth_ref.will_expire_soon.return_value = True
+        self.endpoint.auth_ref = auth_ref
+
+        self.clients.keystone()
+
+        self.mock_create_keystone_client.assert_called_once_with(
+            mock.ANY, auth_ref=None)
+        self.assertEqual(self.fake_keystone.auth_ref, self.endpoint.auth_ref)
+
+    @mock.patch("rally.osclients.get_token_cache")
+    def test_keystone_token_cache_miss(self, mock_get_token_cache):
+        token_cache = mock_get_token_cache.return_value
+        token_cache.get.return_value = None
+
+        self.clients.keystone()
+
+        self.mock_create_keystone_client.assert_called_once_with(
+            mock.ANY, auth_ref=None)
+        token_cache.set.assert_called_once_with(self.endpoint,
+                                                self.fake_keystone.auth_ref)
+        self.assertFalse(self.clients.token_cache_hit)
+
+    @mock.patch("rally.osclients.get_token_cache")
+    def test_keystone_token_cache_hit(self, mock_get_token_cache):
+        token_cache = mock_get_token_cache.return_value
+        auth_ref = token_cache.get.return_value
+
+        self.clients.keystone()
+
+        token_cache.lock.assert_called_once_with(self.endpoint)
+        self.mock_create_keystone_client.assert_called_once_with(
+            mock.ANY, auth_ref=auth_ref)
+        self.assertFalse(token_cache.set.called)
+        self.assertTrue(self.clients.token_cache_hit)
+
+    def test_get_token_cache(self):
+        self.assertIsNone(osclients.get_token_cache())
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        for name, value in (("keystone_token_cache", True),
+                            ("keystone_token_cache_path", path)):
+            cfg.CONF.set_override(name, value)
+            self.addCleanup(cfg.CONF.clear_override, name)
+        token_cache = osclients.get_token_cache()
+        self.assertEqual(path, token_cache.path)
+        self.assertIs(token_cache, osclients.get_token_cache())
+
+    @mock.patch.dict("rally.osclients._TOKEN_CACHE", {})
+    def test_get_token_cache_default_path(self):
+        cfg.CONF.set_override("keystone_token_cache", True)
+        self.addCleanup(cfg.CONF.clear_override, "keystone_token_cache")
+        with mock.patch("rally.osclients.TokenCache") as mock_token_cache:
+            osclients.get_token_cache()
+        mock_token_cache.assert_called_once_with(
+            os.path.expanduser("~/.rally/token-cache"))
+
     @mock.patch("rally.osclients.Clients.keystone")
     def test_verified_keystone_user_not_admin(self, mock_keystone):
         mock_keystone.return_value = fakes.FakeKeystoneClient()
@@ -104,6 +192,8 @@ class OSClientsTestCase(test.TestCase):
                 insecure=False, cacert=None)
             client.set_management_url.assert_called_once_with(
                 self.service_catalog.url_for.return_value)
+            self.assertEqual(osclients.get_http_pool(),
+                             client.client._connection_pool)
             self.assertEqual(self.clients.cache["nova"], fake_nova)
 
     @mock.patch("rally.osclients.neutron")
@@ -261,3 +351,241 @@ class OSClientsTestCase(test.TestCase):
             clients.services(), {
                 consts.ServiceType.IDENTITY: consts.Service.KEYSTONE,
                 consts.ServiceType.COMPUTE: consts.Service.NOVA})
+
+
+class CreateKeystoneClientTestCase(test.TestCase):
+
+    @mock.patch("rally.osclients.keystone_discover.Discover")
+    @mock.patch("rally.osclients.keystone_v3.Client")
+    @mock.patch("rally.osclients.keystone_v2.Client")
+    def test_create_keystone_client_with_auth_ref(self, mock_v2, mock_v3,
+                                                  mock_discover):
+        auth_ref_v2 = mock.MagicMock(version="v2.0")
+        auth_ref_v3 = mock.MagicMock(version="v3")
+
+        self.assertEqual(mock_v2.return_value,
+                         osclients.create_keystone_client(
+                             {"auth_url": "url"}, auth_ref=auth_ref_v2))
+        self.assertEqual(mock_v3.return_value,
+                         osclients.create_keystone_client(
+                             {"auth_url": "url"}, auth_ref=auth_ref_v3))
+        mock_v2.assert_called_once_with(auth_ref=auth_ref_v2,
+                                        auth_url="url")
+        mock_v3.assert_called_once_with(auth_ref=auth_ref_v3,
+                                        auth_url="url")
+        self.assertFalse(mock_discover.called)
+
+
+class FakeAuthRef(dict):
+    version = "v3"
+    auth_token = "fake_token"
+
+
+class TokenCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(TokenCacheTestCase, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.token_cache = osclients.TokenCache(self.path)
+        self.endpoint = endpoint.Endpoint("http://auth_url", "user", "pass",
+                                          "tenant")
+
+    @mock.patch("rally.osclients.keystone_access.AccessInfo.factory")
+    def test_set_and_get(self, mock_factory):
+        mock_factory.return_value.will_expire_soon.return_value = False
+        with self.token_cache.lock(self.endpoint):
+            self.assertIsNone(self.token_cache.get(self.endpoint))
+            self.token_cache.set(self.endpoint, FakeAuthRef(user="u1"))
+            self.assertEqual(mock_factory.return_value,
+                             self.token_cache.get(self.endpoint))
+
+        mock_factory.assert_called_once_with(body={"token": {"user": "u1"}},
+                                             auth_token="fake_token")
+        self.assertEqual({"hits": 1, "misses": 1}, self.token_cache.stats())
+        file_name = self.token_cache._get_file_name(self.endpoint)
+        self.assertEqual(0o600, os.stat(file_name).st_mode & 0o777)
+
+    @mock.patch("rally.osclients.keystone_access.AccessInfo.factory")
+    def test_get_expired(self, mock_factory):
+        mock_factory.return_value.will_expire_soon.return_value = True
+        self.token_cache.set(self.endpoint, FakeAuthRef())
+        self.assertIsNone(self.token_cache.get(self.endpoint))
+        self.assertEqual({"hits": 0, "misses": 1}, self.token_cache.stats())
+        self.assertFalse(os.path.exists(
+            self.token_cache._get_file_name(self.endpoint)))
+
+    def test_delete(self):
+        self.token_cache.set(self.endpoint, FakeAuthRef())
+        self.token_cache.delete(self.endpoint)
+        self.assertFalse(os.path.exists(
+            self.token_cache._get_file_name(self.endpoint)))
+        self.token_cache.delete(self.endpoint)
+
+    def test_create_path(self):
+        path = os.path.join(self.path, "cache")
+        osclients.TokenCache(path)
+        self.assertEqual(0o700, os.stat(path).st_mode & 0o777)
+
+    def test_writable_by_others_path(self):
+        os.chmod(self.path, 0o777)
+        self.assertRaises(exceptions.InsecureTokenCache,
+                          osclients.TokenCache, self.path)
+
+    @mock.patch("rally.osclients.os.getuid")
+    def test_other_owner_path(self, mock_getuid):
+        mock_getuid.return_value = os.getuid() + 1
+        self.assertRaises(exceptions.InsecureTokenCache,
+                          osclients.TokenCache, self.path)
+
+    def test_get_other_endpoint(self):
+        self.token_cache.set(self.endpoint, FakeAuthRef())
+        other = endpoint.Endpoint("http://auth_url", "other", "pass",
+                                  "tenant")
+        self.assertIsNone(self.token_cache.get(other))
+
+
+class HTTPPoolTestCase(test.TestCase):
+
+    def test_get(self):
+        pool = osclients.HTTPPool(5)
+        adapter = pool.get("http://host:5000/v2.0")
+        self.assertEqual(adapter, pool.get("http://host:5000/v3"))
+        self.assertNotEqual(adapter, pool.get("http://host:8774/v2"))
+        self.assertNotEqual(adapter, pool.get("https://host:5000/v2.0"))
+        self.assertEqual(5, adapter._pool_maxsize)
+
+    def test_get_session(self):
+        pool = osclients.HTTPPool(5)
+        session = pool.get_session("http://host:5000/v2.0",
+                                   "http://host:35357/v2.0")
+        self.assertEqual(pool.get("http://host:5000"),
+                         session.get_adapter("http://host:5000/v2.0/tokens"))
+        self.assertEqual(pool.get("http://host:35357"),
+                         session.get_adapter("http://host:35357/v2.0/users"))
+        self.assertNotEqual(pool.get("http://host:5000"),
+                            pool.get_session().get_adapter("http://host:5000"))
+
+    def test_stats(self):
+        pool = osclients.HTTPPool(5)
+        adapter = pool.get("http://host:5000")
+        self.assertEqual({"http://host:5000": {"connections": 0,
+                                               "requests": 0}},
+                         pool.stats())
+        conn_pool = adapter.poolmanager.connection_from_url(
+            "http://host:5000")
+        conn_pool.num_connections = 2
+        conn_pool.num_requests = 7
+        self.assertEqual({"http://host:5000": {"connections": 2,
+                                               "requests": 7}},
+                         pool.stats())
+
+    def test_close(self):
+        pool = osclients.HTTPPool(5)
+        adapter = pool.get("http://host:8774")
+        adapter.poolmanager.connection_from_url("http://host:8774")
+
+        # NOTE: novaclient closes its session, which closes the adapters
+        session = pool.get_session("http://host:8774")
+        session.close()
+        adapter.close()
+        self.assertEqual(1, len(adapter.poolmanager.pools))
+        self.assertIs(adapter, pool.get("http://host:8774"))
+
+        pool.close()
+        self.assertEqual(0, len(adapter.poolmanager.pools))
+        self.assertIsNot(adapter, pool.get("http://host:8774"))
+
+    @mock.patch("rally.osclients.os.getpid")
+    def test_get_http_pool(self, mock_getpid):
+        mock_getpid.return_value = 1
+        pool = osclients.get_http_pool()
+        self.assertIs(pool, osclients.get_http_pool())
+        self.assertEqual(cfg.CONF.http_pool_size, pool.size)
+        mock_getpid.return_value = 2
+        self.assertIsNot(pool, osclients.get_http_pool())
+
+
+class HTTPCallsRecordingTestCase(test.TestCase):
+
+    def test_get_url_template(self):
+        self.assertEqual(
+            "/v2/{id}/servers/{id}/action",
+            osclients.get_url_template(
+                "http://h:8774/v2/8d4ab6e58a4b4c5e8f2d3b5c9a0b1c2d/servers/"
+                "2f7a2b6e-1d1f-4d0e-9b6d-5a4f3e2d1c0b/action?a=1"))
+        self.assertEqual("/v2/{id}/os-keypairs/rally_ssh_key",
+                         osclients.get_url_template(
+                             "http://h/v2/42/os-keypairs/rally_ssh_key"))
+        self.assertEqual("/v2.0/tokens",
+                         osclients.get_url_template("http://h/v2.0/tokens"))
+
+    @mock.patch("rally.osclients.requests_adapters.HTTPAdapter.send")
+    def test_record_http_calls(self, mock_send):
+        mock_send.return_value.status_code = 200
+        adapter = osclients.HTTPPool(1).get("http://h:8774")
+        request = mock.MagicMock(method="GET",
+                                 url="http://h:8774/v2/servers/42")
+
+        adapter.send(request)
+        with osclients.record_http_calls() as calls:
+            self.assertEqual(mock_send.return_value, adapter.send(request))
+            mock_send.side_effect = Exception
+            self.assertRaises(Exception, adapter.send, request)
+        mock_send.side_effect = None
+        adapter.send(request)
+
+        self.assertEqual(2, len(calls))
+        self.assertEqual(("GET", "/v2/servers/{id}", 200),
+                         (calls[0]["method"], calls[0]["url"],
+                          calls[0]["status"]))
+        self.assertIsNone(calls[1]["status"])
+        self.assertEqual(4, mock_send.call_count)
+
+    @mock.patch("rally.osclients.requests_adapters.HTTPAdapter.send")
+    def test_record_http_calls_disabled(self, mock_send):
+        adapter = osclients.HTTPPool(1).get("http://h:8774")
+        with osclients.record_http_calls(enabled=False) as calls:
+            adapter.send(mock.MagicMock(method="GET", url="http://h:8774/"))
+        self.assertEqual([], calls)
+
+    @mock.patch("rally.osclients.requests_adapters.HTTPAdapter.send")
+    def test_record_http_calls_of_green_threads(self, mock_send):
+        def send(request):
+            # NOTE: Switch to the other green thread, so the iterations
+            #       overlap inside of record_http_calls()
+            eventlet.sleep(0)
+            return mock.Mock(status_code=200)
+
+        mock_send.side_effect = send
+        adapter = osclients.HTTPPool(1).get("http://h:8774")
+
+        def iteration(path):
+            with osclients.record_http_calls() as calls:
+                for i in range(3):
+                    adapter.send(mock.MagicMock(
+                        method="GET", url="http://h:8774/v2/%s" % path))
+            return calls
+
+        pool = eventlet.GreenPool(2)
+        first = pool.spawn(iteration, "servers")
+        second = pool.spawn(iteration, "flavors")
+        self.assertEqual(["/v2/servers"] * 3,
+                         [call["url"] for call in first.wait()])
+        self.assertEqual(["/v2/flavors"] * 3,
+                         [call["url"] for call in second.wait()])
+
+
+class LazyImportTestCase(test.TestCase):
+
+    def test_client_libraries_are_imported_lazily(self):
+        libraries = ("ceilometerclient", "cinderclient", "designateclient",
+                     "glanceclient", "heatclient", "ironicclient",
+                     "keystoneclient", "neutronclient", "novaclient",
+                     "saharaclient", "zaqarclient")
+        code = ("import sys\n"
+                "import rally.osclients\n"
+                "print(sorted(set(m.split('.')[0] for m in sys.modules)"
+                " & set(%r)))" % (libraries,))
+        output = subprocess.check_output([sys.executable, "-c", code])
+        self.assertEqual("[]", output.strip())
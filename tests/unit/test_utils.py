@@ -82,6 +82,28 @@ class StdIOCaptureTestCase(test.TestCase):
         self.assertEqual(stderr, sys.stderr)
 
 
+class LazyModuleTestCase(test.TestCase):
+
+    @mock.patch("rally.utils.importutils.import_module")
+    def test_lazy_module(self, mock_import_module):
+        module = utils.LazyModule("fake.module")
+        self.assertFalse(mock_import_module.called)
+
+        self.assertEqual(mock_import_module.return_value.attr, module.attr)
+        self.assertEqual(mock_import_module.return_value.func(),
+                         module.func())
+        mock_import_module.assert_called_once_with("fake.module")
+
+    def test_lazy_module_real_import(self):
+        module = utils.LazyModule("os.path")
+        self.assertEqual(sys.modules["os.path"].join, module.join)
+        self.assertRaises(AttributeError, getattr, module, "__wrapped__")
+
+    def test_lazy_module_import_error(self):
+        module = utils.LazyModule("fake_not_existing_module")
+        self.assertRaises(ImportError, getattr, module, "attr")
+
+
 class TimerTestCase(test.TestCase):
 
     def test_timer_duration(self):
@@ -106,6 +128,39 @@ class TimerTestCase(test.TestCase):
         self.assertEqual(timer.error[0], type(Exception()))
 
 
+class TimestampTestCase(test.TestCase):
+
+    def test_monotonic(self):
+        first = utils.monotonic()
+        self.assertTrue(utils.monotonic() >= first)
+
+    def test_timestamp(self):
+        self.assertTrue(abs(utils.timestamp() - time.time()) < 1)
+
+    @mock.patch("rally.utils.monotonic", return_value=5.0)
+    def test_timestamp_is_monotonic_based(self, mock_monotonic):
+        with mock.patch("rally.utils.time") as mock_time:
+            mock_time.time.return_value = 0.0
+            self.assertEqual(utils._MONOTONIC_TO_WALL + 5.0,
+                             utils.timestamp())
+
+    @mock.patch("rally.utils.ctypes")
+    def test__load_librt(self, mock_ctypes):
+        self.assertEqual(mock_ctypes.CDLL.return_value, utils._load_librt())
+        mock_ctypes.CDLL.assert_called_once_with("librt.so.1",
+                                                 use_errno=True)
+        self.assertFalse(mock_ctypes.util.find_library.called)
+
+    @mock.patch("rally.utils.ctypes")
+    def test__load_librt_fallback(self, mock_ctypes):
+        librt = mock.MagicMock()
+        mock_ctypes.CDLL.side_effect = [OSError(), librt]
+        self.assertEqual(librt, utils._load_librt())
+        mock_ctypes.util.find_library.assert_called_once_with("rt")
+        mock_ctypes.CDLL.assert_called_with(
+            mock_ctypes.util.find_library.return_value, use_errno=True)
+
+
 class IterSubclassesTestCase(test.TestCase):
 
     def test_itersubclasses(self):
@@ -124,6 +179,104 @@ class IterSubclassesTestCase(test.TestCase):
         self.assertEqual([B, C, D], list(utils.itersubclasses(A)))
 
 
+class PluginsIndexTestCase(test.TestCase):
+
+    def setUp(self):
+        super(PluginsIndexTestCase, self).setUp()
+        utils.invalidate_plugins_index()
+        self.addCleanup(utils.invalidate_plugins_index)
+
+    def test_get_plugin(self):
+        class A(object):
+            pass
+
+        class B(A):
+            plugin_name = "b"
+
+        class C(A):
+            plugin_name = "c"
+
+        class D(C):
+            plugin_name = "d"
+
+        self.assertEqual(B, utils.get_plugin(A, "B"))
+        self.assertEqual(D, utils.get_plugin(A, "d", key="plugin_name"))
+        self.assertEqual(C, utils.get_plugin(A, "c", key="plugin_name"))
+        self.assertIsNone(utils.get_plugin(A, "A"))
+        self.assertIsNone(utils.get_plugin(A, "e", key="plugin_name"))
+
+    def test_get_plugin_first_subclass_wins(self):
+        class A(object):
+            pass
+
+        class B(A):
+            plugin_name = "b"
+
+        class C(B):
+            pass
+
+        self.assertEqual(B, utils.get_plugin(A, "b", key="plugin_name"))
+
+    @mock.patch("rally.utils.itersubclasses", side_effect=utils.itersubclasses)
+    def test_get_plugin_uses_index(self, mock_itersubclasses):
+        class A(object):
+            pass
+
+        class B(A):
+            pass
+
+        for i in range(3):
+            self.assertEqual(B, utils.get_plugin(A, "B"))
+        self.assertEqual(
+            1, mock_itersubclasses.call_args_list.count(mock.call(A)))
+
+    def test_get_plugin_rebuilds_index_if_not_found(self):
+        class A(object):
+            pass
+
+        class B(A):
+            pass
+
+        self.assertEqual(B, utils.get_plugin(A, "B"))
+
+        class C(A):
+            pass
+
+        self.assertEqual(C, utils.get_plugin(A, "C"))
+
+    def test_get_plugins(self):
+        class A(object):
+            pass
+
+        class B(A):
+            plugin_name = "b"
+
+        class C(A):
+            plugin_name = "c"
+
+        class D(C):
+            pass
+
+        self.assertEqual(set([B, C]),
+                         set(utils.get_plugins(A, key="plugin_name")))
+
+    def test_invalidate_plugins_index(self):
+        class A(object):
+            pass
+
+        class B(A):
+            pass
+
+        self.assertEqual([B], utils.get_plugins(A))
+
+        class C(A):
+            pass
+
+        self.assertEqual([B], utils.get_plugins(A))
+        utils.invalidate_plugins_index()
+        self.assertEqual(set([B, C]), set(utils.get_plugins(A)))
+
+
 class ImportModulesTestCase(test.TestCase):
     def test_try_append_module_into_sys_modules(self):
         modules = {}
@@ -142,6 +295,12 @@ class ImportModulesTestCase(test.TestCase):
         self.assertTrue('tests.unit.fixtures.import.package.a' in sys.modules)
         self.assertTrue('tests.unit.fixtures.import.package.b' in sys.modules)
 
+    @mock.patch("rally.utils.invalidate_plugins_index")
+    def test_import_modules_from_package_invalidates_plugins_index(
+            self, mock_invalidate):
+        utils.import_modules_from_package('tests.unit.fixtures.import.package')
+        mock_invalidate.assert_called_once_with()
+
 
 class LogTestCase(test.TestCase):
 
@@ -171,6 +330,7 @@ class LogTestCase(test.TestCase):
 
 class LoadExtraModulesTestCase(test.TestCase):
 
+    @mock.patch("rally.utils.invalidate_plugins_index")
     @mock.patch("rally.utils.imp.load_module")
     @mock.patch("rally.utils.imp.find_module")
     @mock.patch("rally.utils.os.path.exists", return_value=True)
@@ -178,7 +338,7 @@ class LoadExtraModulesTestCase(test.TestCase):
     @mock.patch("rally.utils.os.listdir")
     def test_load_plugins_successfull(self, mock_listdir, mock_isfile,
                                       mock_exists, mock_find_module,
-                                      mock_load_module):
+                                      mock_load_module, mock_invalidate):
         mock_listdir.return_value = ["plugin1.py", "plugin2.py",
                                      "somethingnotpythonmodule",
                                      "somestrangedir.py"]
@@ -197,6 +357,7 @@ class LoadExtraModulesTestCase(test.TestCase):
         ]
         self.assertEqual(mock_find_module.mock_calls, expected)
         self.assertEqual(len(mock_load_module.mock_calls), 2)
+        mock_invalidate.assert_called_once_with()
 
     @mock.patch("rally.utils.os")
     def test_load_plugins_from_nonexisting_and_empty_dir(self, mock_os):